@@ -16,13 +16,13 @@ PROMOTION_PASS_REQUIREMENTS = {
 # --- SRP: ProblemSelector ---
 class ProblemSelector:
     @staticmethod
-    def select(repository: ProblemRepository, topic: str, difficulty: str, exclude_ids: set) -> Optional[ProblemSpec]:
-        return repository.find(topic, difficulty, exclude_ids=exclude_ids) or repository.fallback(topic, difficulty, exclude_ids=exclude_ids)
+    async def select(repository: ProblemRepository, topic: str, difficulty: str, exclude_ids: set) -> Optional[ProblemSpec]:
+        return await repository.find(topic, difficulty, exclude_ids=exclude_ids) or repository.fallback(topic, difficulty, exclude_ids=exclude_ids)
 
 # --- SRP: ProblemPromotion ---
 class ProblemPromotion:
     @staticmethod
-    def promote(repository: ProblemRepository, state: SessionState) -> Optional[ProblemSpec]:
+    async def promote(repository: ProblemRepository, state: SessionState) -> Optional[ProblemSpec]:
         required_passes = PROMOTION_PASS_REQUIREMENTS.get(state.difficulty, 3)
         if state.consecutive_passes() < required_passes:
             return None
@@ -37,7 +37,7 @@ class ProblemPromotion:
         exclude_ids = set(state.assigned_problem_ids)
         if state.current_problem:
             exclude_ids.add(state.current_problem.id)
-        candidate = repository.find(state.topic, target_diff, exclude_ids=exclude_ids) or repository.fallback(state.topic, target_diff, exclude_ids=exclude_ids)
+        candidate = await repository.find(state.topic, target_diff, exclude_ids=exclude_ids) or repository.fallback(state.topic, target_diff, exclude_ids=exclude_ids)
         if not candidate:
             return None
         state.mark_problem(candidate)
@@ -46,7 +46,7 @@ class ProblemPromotion:
 # --- SRP: ProblemRemediation ---
 class ProblemRemediation:
     @staticmethod
-    def remediate(repository: ProblemRepository, state: SessionState) -> Optional[ProblemSpec]:
+    async def remediate(repository: ProblemRepository, state: SessionState) -> Optional[ProblemSpec]:
         ladder = ["easy", "medium", "hard"]
         try:
             idx = ladder.index(state.difficulty)
@@ -58,7 +58,7 @@ class ProblemRemediation:
         exclude_ids = set(state.assigned_problem_ids)
         if state.current_problem:
             exclude_ids.add(state.current_problem.id)
-        candidate = repository.find(state.topic, target_diff, exclude_ids=exclude_ids) or repository.fallback(state.topic, target_diff, exclude_ids=exclude_ids)
+        candidate = await repository.find(state.topic, target_diff, exclude_ids=exclude_ids) or repository.fallback(state.topic, target_diff, exclude_ids=exclude_ids)
         if not candidate:
             return None
         state.mark_problem(candidate)
@@ -67,11 +67,11 @@ class ProblemRemediation:
 # --- SRP: ProblemRefresh ---
 class ProblemRefresh:
     @staticmethod
-    def refresh(repository: ProblemRepository, state: SessionState) -> Optional[ProblemSpec]:
+    async def refresh(repository: ProblemRepository, state: SessionState) -> Optional[ProblemSpec]:
         exclude_ids = set(state.assigned_problem_ids)
         if state.current_problem:
             exclude_ids.add(state.current_problem.id)
-        candidate = repository.find(state.topic, state.difficulty, exclude_ids=exclude_ids)
+        candidate = await repository.find(state.topic, state.difficulty, exclude_ids=exclude_ids)
         if not candidate:
             return None
         state.mark_problem(candidate)
@@ -81,18 +81,7 @@ class ProblemRefresh:
 class FailureCounter:
     @staticmethod
     def recent_failures(state: SessionState) -> int:
-        current_difficulty = state.difficulty
-        count = 0
-        inspected = 0
-        for record in reversed(state.submissions):
-            if record.difficulty != current_difficulty:
-                continue
-            inspected += 1
-            if record.status != "passed":
-                count += 1
-            if inspected >= 3:
-                break
-        return count
+        return state.recent_failures()
 
 # --- SRP: AdaptationAgent orchestrates the process ---
 class AdaptationAgent(BaseAgent):
@@ -112,13 +101,13 @@ class AdaptationAgent(BaseAgent):
         self._candidate = None
         self._decision_timestamp = datetime.utcnow()
 
-    def decide(self, state: SessionState) -> AgentDecision:
+    async def decide(self, state: SessionState) -> AgentDecision:
         requested_difficulty = self._request.get("difficulty", state.difficulty)
         topic = self._request.get("topic", state.topic)
         exclude_ids = set(state.assigned_problem_ids)
         if state.current_problem:
             exclude_ids.add(state.current_problem.id)
-        problem = ProblemSelector.select(self._repository, topic, requested_difficulty, exclude_ids)
+        problem = await ProblemSelector.select(self._repository, topic, requested_difficulty, exclude_ids)
         self._candidate = problem
         if not problem:
             return AgentDecision(
@@ -142,7 +131,7 @@ class AdaptationAgent(BaseAgent):
             },
         )
 
-    def act(self, decision: AgentDecision, state: SessionState) -> Dict[str, Any]:
+    async def act(self, decision: AgentDecision, state: SessionState) -> Dict[str, Any]:
         if decision.decision_type != "assign_problem" or not self._candidate:
             state.status = "paused"
             return {"type": "assignment_error", "message": "No problems available"}
@@ -164,24 +153,24 @@ class AdaptationAgent(BaseAgent):
             "metadata": decision.metadata,
         }
 
-    def after_submission(self, state: SessionState, evaluation: Dict[str, Any]) -> Dict[str, Any]:
+    async def after_submission(self, state: SessionState, evaluation: Dict[str, Any]) -> Dict[str, Any]:
         if not state.current_problem:
             return {}
 
         decision = None
         next_problem: Optional[ProblemSpec] = None
         if evaluation.get("status") == "passed":
-            next_problem = ProblemPromotion.promote(self._repository, state)
+            next_problem = await ProblemPromotion.promote(self._repository, state)
             if next_problem:
                 decision = "advance"
             else:
-                next_problem = ProblemRefresh.refresh(self._repository, state)
+                next_problem = await ProblemRefresh.refresh(self._repository, state)
                 if next_problem:
                     decision = "reinforce"
         else:
             failures = FailureCounter.recent_failures(state)
             if failures >= 3:
-                next_problem = ProblemRemediation.remediate(self._repository, state)
+                next_problem = await ProblemRemediation.remediate(self._repository, state)
                 if next_problem:
                     decision = "remediate"
             else:
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from typing import Any, Awaitable, Callable, Dict
 
 from ..core.decision import AgentDecision
 from ..core.errors import AgentExecutionError, build_error_payload
 from ..services.session_state import SessionState
 
+# Sends an interim frame (e.g. a streamed hint chunk) back to the session's client.
+Emitter = Callable[[Dict[str, Any]], Awaitable[None]]
+
 
 class BaseAgent(ABC):
     """Interface for autonomous agents in SkillProof AI."""
@@ -21,11 +24,11 @@ class BaseAgent(ABC):
         """Consume raw events and update internal memory."""
 
     @abstractmethod
-    def decide(self, state: SessionState) -> AgentDecision:
+    async def decide(self, state: SessionState) -> AgentDecision:
         """Produce a decision based on current state and internal memory."""
 
     @abstractmethod
-    def act(self, decision: AgentDecision, state: SessionState) -> Dict[str, Any]:
+    async def act(self, decision: AgentDecision, state: SessionState) -> Dict[str, Any]:
         """Execute the decision, mutating state or emitting payloads."""
 
     @abstractmethod
@@ -36,13 +39,13 @@ class BaseAgent(ABC):
         """Optional feedback hook for learning from outcomes."""
         return
 
-    def execute(self, state: SessionState, payload: Dict[str, Any], context: Dict[str, Any] | None = None) -> Dict[str, Any]:
+    async def execute(self, state: SessionState, payload: Dict[str, Any], context: Dict[str, Any] | None = None) -> Dict[str, Any]:
         event = {"payload": payload, "context": context or {}}
         try:
             self.observe(event, state)
-            decision = self.decide(state)
-            outcome = self.act(decision, state)
-            state.record_decision(self.name, decision.as_payload())
+            decision = await self.decide(state)
+            outcome = await self.act(decision, state)
+            state.record_decision(self.name, decision)
             self.reflect(decision, state)
             explanation = self.explain(decision)
             message = explanation.get("message") if isinstance(explanation, dict) else None
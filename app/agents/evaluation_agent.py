@@ -1,26 +1,38 @@
+import asyncio
+import logging
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 
-from .base_agent import BaseAgent
+from .base_agent import BaseAgent, Emitter
 from ..core.decision import AgentDecision
+from ..config import settings
 from ..services.code_evaluator import CodeEvaluator
+from ..services.eval_queue import QueuedEvaluator
 from ..services.session_state import SessionState
 
+# Learning sessions only need the first failure to give feedback; test mode always runs the full suite.
+_FAIL_FAST_MODES = {mode.strip() for mode in settings.EVAL_FAIL_FAST_MODES.split(",") if mode.strip()}
+
+logger = logging.getLogger("skillproof.evaluation_agent")
+
 
 class EvaluationAgent(BaseAgent):
     def __init__(self) -> None:
         super().__init__(name="evaluation")
-        self._evaluator = CodeEvaluator()
+        # With the job queue on, grading runs in standalone workers instead of this process's sandbox.
+        self._evaluator = QueuedEvaluator() if settings.EVAL_QUEUE_ENABLED else CodeEvaluator()
         self._latest_payload: Dict[str, Any] = {}
         self._last_result: Dict[str, Any] = {}
         self._decision_timestamp: Optional[datetime] = None
+        self._emit: Optional[Emitter] = None
 
     def observe(self, event: Dict[str, Any], state: SessionState) -> None:
         self._latest_payload = event.get("payload", {})
+        self._emit = event.get("context", {}).get("emit")
         self._decision_timestamp = datetime.utcnow()
         self._last_result = {}
 
-    def decide(self, state: SessionState) -> AgentDecision:
+    async def decide(self, state: SessionState) -> AgentDecision:
         if not state.current_problem:
             return AgentDecision(
                 agent=self.name,
@@ -38,12 +50,31 @@ class EvaluationAgent(BaseAgent):
             metadata={"has_code": bool(self._latest_payload.get("code"))},
         )
 
-    def act(self, decision: AgentDecision, state: SessionState) -> Dict[str, Any]:
+    async def act(self, decision: AgentDecision, state: SessionState) -> Dict[str, Any]:
         if decision.decision_type != "evaluate_submission":
             return {"type": "evaluation", "result": {"status": "waiting"}}
 
         code = self._latest_payload.get("code", "")
-        result = self._evaluator.evaluate(code, state.current_problem)
+        frames: "asyncio.Queue[Optional[Dict[str, Any]]]" = asyncio.Queue()
+        on_test: Optional[Callable[[Dict[str, Any]], None]] = None
+        pump = None
+        if self._emit is not None and settings.EVAL_STREAMING:
+            # Details may arrive from the thread running the suite; hand each one back to the loop in order.
+            loop = asyncio.get_running_loop()
+            on_test = lambda detail: loop.call_soon_threadsafe(frames.put_nowait, detail)  # noqa: E731
+            pump = asyncio.create_task(self._stream_test_results(frames, self._emit, len(state.current_problem.tests)))
+        try:
+            result = await self._evaluator.evaluate_async(
+                code,
+                state.current_problem,
+                fail_fast=state.mode in _FAIL_FAST_MODES,
+                on_test=on_test,
+                session_key=state.user_id,
+            )
+        finally:
+            if pump is not None:
+                frames.put_nowait(None)
+                await pump
         submission = state.add_submission(code, result)
 
         score_bundle = self._score_submission(state, submission, result)
@@ -71,6 +102,20 @@ class EvaluationAgent(BaseAgent):
             },
         }
 
+    @staticmethod
+    async def _stream_test_results(frames: "asyncio.Queue[Optional[Dict[str, Any]]]", emit: Emitter, total: int) -> None:
+        completed = 0
+        while True:
+            detail = await frames.get()
+            if detail is None:
+                return
+            completed += 1
+            try:
+                await emit({"type": "test_result", "payload": {**detail, "completed": completed, "total": total}})
+            except Exception as exc:  # pylint: disable=broad-except
+                # A dropped client must not stall the evaluation; keep draining.
+                logger.debug("Test result frame not delivered", exc_info=exc)
+
     def explain(self, decision: AgentDecision) -> Dict[str, Any]:
         return {
             "agent": self.name,
@@ -83,13 +128,13 @@ class EvaluationAgent(BaseAgent):
     def _score_submission(self, state: SessionState, submission, result: Dict[str, Any]) -> Dict[str, Any]:
         total = max(1, result.get("total_tests", submission.total_tests))
         correctness_ratio = result.get("passed", submission.tests_passed) / total
-        hint_penalty = len(state.hints) * 5
+        hint_penalty = state.hints.total * 5
         time_penalty = min(20, submission.time_delta / 60 * 5) if submission.time_delta else 0
         integrity_penalty = {"normal": 0, "warn": 8, "paused": 18, "terminated": 100}.get(state.integrity.severity, 0)
         raw_score = max(0, min(100, correctness_ratio * 100 - hint_penalty - time_penalty - integrity_penalty))
         grade = "pass" if correctness_ratio == 1.0 and raw_score >= 70 else "progress" if correctness_ratio >= 0.5 else "retry"
 
-        time_from_start = (submission.created_at - state.started_at).total_seconds()
+        time_from_start = submission.created_at - state.started_at
 
         return {
             "score": round(raw_score, 2),
@@ -1,10 +1,12 @@
+import time
 from datetime import datetime
 from typing import Any, Dict, Optional
 
-from .base_agent import BaseAgent
+from .base_agent import BaseAgent, Emitter
 from ..core.decision import AgentDecision
+from ..config import settings
 from ..services.ai_service import get_ai_service
-from ..services.session_state import SessionState
+from ..services.session_state import HINT_LEVELS, SessionState
 
 
 
@@ -13,11 +15,10 @@ class HintLevelSelector:
     @staticmethod
     def select(state: SessionState) -> str:
         recent = state.latest_submission()
-        used_levels = {hint.level for hint in state.hints}
         if recent and recent.reasoning_label in {"guessing", "stalled"}:
-            return "conceptual" if "conceptual" not in used_levels else "directional"
+            return "conceptual" if not state.hint_level_used(0) else "directional"
         if recent and recent.tests_failed > 0:
-            return "directional" if "directional" not in used_levels else "code"
+            return "directional" if not state.hint_level_used(1) else "code"
         if state.skill_profile.problem_decomposition < 0.45:
             return "conceptual"
         if state.skill_profile.debugging < 0.55:
@@ -27,7 +28,7 @@ class HintLevelSelector:
 # --- SRP: HintFormatter ---
 class HintFormatter:
     @staticmethod
-    def resolve_hint(state: SessionState, level: str) -> tuple[Optional[str], Optional[str]]:
+    async def resolve_hint(state: SessionState, level: str, emit: Optional[Emitter] = None) -> tuple[Optional[str], Optional[str]]:
         import logging
         logger = logging.getLogger("skillproof.hint_strategy_agent")
         hints = state.current_problem.hints
@@ -35,23 +36,21 @@ class HintFormatter:
             logger.error("Hints missing or not a list in current_problem: %s", hints)
             return None, None
 
-        level_order = ["conceptual", "directional", "code"]
-        level_to_index = {name: idx for idx, name in enumerate(level_order)}
-        used = {hint.level for hint in state.hints}
-        chosen_idx = level_to_index.get(level, 0)
+        level_order = HINT_LEVELS
+        chosen_idx = level_order.index(level) if level in level_order else 0
         for idx, name in enumerate(level_order):
-            if idx < len(hints) and name not in used:
+            if idx < len(hints) and not state.hint_level_used(idx):
                 chosen_idx = idx
                 level = name
                 break
         if chosen_idx >= len(hints):
-            for idx, hint in enumerate(hints):
-                if idx not in [level_to_index.get(h.level, -1) for h in state.hints]:
+            for idx in range(len(hints)):
+                if not state.hint_level_used(idx):
                     chosen_idx = idx
                     level = level_order[idx] if idx < len(level_order) else f"level_{idx}"
                     break
         fallback_hint = hints[chosen_idx] if chosen_idx < len(hints) else None
-        ai_hint = HintFormatter._generate_ai_hint(state, level, fallback_hint)
+        ai_hint = await HintFormatter._generate_ai_hint(state, level, fallback_hint, emit)
         if ai_hint:
             return level, ai_hint
         if fallback_hint:
@@ -60,7 +59,7 @@ class HintFormatter:
         return None, None
 
     @staticmethod
-    def _generate_ai_hint(state: SessionState, level: str, fallback: Optional[str]) -> Optional[str]:
+    async def _generate_ai_hint(state: SessionState, level: str, fallback: Optional[str], emit: Optional[Emitter] = None) -> Optional[str]:
         if not state.current_problem:
             return fallback
         latest = state.latest_submission()
@@ -83,13 +82,25 @@ class HintFormatter:
             "fallback_hint": fallback,
         }
         try:
-            hint = get_ai_service().generate_hint(context).strip()
+            if emit is not None and settings.HINT_STREAMING:
+                hint = await HintFormatter._stream_ai_hint(context, level, emit)
+            else:
+                hint = (await get_ai_service().generate_hint(context)).strip()
         except Exception:
             hint = ""
         if hint:
             return hint
         return fallback
 
+    @staticmethod
+    async def _stream_ai_hint(context: Dict[str, Any], level: str, emit: Emitter) -> str:
+        # Forward tokens as they arrive; the final "hint" reply carries the full text.
+        parts = []
+        async for delta in get_ai_service().stream_hint(context):
+            await emit({"type": "hint_chunk", "payload": {"level": level, "index": len(parts), "delta": delta}})
+            parts.append(delta)
+        return "".join(parts).strip()
+
 # --- SRP: HintStrategyAgent orchestrates the process ---
 class HintStrategyAgent(BaseAgent):
     def __init__(self) -> None:
@@ -99,15 +110,17 @@ class HintStrategyAgent(BaseAgent):
         self._hint_text: Optional[str] = None
         self._deny_message: Optional[str] = None
         self._decision_time: Optional[datetime] = None
+        self._emit: Optional[Emitter] = None
 
     def observe(self, event: Dict[str, Any], state: SessionState) -> None:
         self._payload = event.get("payload", {})
+        self._emit = event.get("context", {}).get("emit")
         self._hint_level = None
         self._hint_text = None
         self._deny_message = None
         self._decision_time = datetime.utcnow()
 
-    def decide(self, state: SessionState) -> AgentDecision:
+    async def decide(self, state: SessionState) -> AgentDecision:
         if not state.current_problem:
             self._deny_message = "No active problem"
             return AgentDecision(
@@ -119,7 +132,7 @@ class HintStrategyAgent(BaseAgent):
                 metadata={"reason": "no_problem"},
             )
 
-        if len(state.hints) >= 3:
+        if state.hints.total >= 3:
             self._deny_message = "Hint limit reached"
             return AgentDecision(
                 agent=self.name,
@@ -131,7 +144,7 @@ class HintStrategyAgent(BaseAgent):
             )
 
         if state.hints:
-            elapsed = (datetime.utcnow() - state.hints[-1].created_at).total_seconds()
+            elapsed = time.time() - state.hints[-1].created_at
             if elapsed < 45:
                 self._deny_message = "Take more time before next hint"
                 return AgentDecision(
@@ -144,7 +157,7 @@ class HintStrategyAgent(BaseAgent):
                 )
 
         level = HintLevelSelector.select(state)
-        level, hint_text = HintFormatter.resolve_hint(state, level)
+        level, hint_text = await HintFormatter.resolve_hint(state, level, self._emit)
         if not hint_text:
             self._deny_message = "No additional hints available"
             return AgentDecision(
@@ -167,7 +180,7 @@ class HintStrategyAgent(BaseAgent):
             metadata={"level": level},
         )
 
-    def act(self, decision: AgentDecision, state: SessionState) -> Dict[str, Any]:
+    async def act(self, decision: AgentDecision, state: SessionState) -> Dict[str, Any]:
         if decision.decision_type != "deliver_hint" or not self._hint_level or not self._hint_text:
             return {"type": "hint", "allowed": False, "message": self._deny_message or "Hint deferred"}
 
@@ -1,7 +1,8 @@
-from datetime import datetime
+import time
 from typing import Any, Dict, Optional
 
 from .base_agent import BaseAgent
+from ..core.clock import to_iso
 from ..core.decision import AgentDecision
 from ..services.session_state import SessionState
 
@@ -12,8 +13,8 @@ class IntegrityEventParser:
     @staticmethod
     def parse(event: Dict[str, Any], state: SessionState) -> Dict[str, Any]:
         payload = event.get("payload", {})
-        timestamp = datetime.utcnow()
-        elapsed = (timestamp - state.integrity.last_event_at).total_seconds()
+        timestamp = time.time()
+        elapsed = timestamp - state.integrity.last_event_at
         pending_inactivity = elapsed > 180
         return {
             "payload": payload,
@@ -72,7 +73,7 @@ class IntegrityDecisionMaker:
 # --- SRP: IntegrityStateUpdater ---
 class IntegrityStateUpdater:
     @staticmethod
-    def update(decision: AgentDecision, state: SessionState, timestamp: datetime, pending_inactivity: bool) -> Dict[str, Any]:
+    def update(decision: AgentDecision, state: SessionState, timestamp: float, pending_inactivity: bool) -> Dict[str, Any]:
         inactivity_alert = None
         if pending_inactivity:
             inactivity_alert = state.integrity.register_inactivity()
@@ -117,7 +118,7 @@ class IntegrityAgent(BaseAgent):
     def __init__(self) -> None:
         super().__init__(name="integrity")
         self._payload: Dict[str, Any] = {}
-        self._timestamp: Optional[datetime] = None
+        self._timestamp: Optional[float] = None
         self._elapsed: float = 0.0
         self._pending_inactivity: bool = False
         self._last_message: str = ""
@@ -130,11 +131,11 @@ class IntegrityAgent(BaseAgent):
         self._pending_inactivity = parsed["pending_inactivity"]
         self._last_message = ""
 
-    def decide(self, state: SessionState) -> AgentDecision:
+    async def decide(self, state: SessionState) -> AgentDecision:
         return IntegrityDecisionMaker.decide(self._payload, self._elapsed, self._pending_inactivity)
 
-    def act(self, decision: AgentDecision, state: SessionState) -> Dict[str, Any]:
-        result = IntegrityStateUpdater.update(decision, state, self._timestamp or datetime.utcnow(), self._pending_inactivity)
+    async def act(self, decision: AgentDecision, state: SessionState) -> Dict[str, Any]:
+        result = IntegrityStateUpdater.update(decision, state, self._timestamp or time.time(), self._pending_inactivity)
         self._last_message = result.get("message", "")
         return result
 
@@ -143,6 +144,6 @@ class IntegrityAgent(BaseAgent):
             "agent": self.name,
             "decision": decision.decision_type,
             "message": self._last_message,
-            "timestamp": (self._timestamp.isoformat() if self._timestamp else None),
+            "timestamp": (to_iso(self._timestamp) if self._timestamp else None),
             "metadata": decision.metadata,
         }
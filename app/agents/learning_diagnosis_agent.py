@@ -1,10 +1,21 @@
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 from .base_agent import BaseAgent
 from ..core.decision import AgentDecision
 from ..services.ai_service import get_ai_service
 from ..services.session_state import SessionState, SubmissionRecord
+from ..services.similarity import get_similarity_engine
+
+# diff_ratio cut-offs per similarity engine: (similar resubmit, stalled rewrite, rapid rewrite).
+# The shingle values are the cuts benchmarks/bench_similarity.py fits against the original
+# character-level rules (agreement 89.6% / 96.3% / 94.1%); shingles score genuine rewrites
+# far lower than difflib does. Re-run the benchmark and copy its cuts when the engine changes.
+DIFF_RATIO_THRESHOLDS: Dict[str, Tuple[float, float, float]] = {
+    "sequence": (0.85, 0.3, 0.2),
+    "shingle": (0.81, 0.02, 0.02),
+}
+RAPID_RESUBMIT_SECONDS = 25
 
 
 class LearningDiagnosisAgent(BaseAgent):
@@ -31,7 +42,7 @@ class LearningDiagnosisAgent(BaseAgent):
         self._adjustments = {}
         self._decision_time = datetime.utcnow()
 
-    def decide(self, state: SessionState) -> AgentDecision:
+    async def decide(self, state: SessionState) -> AgentDecision:
         if not isinstance(self._submission, SubmissionRecord):
             return AgentDecision(
                 agent=self.name,
@@ -47,7 +58,7 @@ class LearningDiagnosisAgent(BaseAgent):
         self._notes = notes
         self._adjustments = adjustments
 
-        ai_notes = self._generate_ai_notes(state)
+        ai_notes = await self._generate_ai_notes(state)
         if ai_notes:
             self._notes = f"{self._notes}\n{ai_notes}" if self._notes else ai_notes
 
@@ -63,13 +74,16 @@ class LearningDiagnosisAgent(BaseAgent):
             },
         )
 
-    def act(self, decision: AgentDecision, state: SessionState) -> Dict[str, Any]:
+    async def act(self, decision: AgentDecision, state: SessionState) -> Dict[str, Any]:
         if decision.decision_type != "diagnose_learning" or not isinstance(self._submission, SubmissionRecord):
             return {"type": "learning_diagnosis", "message": "No submission to analyse"}
 
-        self._submission.guess_probability = self._guess_probability
-        self._submission.reasoning_label = self._reasoning
-        self._submission.notes = self._notes
+        state.annotate_submission(
+            self._submission,
+            guess_probability=self._guess_probability,
+            reasoning_label=self._reasoning,
+            notes=self._notes,
+        )
 
         state.skill_profile.apply(**self._normalize_adjustments(self._adjustments))
 
@@ -94,11 +108,14 @@ class LearningDiagnosisAgent(BaseAgent):
     def _estimate_guessing(self, submission: SubmissionRecord, previous: Optional[SubmissionRecord], evaluation: Dict[str, Any]) -> float:
         score = 0.25
         if previous:
-            if submission.diff_ratio > 0.85 and evaluation.get("status") != "passed":
+            similar_ratio, stalled_ratio, rapid_ratio = DIFF_RATIO_THRESHOLDS.get(
+                get_similarity_engine().name, DIFF_RATIO_THRESHOLDS["shingle"]
+            )
+            if submission.diff_ratio > similar_ratio and evaluation.get("status") != "passed":
                 score += 0.45
-            if submission.time_delta < 25 and submission.diff_ratio < 0.2:
+            if submission.time_delta < RAPID_RESUBMIT_SECONDS and submission.diff_ratio < rapid_ratio:
                 score += 0.25
-            if submission.tests_passed <= previous.tests_passed and submission.diff_ratio < 0.3:
+            if submission.tests_passed <= previous.tests_passed and submission.diff_ratio < stalled_ratio:
                 score += 0.2
         if evaluation.get("status") == "passed":
             score -= 0.4
@@ -167,7 +184,7 @@ class LearningDiagnosisAgent(BaseAgent):
             "integrity_confidence": adjustments.get("integrity_confidence", 0.0),
         }
 
-    def _generate_ai_notes(self, state: SessionState) -> str:
+    async def _generate_ai_notes(self, state: SessionState) -> str:
         if not self._submission or not self._submission.code:
             return ""
         context = {
@@ -178,7 +195,7 @@ class LearningDiagnosisAgent(BaseAgent):
             } if state.current_problem else {},
         }
         try:
-            analysis = get_ai_service().analyze_behavior(context)
+            analysis = await get_ai_service().analyze_behavior(context)
         except Exception:
             return ""
         return analysis.get("analysis", "").strip()
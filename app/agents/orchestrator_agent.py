@@ -1,15 +1,20 @@
+import time
 from datetime import datetime
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, Optional
 
 from .adaptation_agent import AdaptationAgent
+from .base_agent import Emitter
 from .evaluation_agent import EvaluationAgent
 from .hint_strategy_agent import HintStrategyAgent
 from .integrity_agent import IntegrityAgent
 from .learning_diagnosis_agent import LearningDiagnosisAgent
+from ..config import settings
 from ..core.errors import SkillProofError, build_error_payload
+from ..core.executor import event_executor
 from ..core.message_bus import MessageBus
 from ..services.problem_repository import ProblemRepository
-from ..services.session_state import SessionState, SubmissionRecord
+from ..services.session_history import full_histories
+from ..services.session_state import SessionState
 
 
 class OrchestratorAgent:
@@ -22,7 +27,7 @@ class OrchestratorAgent:
         self.integrity_agent = IntegrityAgent()
         self.hint_agent = HintStrategyAgent()
         self.evaluation_agent = EvaluationAgent()
-        self._handlers: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+        self._handlers: Dict[str, Callable[[Dict[str, Any], Optional[Emitter]], Awaitable[Dict[str, Any]]]] = {
             "session_start": self._handle_session_start,
             "code_submitted": self._handle_code_submitted,
             "hint_requested": self._handle_hint_requested,
@@ -30,7 +35,7 @@ class OrchestratorAgent:
             "resume_session": self._handle_resume_session,
         }
 
-    def _handle_resume_session(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+    async def _handle_resume_session(self, payload: Dict[str, Any], emit: Optional[Emitter] = None) -> Dict[str, Any]:
         self.logger.info("Orchestrator: Resume session requested", extra={"payload": payload})
         # Only allow resume if session is paused or terminated
         if self.state.status in {"paused", "terminated"}:
@@ -55,17 +60,22 @@ class OrchestratorAgent:
     import logging
     logger = logging.getLogger("skillproof.orchestrator_agent")
 
-    def handle_event(self, event_type: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    async def handle_event(
+        self,
+        event_type: str,
+        payload: Dict[str, Any],
+        emit: Optional[Emitter] = None,
+    ) -> Dict[str, Any]:
         try:
             envelope = self._build_envelope(event_type, payload)
             self._publish_envelope(envelope)
             self._advance_integrity_clock(event_type)
             self.logger.info("Orchestrator: Handling event", extra={"event_type": event_type, "payload": payload})
             if event_type in {"focus_lost", "focus_gained", "webcam_alert"}:
-                return self._handle_integrity_event(event_type, payload)
+                return await self._handle_integrity_event(event_type, payload)
             handler = self._handlers.get(event_type)
             if handler:
-                return handler(payload)
+                return await handler(payload, emit)
             return self._handle_default(event_type)
         except Exception as exc:  # pylint: disable=broad-except
             err = exc if isinstance(exc, SkillProofError) else SkillProofError(
@@ -81,28 +91,43 @@ class OrchestratorAgent:
                 "message": error_payload["message"],
                 "error": error_payload,
                 "status": self.state.status,
-                "decision_log": self.state.decision_history[-5:],
+                "decision_log": self.state.recent_decisions(5),
                 "feedback": self.state.agent_feedback,
             }
 
-    def _handle_session_start(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+    async def _handle_session_start(self, payload: Dict[str, Any], emit: Optional[Emitter] = None) -> Dict[str, Any]:
         self.logger.info("Orchestrator: Starting session", extra={"payload": payload})
         self.state.mode = payload.get("mode", self.state.mode)
-        response = self.adaptation_agent.execute(self.state, payload)
+        response = await self.adaptation_agent.execute(self.state, payload)
         response.setdefault("meta", {})["skill_profile"] = self.state.skill_profile.as_dict()
-        response["decision_log"] = self.state.decision_history[-3:]
+        response["decision_log"] = self.state.recent_decisions(3)
         return response
 
-    def _handle_code_submitted(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+    async def _handle_code_submitted(self, payload: Dict[str, Any], emit: Optional[Emitter] = None) -> Dict[str, Any]:
         self.logger.info("Orchestrator: Code submitted", extra={"payload": payload})
-        evaluation_bundle = self.evaluation_agent.execute(self.state, payload)
+        stream = emit if settings.EVAL_STREAMING else None
+        evaluation_bundle = await self.evaluation_agent.execute(self.state, payload, {"emit": stream} if stream else None)
+        if stream is not None:
+            # First useful feedback goes out now; diagnosis and adaptation follow as they finish.
+            await self._emit_safely(stream, {
+                "type": "evaluation_summary",
+                "evaluation": evaluation_bundle["result"],
+                "submission": evaluation_bundle["submission_metrics"],
+                "status": self.state.status,
+            })
         submission = self.state.latest_submission()
-        learning = self.learning_agent.execute(
+        learning = await self.learning_agent.execute(
             self.state,
             payload,
             {"submission": submission, "evaluation": evaluation_bundle["result"]},
         ) if submission else {"type": "learning_diagnosis", "message": "No submission"}
-        adaptation_update = self.adaptation_agent.after_submission(self.state, evaluation_bundle["result"])
+        if stream is not None:
+            await self._emit_safely(stream, {
+                "type": "diagnosis",
+                "diagnosis": learning,
+                "skill_profile": self.state.skill_profile.as_dict(),
+            })
+        adaptation_update = await self.adaptation_agent.after_submission(self.state, evaluation_bundle["result"])
         response: Dict[str, Any] = {
             "type": "code_feedback",
             "evaluation": evaluation_bundle["result"],
@@ -111,7 +136,7 @@ class OrchestratorAgent:
             "skill_profile": self.state.skill_profile.as_dict(),
             "integrity": self.state.integrity.as_dict(),
             "status": self.state.status,
-            "decision_log": self.state.decision_history[-5:],
+            "decision_log": self.state.recent_decisions(5),
             "feedback": self.state.agent_feedback,
         }
         if adaptation_update.get("new_problem"):
@@ -121,14 +146,20 @@ class OrchestratorAgent:
             }
         return response
 
-    def _handle_hint_requested(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+    async def _handle_hint_requested(self, payload: Dict[str, Any], emit: Optional[Emitter] = None) -> Dict[str, Any]:
         self.logger.info("Orchestrator: Hint requested", extra={"payload": payload})
-        hint = self.hint_agent.execute(self.state, payload)
+        hint = await self.hint_agent.execute(self.state, payload, {"emit": emit} if emit else None)
         hint["skill_profile"] = self.state.skill_profile.as_dict()
-        hint["decision_log"] = self.state.decision_history[-3:]
+        hint["decision_log"] = self.state.recent_decisions(3)
         return hint
 
 
+    async def _emit_safely(self, emit: Emitter, frame: Dict[str, Any]) -> None:
+        try:
+            await emit(frame)
+        except Exception as exc:  # pylint: disable=broad-except
+            self.logger.debug("Interim frame not delivered", exc_info=exc)
+
     def _build_envelope(self, event_type: str, payload: Dict[str, Any]) -> Dict[str, Any]:
         return {
             "type": event_type,
@@ -141,65 +172,41 @@ class OrchestratorAgent:
 
     def _advance_integrity_clock(self, event_type: str) -> None:
         if event_type not in {"focus_lost", "focus_gained", "webcam_alert"}:
-            self.state.integrity.advance(datetime.utcnow())
-
-    def _handle_session_start(self, payload: Dict[str, Any]) -> Dict[str, Any]:
-        self.state.mode = payload.get("mode", self.state.mode)
-        response = self.adaptation_agent.execute(self.state, payload)
-        response.setdefault("meta", {})["skill_profile"] = self.state.skill_profile.as_dict()
-        response["decision_log"] = self.state.decision_history[-3:]
-        return response
-
-    def _handle_code_submitted(self, payload: Dict[str, Any]) -> Dict[str, Any]:
-        evaluation_bundle = self.evaluation_agent.execute(self.state, payload)
-        submission = self.state.latest_submission()
-        learning = self.learning_agent.execute(
-            self.state,
-            payload,
-            {"submission": submission, "evaluation": evaluation_bundle["result"]},
-        ) if submission else {"type": "learning_diagnosis", "message": "No submission"}
-
-
-    def _handle_hint_requested(self, payload: Dict[str, Any]) -> Dict[str, Any]:
-        hint = self.hint_agent.execute(self.state, payload)
-        hint["skill_profile"] = self.state.skill_profile.as_dict()
-        hint["decision_log"] = self.state.decision_history[-3:]
-        return hint
+            self.state.integrity.advance(time.time())
 
-    def _handle_integrity_event(self, event_type: str, payload: Dict[str, Any]) -> Dict[str, Any]:
-        integrity_response = self.integrity_agent.execute(self.state, {"event": event_type, **payload})
-        integrity_response["decision_log"] = self.state.decision_history[-3:]
+    async def _handle_integrity_event(self, event_type: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        integrity_response = await self.integrity_agent.execute(self.state, {"event": event_type, **payload})
+        integrity_response["decision_log"] = self.state.recent_decisions(3)
         return integrity_response
 
-    def _handle_session_end(self, _: Dict[str, Any]) -> Dict[str, Any]:
-        return self._session_summary()
+    async def _handle_session_end(self, _: Dict[str, Any], emit: Optional[Emitter] = None) -> Dict[str, Any]:
+        return await self._session_summary()
 
     def _handle_default(self, event_type: str) -> Dict[str, Any]:
         return {"type": "ack", "message": f"Unhandled event: {event_type}"}
 
-    def _session_summary(self) -> Dict[str, Any]:
-        submissions = [self._describe_submission(record) for record in self.state.submissions]
+    async def _session_summary(self) -> Dict[str, Any]:
+        # Older entries live in the database once they leave the in-memory windows.
+        submissions, hints, decisions = await event_executor.run_blocking(full_histories, self.state)
         return {
             "type": "session_summary",
             "status": self.state.status,
             "skill_profile": self.state.skill_profile.as_dict(),
             "integrity": self.state.integrity.as_dict(),
-            "submissions": submissions,
-            "hints": [
-                {"level": hint.level, "timestamp": hint.created_at.isoformat()} for hint in self.state.hints
-            ],
-            "decision_log": self.state.decision_history,
+            "submissions": [self._describe_submission(entry) for entry in submissions],
+            "hints": [{"level": hint["level"], "timestamp": hint["timestamp"]} for hint in hints],
+            "decision_log": decisions,
             "feedback": self.state.agent_feedback,
         }
 
-    def _describe_submission(self, record: SubmissionRecord) -> Dict[str, Any]:
+    def _describe_submission(self, entry: Dict[str, Any]) -> Dict[str, Any]:
         return {
-            "timestamp": record.created_at.isoformat(),
-            "status": record.status,
-            "tests_passed": record.tests_passed,
-            "tests_failed": record.tests_failed,
-            "diff_ratio": round(record.diff_ratio, 3),
-            "guess_probability": round(record.guess_probability, 3),
-            "reasoning_label": record.reasoning_label,
-            "difficulty": record.difficulty,
+            "timestamp": entry["timestamp"],
+            "status": entry["status"],
+            "tests_passed": entry["tests_passed"],
+            "tests_failed": entry["tests_failed"],
+            "diff_ratio": round(entry["diff_ratio"], 3),
+            "guess_probability": round(entry["guess_probability"], 3),
+            "reasoning_label": entry["reasoning_label"],
+            "difficulty": entry["difficulty"],
         }
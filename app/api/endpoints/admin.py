@@ -1,17 +1,50 @@
 from fastapi import APIRouter, HTTPException, Request
 
+from ...services.session_history import full_histories
 from ...services.session_manager import session_manager
 from ...services.auth_service import auth_service
+from ...services.llm_cache import get_llm_cache
+from ...services.eval_cache import get_eval_cache
+from ...services.eval_queue import get_eval_queue
+from ...services.rate_limiter import get_rate_limiter
+from ...services.resilience import get_llm_breaker
+from ...services.sandbox import get_sandbox_pool
+from ...services.submission_store import get_submission_store
+from ...config import settings
+from ...core.executor import event_executor
+from ...websockets.handlers import mailboxes
 
 
 router = APIRouter()
 
 
-@router.get("/dashboard")
-def get_dashboard_data(request: Request):
+def _require_admin(request: Request) -> None:
     user = auth_service.current_user(request)
     if not user or user.get("role") != "admin":
         raise HTTPException(status_code=401, detail="Unauthorized")
+
+
+def _runtime_metrics() -> dict:
+    cache = get_llm_cache()
+    eval_cache = get_eval_cache()
+    submission_store = get_submission_store()
+    return {
+        "executor": event_executor.metrics(),
+        "mailboxes": mailboxes.metrics(),
+        "llm_cache": cache.stats() if cache is not None else None,
+        "llm_limiter": get_rate_limiter().metrics(),
+        "llm_breaker": get_llm_breaker().metrics(),
+        "problems": session_manager.problem_repository.metrics(),
+        "sandbox": get_sandbox_pool().metrics(),
+        "eval_cache": eval_cache.stats() if eval_cache is not None else None,
+        "eval_queue": get_eval_queue().metrics() if settings.EVAL_QUEUE_ENABLED else None,
+        "submission_store": submission_store.metrics() if submission_store is not None else None,
+    }
+
+
+@router.get("/dashboard")
+def get_dashboard_data(request: Request):
+    _require_admin(request)
     sessions = [state.as_summary() for state in session_manager.all_states().values()]
     total_flags = sum(
         summary["integrity"]["focus_losses"] + summary["integrity"]["inactivity_flags"] + summary["integrity"]["webcam_flags"]
@@ -21,4 +54,36 @@ def get_dashboard_data(request: Request):
         "active_users": len(sessions),
         "integrity_flags": total_flags,
         "sessions": sessions,
+        "runtime": _runtime_metrics(),
     }
+
+
+@router.get("/metrics")
+def get_runtime_metrics(request: Request):
+    _require_admin(request)
+    return _runtime_metrics()
+
+
+@router.get("/sessions/{user_id}/history")
+async def get_session_history(request: Request, user_id: str):
+    _require_admin(request)
+    state = session_manager.get_state(user_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail="No active session for this user")
+    submissions, hints, decisions = await event_executor.run_blocking(full_histories, state)
+    return {
+        "user_id": user_id,
+        "session_id": state.session_id,
+        "submissions": submissions,
+        "hints": hints,
+        "decision_log": decisions,
+        "feedback": state.agent_feedback,
+    }
+
+
+@router.post("/problems/prefill")
+async def prefill_problems(request: Request, topic: str, difficulty: str, count: int = 10):
+    _require_admin(request)
+    count = max(1, min(count, 100))
+    problems = await session_manager.problem_repository.prefill(topic, difficulty, count)
+    return {"requested": count, "admitted": len(problems), "ids": [problem.id for problem in problems]}
@@ -8,8 +8,89 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
     DATABASE_URL: str = "sqlite:///./skillproof.db"
+    LLM_PROVIDER: str = "groq"
     GROQ_API_KEY: str = ""
     GROQ_MODEL: str = "llama3-70b-8192"
+    GROQ_HTTP2: bool = True
+    GROQ_MAX_CONNECTIONS: int = 100
+    GROQ_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    GROQ_KEEPALIVE_EXPIRY: float = 30.0
+    GROQ_TIMEOUT: float = 20.0
+    GROQ_CONNECT_TIMEOUT: float = 5.0
+    GROQ_HINT_TIMEOUT: float = 10.0
+    LOCAL_LLM_LATENCY_DISTRIBUTION: str = "lognormal"
+    LOCAL_LLM_LATENCY_MS: float = 400.0
+    LOCAL_LLM_LATENCY_JITTER_MS: float = 150.0
+    LOCAL_LLM_TOKEN_DELAY_MS: float = 15.0
+    LOCAL_LLM_SEED: int = 0
+    HINT_STREAMING: bool = True
+    PROBLEM_STREAMING: bool = True
+    EVAL_STREAMING: bool = True
+    LLM_RATE_LIMIT_RPM: float = 30.0
+    LLM_RATE_LIMIT_BURST: int = 5
+    LLM_CONCURRENCY_INITIAL: int = 4
+    LLM_CONCURRENCY_MIN: int = 1
+    LLM_CONCURRENCY_MAX: int = 32
+    LLM_MAX_RETRIES: int = 2
+    LLM_BACKOFF_BASE: float = 0.5
+    LLM_BACKOFF_MAX: float = 20.0
+    LLM_RETRY_BUDGET: int = 3
+    LLM_BREAKER_FAILURE_THRESHOLD: int = 5
+    LLM_BREAKER_RECOVERY_SECONDS: float = 30.0
+    LLM_BREAKER_HALF_OPEN_CALLS: int = 1
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_PATH: str = "./tmp/llm_cache.db"
+    LLM_CACHE_MAX_ENTRIES: int = 5000
+    LLM_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    LLM_CACHE_CALL_TYPES: str = "analysis"
+    ORCHESTRATOR_WORKERS: int = 32
+    BLOCKING_WORKERS: int = 8
+    SESSION_MAILBOX_SIZE: int = 32
+    SESSION_SUBMISSION_WINDOW: int = 20
+    SESSION_HINT_WINDOW: int = 20
+    SESSION_DECISION_WINDOW: int = 50
+    SESSION_FEEDBACK_WINDOW: int = 10
+    SUBMISSION_STORE_ENABLED: bool = True
+    SUBMISSION_FLUSH_SECONDS: float = 1.0
+    SUBMISSION_FLUSH_BATCH: int = 200
+    SANDBOX_ENABLED: bool = True
+    SANDBOX_WORKERS: int = 0
+    SANDBOX_MAX_JOBS_PER_WORKER: int = 50
+    SANDBOX_CPU_SECONDS: float = 2.0
+    SANDBOX_WALL_SECONDS: float = 5.0
+    SANDBOX_MEMORY_MB: int = 256
+    SANDBOX_MAX_OUTPUT_CHARS: int = 10_000
+    EVAL_TEST_TIMEOUT_SECONDS: float = 1.0
+    EVAL_SUBMISSION_TIMEOUT_SECONDS: float = 3.0
+    EVAL_FAIL_FAST_MODES: str = "learning"
+    EVAL_DISCRIMINATING_ORDER: bool = True
+    SIMILARITY_ENGINE: str = "shingle"
+    SIMILARITY_SHINGLE_SIZE: int = 3
+    SIMILARITY_SHINGLE_UNIT: str = "token"
+    SIMILARITY_MAX_UNITS: int = 20_000
+    EVAL_CACHE_ENABLED: bool = True
+    EVAL_CACHE_MAX_ENTRIES: int = 4096
+    EVAL_QUEUE_ENABLED: bool = False
+    EVAL_QUEUE_POLL_SECONDS: float = 0.05
+    EVAL_QUEUE_RESULT_TIMEOUT_SECONDS: float = 30.0
+    EVAL_QUEUE_LEASE_SECONDS: float = 30.0
+    EVAL_QUEUE_MAX_ATTEMPTS: int = 3
+    EVAL_QUEUE_RETENTION_SECONDS: float = 3600.0
+    EVAL_WORKER_CONCURRENCY: int = 0
+    EVAL_WORKER_IDLE_POLL_SECONDS: float = 0.2
+    PROBLEM_BANK_ENABLED: bool = True
+    PROBLEM_BANK_REFRESH_SECONDS: float = 60.0
+    PROBLEM_CORPUS_ENABLED: bool = True
+    PROBLEM_CORPUS_PATH: str = "./data/problems.jsonl"
+    PROBLEM_BATCH_SIZE: int = 4
+    PROBLEM_ADMISSION_ENABLED: bool = True
+    PROBLEM_POOL_ENABLED: bool = True
+    PROBLEM_POOL_TOPICS: str = "recursion"
+    PROBLEM_POOL_DIFFICULTIES: str = "easy,medium,hard"
+    PROBLEM_POOL_LOW_WATERMARK: int = 2
+    PROBLEM_POOL_HIGH_WATERMARK: int = 5
+    PROBLEM_POOL_REFILL_CONCURRENCY: int = 2
+    PROBLEM_POOL_REFILL_INTERVAL: float = 30.0
     SESSION_SECRET_KEY: str = "change-me"
     ADMIN_EMAIL: str = "admin@example.com"
     ADMIN_PASSWORD: str = "admin123"
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+
+def to_datetime(timestamp: float) -> datetime:
+    """Naive-UTC datetime, the convention of every DateTime column."""
+    return datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None)
+
+
+def to_iso(timestamp: float) -> str:
+    """Render an epoch timestamp as the naive-UTC ISO string clients have always received."""
+    return to_datetime(timestamp).isoformat()
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass, field
-from datetime import datetime
 from typing import Any, Dict, Optional
 
+from .clock import to_iso
 
-@dataclass
+
+@dataclass(slots=True)
 class AgentDecision:
     agent: str
     decision_type: str
@@ -14,7 +16,7 @@ class AgentDecision:
     policy: Optional[str] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
     next_action: Optional[str] = None
-    created_at: datetime = field(default_factory=datetime.utcnow)
+    created_at: float = field(default_factory=time.time)
 
     @property
     def decision(self) -> str:
@@ -28,7 +30,7 @@ class AgentDecision:
             "decision": self.decision_type,
             "confidence": self.confidence,
             "rationale": self.rationale,
-            "timestamp": self.created_at.isoformat(),
+            "timestamp": to_iso(self.created_at),
         }
         if self.next_action:
             payload["next_action"] = self.next_action
@@ -24,6 +24,14 @@ class ServiceError(SkillProofError):
     """Raised for downstream service or CRUD failures."""
 
 
+class CircuitOpenError(ServiceError):
+    """Raised when a circuit breaker short-circuits a call to an unhealthy dependency."""
+
+
+class BackpressureError(SkillProofError):
+    """Raised when a bounded queue refuses new work."""
+
+
 @dataclass
 class ErrorPayload:
     code: str
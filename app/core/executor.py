@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set
+
+from ..config import settings
+
+logger = logging.getLogger("skillproof.executor")
+
+
+@dataclass
+class _Job:
+    key: str
+    func: Callable[..., Awaitable[Any]]
+    args: tuple
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class EventExecutor:
+    """Bounded worker pool for orchestrator events with per-session ordering.
+
+    Events are coroutines run by a fixed number of worker tasks; jobs sharing a
+    key (the session's user id) run strictly one after another in submission
+    order. Synchronous work (database calls, cache I/O) goes through
+    ``run_blocking`` so the event loop itself only does I/O; submitted code
+    runs on threads of its own (``run_suite_async``) so it never holds these.
+    """
+
+    def __init__(self, workers: int, blocking_workers: int) -> None:
+        self._worker_count = max(1, workers)
+        self._blocking = ThreadPoolExecutor(max_workers=max(1, blocking_workers), thread_name_prefix="skillproof-blocking")
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._pending: Dict[str, Deque[_Job]] = {}
+        self._busy_keys: Set[str] = set()
+        self._waits: Deque[float] = deque(maxlen=500)
+        self._in_flight = 0
+        self._blocking_in_flight = 0
+        self._processed = 0
+        self._failed = 0
+
+    def _ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._queue is not None and self._loop is loop:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._pending.clear()
+        self._busy_keys.clear()
+        self._workers = [loop.create_task(self._worker(), name=f"skillproof-event-worker-{idx}") for idx in range(self._worker_count)]
+        logger.info("Event executor started", extra={"workers": self._worker_count})
+
+    async def submit(self, key: str, func: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        self._ensure_started()
+        job = _Job(key=key, func=func, args=args, future=self._loop.create_future())
+        if key in self._busy_keys:
+            self._pending.setdefault(key, deque()).append(job)
+        else:
+            self._busy_keys.add(key)
+            self._queue.put_nowait(job)
+        return await job.future
+
+    async def run_blocking(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        self._blocking_in_flight += 1
+        try:
+            return await loop.run_in_executor(self._blocking, functools.partial(func, *args, **kwargs))
+        finally:
+            self._blocking_in_flight -= 1
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+                self._release(job.key)
+
+    async def _run(self, job: _Job) -> None:
+        if job.future.done():
+            # The submitter went away (e.g. the websocket closed) before we got to it.
+            return
+        self._waits.append(time.perf_counter() - job.enqueued_at)
+        self._in_flight += 1
+        try:
+            result = await job.func(*job.args)
+        except Exception as exc:  # pylint: disable=broad-except
+            self._failed += 1
+            if not job.future.done():
+                job.future.set_exception(exc)
+        else:
+            if not job.future.done():
+                job.future.set_result(result)
+        finally:
+            self._in_flight -= 1
+            self._processed += 1
+
+    def _release(self, key: str) -> None:
+        pending = self._pending.get(key)
+        if pending:
+            next_job = pending.popleft()
+            if not pending:
+                del self._pending[key]
+            self._queue.put_nowait(next_job)
+            return
+        self._busy_keys.discard(key)
+
+    def metrics(self) -> Dict[str, Any]:
+        waits = sorted(tuple(self._waits))
+        queued = self._queue.qsize() if self._queue is not None else 0
+        queued += sum(len(jobs) for jobs in tuple(self._pending.values()))
+        return {
+            "workers": self._worker_count,
+            "queue_depth": queued,
+            "in_flight": self._in_flight,
+            "blocking_in_flight": self._blocking_in_flight,
+            "processed": self._processed,
+            "failed": self._failed,
+            "wait_ms": {
+                "avg": round(sum(waits) / len(waits) * 1000, 2) if waits else 0.0,
+                "p95": round(waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000, 2) if waits else 0.0,
+                "max": round(waits[-1] * 1000, 2) if waits else 0.0,
+            },
+        }
+
+    async def shutdown(self) -> None:
+        for task in self._workers:
+            task.cancel()
+        if self._workers:
+            await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+        self._loop = None
+        self._blocking.shutdown(wait=False, cancel_futures=True)
+
+
+event_executor = EventExecutor(settings.ORCHESTRATOR_WORKERS, settings.BLOCKING_WORKERS)
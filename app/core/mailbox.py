@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+from .errors import BackpressureError
+
+logger = logging.getLogger("skillproof.mailbox")
+
+# Events whose repeats carry no new information while they are still queued.
+# Only idempotent events belong here: a coalesced event gets no reply, and
+# counted events (focus_lost feeds the integrity thresholds) must all be seen.
+COALESCIBLE_EVENTS = {"focus_gained"}
+
+
+@dataclass
+class MailboxEvent:
+    event_type: str
+    payload: Dict[str, Any] = field(default_factory=dict)
+    reply_to: Any = None
+
+
+MailboxHandler = Callable[[str, MailboxEvent], Awaitable[None]]
+
+
+class SessionMailbox:
+    """Actor-style inbox: one consumer task drains events for a single session in order."""
+
+    def __init__(self, key: str, handler: MailboxHandler, max_size: int) -> None:
+        self.key = key
+        self._handler = handler
+        self._max_size = max_size
+        self._items: Deque[MailboxEvent] = deque()
+        self._wakeup = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self.processed = 0
+        self.coalesced = 0
+        self.rejected = 0
+        self._task = asyncio.get_running_loop().create_task(self._consume(), name=f"skillproof-mailbox-{key}")
+
+    @property
+    def depth(self) -> int:
+        return len(self._items)
+
+    def post(self, event: MailboxEvent) -> bool:
+        tail = self._items[-1] if self._items else None
+        if (
+            tail is not None
+            and event.event_type in COALESCIBLE_EVENTS
+            and tail.event_type == event.event_type
+            and tail.payload == event.payload
+        ):
+            self.coalesced += 1
+            return False
+        if len(self._items) >= self._max_size:
+            self.rejected += 1
+            raise BackpressureError(
+                "Too many pending events for this session",
+                code="mailbox_full",
+                context={"session": self.key, "depth": len(self._items), "limit": self._max_size},
+            )
+        self._items.append(event)
+        self._idle.clear()
+        self._wakeup.set()
+        return True
+
+    async def _consume(self) -> None:
+        while True:
+            while not self._items:
+                self._idle.set()
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            event = self._items.popleft()
+            try:
+                await self._handler(self.key, event)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Mailbox handler failed", extra={"session": self.key, "event_type": event.event_type})
+            finally:
+                self.processed += 1
+
+    async def drain(self) -> None:
+        await self._idle.wait()
+
+    async def close(self, *, drain: bool = True) -> None:
+        if drain:
+            await self.drain()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+
+class MailboxRegistry:
+    """Creates one mailbox per session key and tracks aggregate queue metrics."""
+
+    def __init__(self, handler: MailboxHandler, *, max_size: int) -> None:
+        self._handler = handler
+        self._max_size = max_size
+        self._mailboxes: Dict[str, SessionMailbox] = {}
+        self._coalesced = 0
+        self._rejected = 0
+        self._processed = 0
+
+    def get(self, key: str) -> Optional[SessionMailbox]:
+        return self._mailboxes.get(key)
+
+    def post(self, key: str, event: MailboxEvent) -> bool:
+        mailbox = self._mailboxes.get(key)
+        if mailbox is None:
+            mailbox = SessionMailbox(key, self._handler, self._max_size)
+            self._mailboxes[key] = mailbox
+        return mailbox.post(event)
+
+    async def close(self, key: str, *, drain: bool = True) -> None:
+        mailbox = self._mailboxes.get(key)
+        if mailbox is None:
+            return
+        await mailbox.close(drain=drain)
+        # Only forget the mailbox if nobody replaced it while we were draining.
+        if self._mailboxes.get(key) is mailbox:
+            del self._mailboxes[key]
+        self._coalesced += mailbox.coalesced
+        self._rejected += mailbox.rejected
+        self._processed += mailbox.processed
+
+    async def close_all(self) -> None:
+        for key in list(self._mailboxes):
+            await self.close(key, drain=False)
+
+    def metrics(self) -> Dict[str, Any]:
+        mailboxes = list(self._mailboxes.values())
+        depths = [mailbox.depth for mailbox in mailboxes]
+        return {
+            "mailboxes": len(mailboxes),
+            "queued": sum(depths),
+            "max_depth": max(depths) if depths else 0,
+            "capacity": self._max_size,
+            "processed": self._processed + sum(mailbox.processed for mailbox in mailboxes),
+            "coalesced": self._coalesced + sum(mailbox.coalesced for mailbox in mailboxes),
+            "rejected": self._rejected + sum(mailbox.rejected for mailbox in mailboxes),
+        }
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session
+
+from ..models.eval_job import EvalJob
+
+
+def get(db: Session, job_id: int) -> Optional[EvalJob]:
+    return db.query(EvalJob).filter(EvalJob.id == job_id).first()
+
+
+def enqueue(
+    db: Session,
+    *,
+    session_key: str,
+    problem_id: str,
+    entrypoint: str,
+    code: str,
+    tests: List[Dict[str, Any]],
+    options: Dict[str, Any],
+    stream: bool,
+) -> EvalJob:
+    job = EvalJob(
+        session_key=session_key,
+        problem_id=problem_id,
+        entrypoint=entrypoint,
+        code=code,
+        tests=tests,
+        options=options,
+        stream=stream,
+        progress=[],
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def claim_next(db: Session, *, worker_id: str, lease_seconds: float, max_attempts: int) -> Optional[EvalJob]:
+    """Take the oldest queued job, or a running one whose worker let the lease lapse."""
+    now = datetime.utcnow()
+    expired = and_(EvalJob.status == "running", EvalJob.lease_expires_at < now)
+    # Jobs that keep killing their worker are not retried forever.
+    db.query(EvalJob).filter(expired, EvalJob.attempts >= max_attempts).update(
+        {"status": "failed", "finished_at": now}, synchronize_session=False
+    )
+    db.commit()
+    candidates = (
+        db.query(EvalJob.id, EvalJob.status, EvalJob.lease_expires_at)
+        .filter(or_(EvalJob.status == "queued", expired))
+        .order_by(EvalJob.id)
+        .limit(8)
+        .all()
+    )
+    for job_id, status, lease in candidates:
+        # Compare-and-set on (status, lease) so two workers never both win the same job.
+        claimed = (
+            db.query(EvalJob)
+            .filter(EvalJob.id == job_id, EvalJob.status == status, EvalJob.lease_expires_at == lease)
+            .update(
+                {
+                    "status": "running",
+                    "worker_id": worker_id,
+                    "attempts": EvalJob.attempts + 1,
+                    "started_at": now,
+                    "lease_expires_at": now + timedelta(seconds=lease_seconds),
+                    "progress": [],
+                },
+                synchronize_session=False,
+            )
+        )
+        db.commit()
+        if claimed:
+            return get(db, job_id)
+    return None
+
+
+def _held_by(job_id: int, worker_id: str, attempt: int):
+    """Rows still leased to this worker for this attempt; a lapsed lease that another worker re-claimed no longer matches."""
+    return and_(
+        EvalJob.id == job_id,
+        EvalJob.worker_id == worker_id,
+        EvalJob.attempts == attempt,
+        EvalJob.status == "running",
+    )
+
+
+def append_progress(db: Session, job_id: int, detail: Dict[str, Any], *, worker_id: str, attempt: int) -> bool:
+    job = db.query(EvalJob).filter(_held_by(job_id, worker_id, attempt)).first()
+    if job is None:
+        return False
+    updated = (
+        db.query(EvalJob)
+        .filter(_held_by(job_id, worker_id, attempt))
+        .update({"progress": [*(job.progress or []), detail]}, synchronize_session=False)
+    )
+    db.commit()
+    return bool(updated)
+
+
+def finish(db: Session, job_id: int, *, worker_id: str, attempt: int, status: str, result: Dict[str, Any]) -> bool:
+    """Write the result only while the caller still holds the lease, mirroring the claim in ``claim_next``."""
+    finished = (
+        db.query(EvalJob)
+        .filter(_held_by(job_id, worker_id, attempt))
+        .update({"status": status, "result": result, "finished_at": datetime.utcnow()}, synchronize_session=False)
+    )
+    db.commit()
+    return bool(finished)
+
+
+def cancel_if_queued(db: Session, job_id: int) -> bool:
+    cancelled = (
+        db.query(EvalJob)
+        .filter(EvalJob.id == job_id, EvalJob.status == "queued")
+        .update({"status": "cancelled", "finished_at": datetime.utcnow()}, synchronize_session=False)
+    )
+    db.commit()
+    return bool(cancelled)
+
+
+def count_by_status(db: Session) -> Dict[str, int]:
+    return dict(db.query(EvalJob.status, func.count(EvalJob.id)).group_by(EvalJob.status).all())
+
+
+def oldest_queued_at(db: Session) -> Optional[datetime]:
+    return db.query(func.min(EvalJob.enqueued_at)).filter(EvalJob.status == "queued").scalar()
+
+
+def purge_finished(db: Session, older_than: datetime) -> int:
+    purged = (
+        db.query(EvalJob)
+        .filter(EvalJob.status.in_(("done", "failed", "cancelled")), EvalJob.finished_at < older_than)
+        .delete(synchronize_session=False)
+    )
+    db.commit()
+    return purged
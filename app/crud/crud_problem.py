@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from ..models.problem import Problem as ProblemModel
+
+
+def get(db: Session, problem_id: str) -> Optional[ProblemModel]:
+    return db.query(ProblemModel).filter(ProblemModel.id == problem_id).first()
+
+
+def get_by_hash(db: Session, content_hash: str) -> Optional[ProblemModel]:
+    return db.query(ProblemModel).filter(ProblemModel.content_hash == content_hash).first()
+
+
+def list_all(db: Session) -> List[ProblemModel]:
+    return db.query(ProblemModel).all()
+
+
+def list_by_topic_difficulty(db: Session, topic: str, difficulty: str) -> List[ProblemModel]:
+    return (
+        db.query(ProblemModel)
+        .filter(ProblemModel.topic == topic, ProblemModel.difficulty == difficulty)
+        .all()
+    )
+
+
+def create_problem(db: Session, *, content_hash: str, source: str, payload: Dict[str, Any]) -> ProblemModel:
+    record = ProblemModel(content_hash=content_hash, source=source, **payload)
+    db.add(record)
+    db.commit()
+    db.refresh(record)
+    return record
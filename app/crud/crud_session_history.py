@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..models.session_history import SessionHistoryEntry
+
+
+def add_entries(db: Session, session_id: int, entries: Iterable[Tuple[str, int, Dict[str, Any]]]) -> int:
+    """Insert ``(kind, seq, payload)`` rows in one transaction."""
+    rows = [SessionHistoryEntry(session_id=session_id, kind=kind, seq=seq, payload=payload) for kind, seq, payload in entries]
+    if not rows:
+        return 0
+    db.add_all(rows)
+    db.commit()
+    return len(rows)
+
+
+def list_entries(db: Session, session_id: int, kind: str) -> List[Tuple[int, Dict[str, Any]]]:
+    rows = (
+        db.query(SessionHistoryEntry.seq, SessionHistoryEntry.payload)
+        .filter(SessionHistoryEntry.session_id == session_id, SessionHistoryEntry.kind == kind)
+        .order_by(SessionHistoryEntry.seq)
+        .all()
+    )
+    return [(seq, payload) for seq, payload in rows]
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import hashlib
+import zlib
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..models.submission import CodeBlob, Submission
+
+_COMPRESSION_LEVEL = 6
+
+
+def code_hash(code: str) -> str:
+    return hashlib.sha256(code.encode("utf-8")).hexdigest()
+
+
+def save_batch(db: Session, rows: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Upsert submission rows keyed by (session_id, seq), storing each distinct code body once.
+
+    Every row carries its ``code``; only bodies whose hash is not already in
+    ``code_blobs`` are compressed and inserted.
+    """
+    bodies = {code_hash(row["code"]): row["code"] for row in rows}
+    known = {
+        value
+        for (value,) in db.query(CodeBlob.hash).filter(CodeBlob.hash.in_(list(bodies))).all()
+    }
+    raw_bytes = compressed_bytes = 0
+    for digest, code in bodies.items():
+        if digest in known:
+            continue
+        raw = code.encode("utf-8")
+        data = zlib.compress(raw, _COMPRESSION_LEVEL)
+        raw_bytes += len(raw)
+        compressed_bytes += len(data)
+        db.add(CodeBlob(hash=digest, size=len(raw), data=data))
+
+    session_ids = {row["session_id"] for row in rows}
+    existing = {
+        (record.session_id, record.seq): record
+        for record in db.query(Submission)
+        .filter(Submission.session_id.in_(session_ids), Submission.seq.in_({row["seq"] for row in rows}))
+        .all()
+    }
+    for row in rows:
+        values = {key: value for key, value in row.items() if key != "code"}
+        values["code_hash"] = code_hash(row["code"])
+        record = existing.get((row["session_id"], row["seq"]))
+        if record is None:
+            db.add(Submission(**values))
+        else:
+            for key, value in values.items():
+                setattr(record, key, value)
+    db.commit()
+    return {
+        "blobs_written": len(bodies) - len(known),
+        "blobs_reused": len(known),
+        "raw_bytes": raw_bytes,
+        "compressed_bytes": compressed_bytes,
+    }
+
+
+def list_for_session(db: Session, session_id: int) -> List[Tuple[int, Dict[str, Any]]]:
+    rows = (
+        db.query(Submission, CodeBlob.data)
+        .join(CodeBlob, CodeBlob.hash == Submission.code_hash)
+        .filter(Submission.session_id == session_id)
+        .order_by(Submission.seq)
+        .all()
+    )
+    return [(record.seq, _payload(record, zlib.decompress(data).decode("utf-8"))) for record, data in rows]
+
+
+def _payload(record: Submission, code: str) -> Dict[str, Any]:
+    """Same shape as ``SubmissionRecord.as_dict``."""
+    return {
+        "timestamp": record.created_at.isoformat(),
+        "problem_id": record.problem_id or "",
+        "status": record.status,
+        "tests_passed": record.tests_passed,
+        "tests_failed": record.tests_failed,
+        "total_tests": record.total_tests,
+        "diff_ratio": record.diff_ratio,
+        "time_delta": record.time_delta,
+        "guess_probability": record.guess_probability,
+        "reasoning_label": record.reasoning_label,
+        "notes": record.notes or "",
+        "difficulty": record.difficulty or "",
+        "code": code,
+    }
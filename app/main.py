@@ -5,15 +5,20 @@ from fastapi.templating import Jinja2Templates
 from starlette.middleware.sessions import SessionMiddleware
 from .api.endpoints import sessions, admin, auth
 from .websockets.connection_manager import manager
-from .websockets.handlers import handle_websocket_message
+from .websockets.handlers import handle_websocket_message, mailboxes
 from .db import session as db_session, base as db_base
 from . import models  # noqa: F401  # Ensure SQLAlchemy models are registered
 from .services.session_manager import session_manager
 from .core.errors import SkillProofError, build_error_payload
 from .config import settings
 from .services.auth_service import auth_service
+from .services.ai_service import shutdown_ai_service
+from .services.sandbox import get_sandbox_pool
+from .services.submission_store import get_submission_store
+from .core.executor import event_executor
 
 db_base.Base.metadata.create_all(bind=db_session.engine)
+db_session.add_missing_columns(db_base.Base.metadata)
 
 app = FastAPI(title="SkillProof AI")
 app.add_middleware(SessionMiddleware, secret_key=settings.SESSION_SECRET_KEY, session_cookie="skillproof_session")
@@ -33,6 +38,31 @@ async def ensure_admin() -> None:
     auth_service.ensure_admin_account()
 
 
+@app.on_event("startup")
+async def start_problem_pool() -> None:
+    await session_manager.problem_repository.start()
+
+
+@app.on_event("startup")
+async def start_sandbox_pool() -> None:
+    # Queued evaluation runs in app.workers.eval_worker processes, which own their sandboxes.
+    if settings.SANDBOX_ENABLED and not settings.EVAL_QUEUE_ENABLED:
+        await event_executor.run_blocking(get_sandbox_pool().start)
+
+
+@app.on_event("shutdown")
+async def shutdown_runtime() -> None:
+    await mailboxes.close_all()
+    await session_manager.problem_repository.stop()
+    await shutdown_ai_service()
+    await event_executor.shutdown()
+    if settings.SANDBOX_ENABLED:
+        get_sandbox_pool().close()
+    store = get_submission_store()
+    if store is not None:
+        store.close()
+
+
 @app.exception_handler(SkillProofError)
 async def handle_skillproof_error(_: Request, exc: SkillProofError) -> JSONResponse:
     payload = build_error_payload(exc).as_dict()
@@ -122,5 +152,6 @@ async def websocket_endpoint(websocket: WebSocket, client_id: str):
             await handle_websocket_message(websocket, data)
     except WebSocketDisconnect:
         manager.disconnect(websocket)
-        session_manager.close_session(client_id)
+        await mailboxes.close(client_id)
+        await event_executor.run_blocking(session_manager.close_session, client_id)
         await manager.broadcast(f"Client #{client_id} left the chat")
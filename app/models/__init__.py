@@ -4,3 +4,7 @@ from .session import Session  # noqa: F401
 from .skill_profile import SkillProfile  # noqa: F401
 from .agent_feedback import AgentFeedback  # noqa: F401
 from .user_account import UserAccount  # noqa: F401
+from .problem import Problem  # noqa: F401
+from .eval_job import EvalJob  # noqa: F401
+from .session_history import SessionHistoryEntry  # noqa: F401
+from .submission import CodeBlob, Submission  # noqa: F401
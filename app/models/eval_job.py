@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import JSON, Boolean, Column, DateTime, Index, Integer, String, Text
+
+from ..db.base import Base
+
+
+class EvalJob(Base):
+    __tablename__ = "eval_jobs"
+    __table_args__ = (Index("ix_eval_jobs_status_id", "status", "id"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    session_key = Column(String, nullable=False, index=True)
+    problem_id = Column(String, nullable=False)
+    entrypoint = Column(String, nullable=False)
+    code = Column(Text, nullable=False)
+    tests = Column(JSON, nullable=False)
+    options = Column(JSON, nullable=False)
+    stream = Column(Boolean, default=False, nullable=False)
+    status = Column(String(16), default="queued", nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    worker_id = Column(String)
+    progress = Column(JSON)
+    result = Column(JSON)
+    enqueued_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    lease_expires_at = Column(DateTime)
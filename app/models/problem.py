@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import JSON, Column, DateTime, Index, String, Text
+
+from ..db.base import Base
+
+
+class Problem(Base):
+    __tablename__ = "problems"
+    __table_args__ = (Index("ix_problems_topic_difficulty", "topic", "difficulty"),)
+
+    id = Column(String, primary_key=True, index=True)
+    content_hash = Column(String(64), unique=True, nullable=False, index=True)
+    topic = Column(String, nullable=False)
+    difficulty = Column(String, nullable=False)
+    title = Column(String, nullable=False)
+    description = Column(Text, nullable=False)
+    starter_code = Column(Text, nullable=False)
+    entrypoint = Column(String, nullable=False)
+    tests = Column(JSON, nullable=False)
+    hints = Column(JSON, nullable=False)
+    bug_hint = Column(Text)
+    baseline = Column(JSON)
+    source = Column(String(20), nullable=False, default="ai")
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def as_spec_payload(self) -> dict:
+        return {
+            "id": self.id,
+            "topic": self.topic,
+            "difficulty": self.difficulty,
+            "title": self.title,
+            "description": self.description,
+            "starter_code": self.starter_code,
+            "entrypoint": self.entrypoint,
+            "tests": self.tests,
+            "hints": self.hints,
+            "bug_hint": self.bug_hint,
+            "baseline": self.baseline,
+        }
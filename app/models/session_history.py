@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import JSON, Column, DateTime, ForeignKey, Index, Integer, String
+
+from ..db.base import Base
+
+
+class SessionHistoryEntry(Base):
+    __tablename__ = "session_history"
+    __table_args__ = (Index("ix_session_history_session_kind_seq", "session_id", "kind", "seq", unique=True),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    session_id = Column(Integer, ForeignKey("sessions.id", ondelete="CASCADE"), nullable=False)
+    kind = Column(String(16), nullable=False)
+    seq = Column(Integer, nullable=False)
+    payload = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, LargeBinary, String
+
+from ..db.base import Base
+
+
+class CodeBlob(Base):
+    """Submitted code stored once per distinct body, keyed by its SHA-256 and zlib-compressed."""
+
+    __tablename__ = "code_blobs"
+
+    hash = Column(String(64), primary_key=True)
+    size = Column(Integer, nullable=False)
+    data = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class Submission(Base):
+    __tablename__ = "submissions"
+    __table_args__ = (Index("ix_submissions_session_seq", "session_id", "seq", unique=True),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    session_id = Column(Integer, ForeignKey("sessions.id", ondelete="CASCADE"), nullable=False)
+    seq = Column(Integer, nullable=False)
+    code_hash = Column(String(64), ForeignKey("code_blobs.hash"), nullable=False, index=True)
+    problem_id = Column(String)
+    difficulty = Column(String)
+    status = Column(String(16), nullable=False)
+    tests_passed = Column(Integer, nullable=False)
+    tests_failed = Column(Integer, nullable=False)
+    total_tests = Column(Integer, nullable=False)
+    diff_ratio = Column(Float, nullable=False)
+    time_delta = Column(Float, nullable=False)
+    guess_probability = Column(Float, nullable=False, default=0.0)
+    reasoning_label = Column(String(32))
+    notes = Column(String)
+    created_at = Column(DateTime, nullable=False)
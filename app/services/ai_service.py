@@ -1,12 +1,21 @@
 # app/services/ai_service.py
 
-import time
+import asyncio
+import importlib.util
 import json
 import logging
-import requests
-from typing import Any, Dict, Optional, List
+import re
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Optional, List
+
+import httpx
 
 from ..config import settings
+from ..core.executor import event_executor
+from .llm_cache import CachePolicy, LLMResponseCache, get_llm_cache
+from .llm_providers import LLMProvider, LocalLLMProvider
+from .rate_limiter import get_rate_limiter
+from .resilience import get_llm_breaker, spend_retry
 
 logger = logging.getLogger("skillproof.ai_service")
 
@@ -15,7 +24,8 @@ logger = logging.getLogger("skillproof.ai_service")
 # API CLIENT (transport only)
 # =========================================================
 
-class GroqClient:
+class GroqClient(LLMProvider):
+    name = "groq"
     BASE_URL = "https://api.groq.com/openai/v1/chat/completions"
 
     def __init__(self):
@@ -25,49 +35,192 @@ class GroqClient:
         if not self.api_key:
             raise RuntimeError("GROQ_API_KEY missing")
 
-    def chat(
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.limiter = get_rate_limiter()
+        self.breaker = get_llm_breaker()
+
+    @staticmethod
+    def _http2_enabled() -> bool:
+        # httpx only negotiates HTTP/2 when the optional h2 package is present.
+        return settings.GROQ_HTTP2 and importlib.util.find_spec("h2") is not None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # A pooled client is bound to the loop it was created on, so rebuild it
+        # if we are called from a different loop (e.g. scripts using asyncio.run).
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                http2=self._http2_enabled(),
+                limits=httpx.Limits(
+                    max_connections=settings.GROQ_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.GROQ_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=settings.GROQ_KEEPALIVE_EXPIRY,
+                ),
+                timeout=httpx.Timeout(settings.GROQ_TIMEOUT, connect=settings.GROQ_CONNECT_TIMEOUT),
+                headers={
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json",
+                },
+            )
+            self._client_loop = loop
+            logger.info("Groq HTTP client created", extra={"http2": self._http2_enabled()})
+        return self._client
+
+    async def chat(
         self,
         messages: List[Dict[str, str]],
         *,
         max_tokens: int,
         temperature: float,
-        retries: int = 2,
+        retries: Optional[int] = None,
+        timeout: Optional[float] = None,
+        call_type: Optional[str] = None,
     ) -> str:
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
-
         payload = {
             "model": self.model,
             "messages": messages,
             "max_tokens": max_tokens,
             "temperature": temperature,
         }
+        client = self._get_client()
+        request_timeout = httpx.Timeout(timeout, connect=settings.GROQ_CONNECT_TIMEOUT) if timeout else httpx.USE_CLIENT_DEFAULT
+        retries = settings.LLM_MAX_RETRIES if retries is None else retries
 
         for attempt in range(retries + 1):
-            try:
-                logger.info("Calling Groq API", extra={"attempt": attempt})
-                resp = requests.post(
-                    self.BASE_URL,
-                    headers=headers,
-                    json=payload,
-                    timeout=20,
-                )
-                if resp.status_code != 200:
+            # Checked before queueing on the limiter so an open breaker fails in microseconds.
+            self.breaker.before_call()
+            retry_after: Optional[float] = None
+            async with self.limiter.slot():
+                try:
+                    logger.info("Calling Groq API", extra={"attempt": attempt})
+                    resp = await client.post(self.BASE_URL, json=payload, timeout=request_timeout)
+                except httpx.TransportError:
+                    logger.exception("Groq API call failed")
+                    self.limiter.on_error()
+                    self.breaker.record_failure()
+                    if attempt >= retries or not spend_retry():
+                        raise
+                else:
+                    if resp.status_code == 200:
+                        self.limiter.on_success(resp.headers)
+                        self.breaker.record_success()
+                        return resp.json()["choices"][0]["message"]["content"].strip()
                     try:
                         error_body = resp.json()
                     except Exception:
                         error_body = resp.text
                     logger.error(f"Groq API error: {resp.status_code} - {error_body}")
-                    resp.raise_for_status()
-                return resp.json()["choices"][0]["message"]["content"].strip()
+                    self._record_status(resp)
+                    if resp.status_code == 429:
+                        retry_after = self.limiter.on_throttled(resp.headers)
+                    if attempt >= retries or not self._retryable(resp.status_code) or not spend_retry():
+                        resp.raise_for_status()
+            # Back off outside the slot so a sleeping retry does not hold concurrency.
+            await self.limiter.backoff(attempt, retry_after)
+
+    def _record_status(self, resp: httpx.Response) -> None:
+        # Server errors mean the provider is unhealthy; any other answer (including
+        # 429, which the limiter handles) proves it is reachable.
+        if resp.status_code >= 500:
+            self.limiter.on_error()
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
 
-            except Exception:
-                logger.exception("Groq API call failed")
-                if attempt >= retries:
+    @staticmethod
+    def _retryable(status_code: int) -> bool:
+        return status_code == 429 or status_code >= 500
+
+    async def stream_chat(
+        self,
+        messages: List[Dict[str, str]],
+        *,
+        max_tokens: int,
+        temperature: float,
+        retries: int = 0,
+        timeout: Optional[float] = None,
+        call_type: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """Yield completion text deltas as the server-sent chunks arrive.
+
+        Failures are only retried before the first delta; hints keep the
+        default of 0 because their static fallback beats waiting on a retry.
+        """
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "stream": True,
+        }
+        client = self._get_client()
+        request_timeout = httpx.Timeout(timeout, connect=settings.GROQ_CONNECT_TIMEOUT) if timeout else httpx.USE_CLIENT_DEFAULT
+        started = time.perf_counter()
+        first_token = True
+
+        for attempt in range(retries + 1):
+            self.breaker.before_call()
+            retry_after: Optional[float] = None
+            logger.info("Calling Groq API (stream)", extra={"attempt": attempt})
+            try:
+                async with self.limiter.slot(), client.stream("POST", self.BASE_URL, json=payload, timeout=request_timeout) as resp:
+                    if resp.status_code != 200:
+                        error_body = (await resp.aread()).decode("utf-8", "replace")
+                        logger.error(f"Groq API error: {resp.status_code} - {error_body}")
+                        self._record_status(resp)
+                        if resp.status_code == 429:
+                            retry_after = self.limiter.on_throttled(resp.headers)
+                        if attempt >= retries or not self._retryable(resp.status_code) or not spend_retry():
+                            resp.raise_for_status()
+                    else:
+                        self.limiter.on_success(resp.headers)
+                        self.breaker.record_success()
+                        async for line in resp.aiter_lines():
+                            if not line.startswith("data:"):
+                                continue
+                            data = line[len("data:"):].strip()
+                            if data == "[DONE]":
+                                break
+                            try:
+                                chunk = json.loads(data)
+                            except json.JSONDecodeError:
+                                logger.warning("Skipping malformed stream chunk: %s", data)
+                                continue
+                            choices = chunk.get("choices") or [{}]
+                            delta = (choices[0].get("delta") or {}).get("content")
+                            if not delta:
+                                continue
+                            if first_token:
+                                first_token = False
+                                logger.info("Groq stream first token", extra={"ttft_ms": round((time.perf_counter() - started) * 1000, 1)})
+                            yield delta
+                        return
+            except httpx.TransportError:
+                self.limiter.on_error()
+                self.breaker.record_failure()
+                if not first_token or attempt >= retries or not spend_retry():
                     raise
-                time.sleep(1.5 * (attempt + 1))
+            await self.limiter.backoff(attempt, retry_after)
+
+    async def aclose(self) -> None:
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+        self._client_loop = None
+
+
+# =========================================================
+# PROVIDER SELECTION
+# =========================================================
+
+def build_llm_provider() -> LLMProvider:
+    provider = settings.LLM_PROVIDER.lower()
+    if provider == "groq":
+        return GroqClient()
+    if provider == "local":
+        return LocalLLMProvider.from_settings()
+    raise RuntimeError(f"Unknown LLM_PROVIDER: {settings.LLM_PROVIDER}")
 
 
 # =========================================================
@@ -104,11 +257,213 @@ class PromptBuilder:
             "starter_code, entrypoint, hints, tests, bug_hint\n"
         )
 
+    @staticmethod
+    def build_batch_prompt(
+        *,
+        topic: str,
+        difficulty: str,
+        count: int,
+        seed: Optional[int],
+    ) -> str:
+        return (
+            "You are an expert programming challenge designer.\n"
+            f"Your task is to generate {count} DIFFERENT DEBUGGING problems.\n\n"
+            "STRICT RULES:\n"
+            "- Each starter code MUST contain a buggy implementation\n"
+            "- DO NOT return stubs, pass, TODO, or comments-only code\n"
+            "- Tests MUST fail on the buggy code\n"
+            "- Problems must be original, non-trivial and distinct from each other, each with a unique id\n"
+            "- Return ONLY valid JSON, no explanations, no markdown, no extra text, no code blocks, no comments, no preamble or postamble.\n"
+            "- The 'hints' field of every problem MUST be a list of strings.\n\n"
+            f"Topic: {topic}\n"
+            f"Difficulty: {difficulty}\n"
+            f"Count: {count}\n"
+            f"Seed: {seed or 'none'}\n\n"
+            "Return a JSON object of the form {\"problems\": [...]} where every entry has the keys:\n"
+            "id, topic, difficulty, title, description,\n"
+            "starter_code, entrypoint, hints, tests, bug_hint\n"
+        )
+
+    @staticmethod
+    def build_hint_prompt(context: Dict[str, Any]) -> str:
+        problem = context.get("problem") or {}
+        return (
+            "You are a patient programming tutor helping a learner debug their code.\n"
+            "Give ONE short hint (max 3 sentences). Never reveal the full solution.\n\n"
+            f"Hint level: {context.get('level')} "
+            "(conceptual = underlying idea, directional = where to look, code = concrete change)\n"
+            f"Problem: {problem.get('title')}\n"
+            f"Description: {problem.get('description')}\n"
+            f"Difficulty: {problem.get('difficulty')}\n"
+            f"Topic: {problem.get('topic')}\n"
+            f"{context.get('evaluation_summary') or ''}\n\n"
+            f"Learner code:\n{context.get('code') or '(no submission yet)'}\n\n"
+            f"Reference hint: {context.get('fallback_hint') or 'none'}\n"
+        )
+
+    @staticmethod
+    def build_analysis_prompt(context: Dict[str, Any]) -> str:
+        problem = context.get("problem") or {}
+        return (
+            "You are reviewing a learner's debugging attempt.\n"
+            "In at most 2 sentences, describe the reasoning the code shows and the most likely misconception.\n"
+            "Return ONLY valid JSON of the form {\"analysis\": \"...\"}.\n\n"
+            f"Problem: {problem.get('title')}\n"
+            f"Description: {problem.get('description')}\n\n"
+            f"Learner code:\n{context.get('code')}\n"
+        )
+
 
 # =========================================================
 # JSON EXTRACTION
 # =========================================================
 
+class StreamingJSONExtractor:
+    """Incrementally locates the first JSON object in a streamed completion.
+
+    Chunks are scanned once as they arrive, tracking string/escape state so
+    braces inside string literals (e.g. starter code building dicts) are not
+    counted. Each top-level value is parsed as soon as it closes and handed
+    to ``field_validator``; a ValueError from the validator, a bracket
+    mismatch or a malformed key aborts the stream instead of waiting for the
+    rest of the response.
+    """
+
+    PREAMBLE_LIMIT = 2000
+
+    _STRUCTURAL = re.compile(r'[{}\[\]",:]')
+    _STRING_SPECIAL = re.compile(r'["\\]')
+    _CLOSERS = {"}": "{", "]": "["}
+
+    def __init__(self, field_validator: Optional[Callable[[str, Any], None]] = None):
+        self._validate_field = field_validator
+        self._preamble = 0
+        self._buffer = ""
+        self._pos = 0
+        self._stack: List[str] = []
+        self._in_string = False
+        self._string_start = 0
+        self._expect = "key"
+        self._key: Optional[str] = None
+        self._value_start = 0
+        self.fields: List[str] = []
+        self.result: Optional[Dict[str, Any]] = None
+
+    @property
+    def done(self) -> bool:
+        return self.result is not None
+
+    def feed(self, chunk: str) -> Optional[Dict[str, Any]]:
+        if self.result is not None or not chunk:
+            return self.result
+        if not self._stack and not self._buffer:
+            start = chunk.find("{")
+            if start == -1:
+                self._preamble += len(chunk)
+                if self._preamble > self.PREAMBLE_LIMIT:
+                    raise ValueError("No JSON object in AI response preamble")
+                return None
+            chunk = chunk[start:]
+        self._buffer += chunk
+        self._scan()
+        return self.result
+
+    def finish(self) -> Dict[str, Any]:
+        if self.result is None:
+            raise ValueError("Unbalanced JSON" if self._buffer else "No JSON found in AI response")
+        return self.result
+
+    def _scan(self) -> None:
+        buffer = self._buffer
+        pos = self._pos
+        while self.result is None:
+            if self._in_string:
+                match = self._STRING_SPECIAL.search(buffer, pos)
+                if match is None:
+                    pos = len(buffer)
+                    break
+                if match.group() == "\\":
+                    if match.end() >= len(buffer):
+                        # The escaped character has not arrived yet.
+                        pos = match.start()
+                        break
+                    pos = match.end() + 1
+                    continue
+                self._in_string = False
+                pos = match.end()
+                self._close_string(pos)
+                continue
+
+            match = self._STRUCTURAL.search(buffer, pos)
+            if match is None:
+                pos = len(buffer)
+                break
+            char, idx = match.group(), match.start()
+            pos = match.end()
+            if char == '"':
+                self._in_string = True
+                self._string_start = idx
+                if len(self._stack) == 1 and self._expect not in ("key", "value"):
+                    raise ValueError(f"Unexpected string at offset {idx}")
+            elif char in "{[":
+                if len(self._stack) == 1 and self._expect != "value":
+                    raise ValueError(f"Unexpected '{char}' at offset {idx}")
+                self._stack.append(char)
+            elif char in "}]":
+                if not self._stack or self._stack[-1] != self._CLOSERS[char]:
+                    raise ValueError(f"Mismatched '{char}' at offset {idx}")
+                if len(self._stack) == 1:
+                    if self._expect in ("value", "end"):
+                        self._close_value(idx)
+                    elif self._expect != "key" or self._key is not None:
+                        raise ValueError(f"Truncated member before offset {idx}")
+                self._stack.pop()
+                if not self._stack:
+                    self._finish_root(idx)
+                elif len(self._stack) == 1:
+                    self._expect = "end"
+            elif len(self._stack) == 1:
+                if char == ":":
+                    if self._expect != "colon":
+                        raise ValueError(f"Unexpected ':' at offset {idx}")
+                    self._expect = "value"
+                    self._value_start = pos
+                elif char == ",":
+                    if self._expect not in ("value", "end"):
+                        raise ValueError(f"Unexpected ',' at offset {idx}")
+                    self._close_value(idx)
+        self._pos = pos
+
+    def _close_string(self, end: int) -> None:
+        if len(self._stack) != 1:
+            return
+        if self._expect == "key":
+            self._key = json.loads(self._buffer[self._string_start:end])
+            self._expect = "colon"
+        elif self._expect == "value":
+            self._expect = "end"
+
+    def _close_value(self, end: int) -> None:
+        key, self._key = self._key, None
+        raw = self._buffer[self._value_start:end].strip()
+        self._expect = "key"
+        if key is None:
+            return
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"Invalid value for '{key}': {exc}") from exc
+        self.fields.append(key)
+        if self._validate_field is not None:
+            self._validate_field(key, value)
+
+    def _finish_root(self, end: int) -> None:
+        try:
+            self.result = json.loads(self._buffer[:end + 1])
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"Invalid JSON object: {exc}") from exc
+
+
 class JSONExtractor:
     @staticmethod
     def extract(text: str) -> Dict[str, Any]:
@@ -118,22 +473,10 @@ class JSONExtractor:
         except json.JSONDecodeError:
             pass
 
-        # Bracket counting fallback (robust to extra text)
-        start = text.find("{")
-        if start == -1:
-            raise ValueError("No JSON found in AI response")
-        depth = 0
-        for i in range(start, len(text)):
-            if text[i] == "{":
-                depth += 1
-            elif text[i] == "}":
-                depth -= 1
-                if depth == 0:
-                    try:
-                        return json.loads(text[start:i + 1])
-                    except Exception:
-                        break
-        raise ValueError("Unbalanced JSON")
+        # String-aware scan for the first complete object (robust to extra text)
+        extractor = StreamingJSONExtractor()
+        extractor.feed(text)
+        return extractor.finish()
 
 
 # =========================================================
@@ -147,21 +490,59 @@ class ProblemValidator:
         "hints", "tests", "bug_hint"
     }
 
+    @staticmethod
+    def validate_field(name: str, value: Any) -> None:
+        if name == "starter_code":
+            code = str(value).strip()
+            if not code or "pass" in code:
+                raise ValueError("starter_code is a stub")
+        elif name == "tests":
+            if not isinstance(value, list) or not value:
+                raise ValueError("Invalid tests")
+        elif name == "hints":
+            if not isinstance(value, list):
+                raise ValueError("Invalid hints: must be a list of strings")
+
     @staticmethod
     def validate(problem: Dict[str, Any]) -> None:
         missing = ProblemValidator.REQUIRED_FIELDS - problem.keys()
         if missing:
             raise ValueError(f"Missing fields: {missing}")
 
-        code = str(problem["starter_code"]).strip()
-        if not code or "pass" in code:
-            raise ValueError("starter_code is a stub")
+        for name in ("starter_code", "tests", "hints"):
+            ProblemValidator.validate_field(name, problem[name])
+
 
-        if not isinstance(problem["tests"], list) or not problem["tests"]:
-            raise ValueError("Invalid tests")
+def _is_valid_problem(raw: str) -> bool:
+    try:
+        ProblemValidator.validate(JSONExtractor.extract(raw))
+    except Exception:
+        return False
+    return True
 
-        if not isinstance(problem["hints"], list):
-            raise ValueError("Invalid hints: must be a list of strings")
+
+def _valid_batch_entries(raw: str) -> List[Dict[str, Any]]:
+    try:
+        data = JSONExtractor.extract(raw)
+    except ValueError as e:
+        logger.error(f"AI batch parse error: {e}\nRaw: {raw}")
+        return []
+    entries = data.get("problems") if isinstance(data, dict) else data
+    if not isinstance(entries, list):
+        logger.error("AI batch response has no problem list")
+        return []
+
+    valid = []
+    for idx, entry in enumerate(entries):
+        try:
+            if not isinstance(entry, dict):
+                raise ValueError("entry is not an object")
+            ProblemValidator.validate(entry)
+        except ValueError as e:
+            logger.warning(f"Dropping batch entry {idx}: {e}")
+            continue
+        valid.append(entry)
+    return valid
 
 
 # =========================================================
@@ -170,9 +551,77 @@ class ProblemValidator:
 
 class AIService:
     def __init__(self):
-        self.client = GroqClient()
+        self.client = build_llm_provider()
+        self.cache = get_llm_cache()
+        self.cache_policy = CachePolicy.from_settings()
+
+    async def _complete(
+        self,
+        call_type: str,
+        messages: List[Dict[str, str]],
+        *,
+        max_tokens: int,
+        temperature: float,
+        timeout: Optional[float] = None,
+        cache_if: Optional[Callable[[str], bool]] = None,
+        extractor: Optional[StreamingJSONExtractor] = None,
+    ) -> str:
+        # Only call types opted in via LLM_CACHE_CALL_TYPES are looked up / stored.
+        key = None
+        if self.cache is not None and self.cache_policy.allows(call_type):
+            key = LLMResponseCache.make_key(self.client.model, messages, temperature, max_tokens)
+            # SQLite I/O stays off the event loop.
+            cached = await event_executor.run_blocking(self.cache.get, key)
+            if cached is not None:
+                logger.info("LLM cache hit", extra={"call_type": call_type})
+                return cached
+
+        if extractor is not None:
+            raw = await self._stream_into(
+                extractor, messages, max_tokens=max_tokens, temperature=temperature, timeout=timeout, call_type=call_type
+            )
+        else:
+            raw = await self.client.chat(
+                messages, max_tokens=max_tokens, temperature=temperature, timeout=timeout, call_type=call_type
+            )
+        if key is not None and (cache_if is None or cache_if(raw)):
+            await event_executor.run_blocking(self.cache.put, key, call_type, raw)
+        return raw
 
-    def generate_problem_spec(
+    async def _stream_into(
+        self,
+        extractor: StreamingJSONExtractor,
+        messages: List[Dict[str, str]],
+        *,
+        max_tokens: int,
+        temperature: float,
+        timeout: Optional[float],
+        call_type: str,
+    ) -> str:
+        parts: List[str] = []
+        stream = self.client.stream_chat(
+            messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            retries=settings.LLM_MAX_RETRIES,
+            timeout=timeout,
+            call_type=call_type,
+        )
+        try:
+            async for delta in stream:
+                parts.append(delta)
+                if extractor.feed(delta) is not None:
+                    # Whatever follows the closing brace would be discarded anyway.
+                    break
+        except ValueError:
+            logger.warning("Aborting LLM stream", extra={"call_type": call_type, "chars": sum(map(len, parts))})
+            raise
+        finally:
+            # Closing the generator closes the HTTP stream, so the provider stops generating.
+            await stream.aclose()
+        return "".join(parts)
+
+    async def generate_problem_spec(
         self,
         *,
         topic: str,
@@ -181,7 +630,7 @@ class AIService:
         session_id: Optional[str] = None,
         seed: Optional[int] = None,
         temperature: float = 0.7,
-    ) -> Dict[str, Any]:
+    ) -> Optional[Dict[str, Any]]:
 
         prompt = PromptBuilder.build_problem_prompt(
             topic=topic,
@@ -191,25 +640,90 @@ class AIService:
             seed=seed,
         )
 
-        max_tokens = 1500  # Increased for more complete responses
-        retries = 2
-        for attempt in range(retries + 1):
-            raw = self.client.chat(
+        # Transport retries live in GroqClient and content retries in ProblemGenerator;
+        # retrying here as well multiplied the calls made per assignment.
+        extractor = StreamingJSONExtractor(ProblemValidator.validate_field) if settings.PROBLEM_STREAMING else None
+        try:
+            raw = await self._complete(
+                "problem",
                 [{"role": "user", "content": prompt}],
-                max_tokens=max_tokens,
+                max_tokens=1500,
                 temperature=temperature,
+                cache_if=_is_valid_problem,
+                extractor=extractor,
             )
-            logger.info(f"Raw AI response received: {raw}")
-            try:
-                data = JSONExtractor.extract(raw)
-                ProblemValidator.validate(data)
-                return data
-            except ValueError as e:
-                logger.error(f"AI response parse error (attempt {attempt+1}): {e}\nRaw: {raw}")
-                if attempt >= retries:
-                    # Optionally, return a user-friendly error or None
-                    logger.critical("AI generation failed after retries due to incomplete or malformed JSON.")
-                    return None
+        except ValueError as e:
+            logger.error(f"AI response rejected mid-stream: {e}")
+            return None
+        logger.info(f"Raw AI response received: {raw}")
+        try:
+            data = extractor.result if extractor is not None and extractor.done else JSONExtractor.extract(raw)
+            ProblemValidator.validate(data)
+            return data
+        except ValueError as e:
+            logger.error(f"AI response parse error: {e}\nRaw: {raw}")
+            return None
+
+    async def generate_problem_batch(
+        self,
+        *,
+        topic: str,
+        difficulty: str,
+        count: int,
+        seed: Optional[int] = None,
+        temperature: float = 0.8,
+    ) -> List[Dict[str, Any]]:
+        """Ask for ``count`` problems in one call; returns only the entries that validate."""
+        prompt = PromptBuilder.build_batch_prompt(topic=topic, difficulty=difficulty, count=count, seed=seed)
+        raw = await self._complete(
+            "problem_batch",
+            [{"role": "user", "content": prompt}],
+            max_tokens=1500 * count,
+            temperature=temperature,
+            cache_if=lambda text: bool(_valid_batch_entries(text)),
+        )
+        problems = _valid_batch_entries(raw)
+        logger.info("Problem batch received", extra={"requested": count, "valid": len(problems)})
+        return problems
+
+    async def generate_hint(self, context: Dict[str, Any]) -> str:
+        prompt = PromptBuilder.build_hint_prompt(context)
+        return await self._complete(
+            "hint",
+            [{"role": "user", "content": prompt}],
+            max_tokens=200,
+            temperature=0.4,
+            timeout=settings.GROQ_HINT_TIMEOUT,
+        )
+
+    async def stream_hint(self, context: Dict[str, Any]) -> AsyncIterator[str]:
+        prompt = PromptBuilder.build_hint_prompt(context)
+        async for delta in self.client.stream_chat(
+            [{"role": "user", "content": prompt}],
+            max_tokens=200,
+            temperature=0.4,
+            timeout=settings.GROQ_HINT_TIMEOUT,
+            call_type="hint",
+        ):
+            yield delta
+
+    async def analyze_behavior(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        prompt = PromptBuilder.build_analysis_prompt(context)
+        raw = await self._complete(
+            "analysis",
+            [{"role": "user", "content": prompt}],
+            max_tokens=200,
+            temperature=0.0,
+            timeout=settings.GROQ_HINT_TIMEOUT,
+        )
+        try:
+            data = JSONExtractor.extract(raw)
+        except ValueError:
+            return {"analysis": raw}
+        return data if isinstance(data, dict) else {"analysis": raw}
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
 
 
 # =========================================================
@@ -225,3 +739,10 @@ def get_ai_service() -> AIService:
         _ai_service = AIService()
         logger.info("AIService singleton created")
     return _ai_service
+
+
+async def shutdown_ai_service() -> None:
+    global _ai_service
+    if _ai_service is not None:
+        await _ai_service.aclose()
+        _ai_service = None
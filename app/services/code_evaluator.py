@@ -1,90 +1,418 @@
+import asyncio
 import contextlib
+import functools
 import io
+import os
+import signal
+import sys
+import threading
 import time
-from typing import Any, Dict, List
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
+from ..config import settings
+from ..core.executor import event_executor
+from .eval_cache import EvaluationCache, cacheable, fingerprint, get_eval_cache
+from .sandbox import SandboxPool, get_sandbox_pool
 from .session_state import ProblemSpec
 
 
-class CodeEvaluator:
-    def __init__(self) -> None:
-        pass
+class _Timeout(BaseException):
+    """Raised when a deadline expires; a BaseException so ``except Exception`` in submitted code cannot swallow it."""
 
-    def evaluate(self, code: str, problem: ProblemSpec) -> Dict[str, Any]:
-        if not problem:
-            return {"status": "error", "message": "No active problem", "passed": 0, "failed": 0, "details": []}
 
-        namespace: Dict[str, Any] = {}
-        stdout_capture = io.StringIO()
-        start = time.perf_counter()
-        try:
-            with contextlib.redirect_stdout(stdout_capture):
-                exec(code, namespace)
-        except Exception as exc:
-            duration = time.perf_counter() - start
-            return {
-                "status": "error",
-                "message": f"Execution failed: {exc}",
-                "stdout": stdout_capture.getvalue(),
-                "passed": 0,
-                "failed": len(problem.tests),
-                "total_tests": len(problem.tests),
-                "execution_time": duration,
-                "details": [],
-            }
+@contextlib.contextmanager
+def _deadline(seconds: Optional[float]) -> Iterator[None]:
+    if not seconds:
+        yield
+        return
+    if threading.current_thread() is not threading.main_thread() or not hasattr(signal, "setitimer"):
+        # Signals only reach the main thread, so the in-process fallback (run on
+        # executor threads) checks the clock from a trace hook instead.
+        with _traced_deadline(seconds):
+            yield
+        return
 
-        candidate = namespace.get(problem.entrypoint)
-        if not callable(candidate):
-            duration = time.perf_counter() - start
-            return {
-                "status": "error",
-                "message": f"Function '{problem.entrypoint}' not defined",
-                "stdout": stdout_capture.getvalue(),
-                "passed": 0,
-                "failed": len(problem.tests),
-                "total_tests": len(problem.tests),
-                "execution_time": duration,
-                "details": [],
-            }
+    def expire(signum, frame):
+        raise _Timeout()
 
-        details: List[Dict[str, Any]] = []
-        passed = 0
-        for test in problem.tests:
-            args = test.get("args", [])
-            kwargs = test.get("kwargs", {})
-            expected = test.get("expected")
-            try:
-                output = candidate(*args, **kwargs)
-                ok = output == expected
-                if ok:
-                    passed += 1
-                details.append({
-                    "args": args,
-                    "kwargs": kwargs,
-                    "expected": expected,
-                    "output": output,
-                    "passed": ok,
-                })
-            except Exception as exc:
-                details.append({
-                    "args": args,
-                    "kwargs": kwargs,
-                    "expected": expected,
-                    "error": str(exc),
-                    "passed": False,
-                })
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+@contextlib.contextmanager
+def _traced_deadline(seconds: float) -> Iterator[None]:
+    """Raise ``_Timeout`` at the first traced Python line after ``seconds``.
+
+    Slower than SIGALRM and blind to long-running C calls, but it bounds the
+    usual runaway submission (a Python loop) on any thread.
+    """
+    expires = time.perf_counter() + seconds
+
+    def check(frame, event, arg):
+        if time.perf_counter() >= expires:
+            raise _Timeout()
+        return check
+
+    previous = sys.gettrace()
+    sys.settrace(check)
+    try:
+        yield
+    finally:
+        sys.settrace(previous)
+
+
+def execute_tests(
+    code: str,
+    entrypoint: str,
+    tests: List[Dict[str, Any]],
+    *,
+    order: Optional[List[int]] = None,
+    test_timeout: Optional[float] = None,
+    submission_timeout: Optional[float] = None,
+    fail_fast: bool = False,
+    on_test: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """Run ``code`` and call ``entrypoint`` once per test case, in the current process.
+
+    Tests run in ``order`` (default: as authored) with at most ``test_timeout``
+    seconds each and ``submission_timeout`` overall; tests left over when the
+    budget runs out, or after the first failure with ``fail_fast``, are
+    reported as skipped. ``details`` always follows the authored order;
+    ``on_test`` is called with each executed test's detail as soon as it is known.
+    """
+    namespace: Dict[str, Any] = {}
+    stdout_capture = io.StringIO()
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(stdout_capture), _deadline(submission_timeout):
+            exec(code, namespace)
+    except _Timeout:
+        return {
+            "status": "error",
+            "message": "Execution timed out while loading the code",
+            "stdout": stdout_capture.getvalue(),
+            "passed": 0,
+            "failed": len(tests),
+            "total_tests": len(tests),
+            "execution_time": time.perf_counter() - start,
+            "details": [],
+        }
+    except Exception as exc:
+        duration = time.perf_counter() - start
+        return {
+            "status": "error",
+            "message": f"Execution failed: {exc}",
+            "stdout": stdout_capture.getvalue(),
+            "passed": 0,
+            "failed": len(tests),
+            "total_tests": len(tests),
+            "execution_time": duration,
+            "details": [],
+        }
 
+    candidate = namespace.get(entrypoint)
+    if not callable(candidate):
         duration = time.perf_counter() - start
-        total = len(problem.tests)
-        failed = total - passed
-        status = "passed" if failed == 0 else "partial" if passed > 0 else "failed"
         return {
-            "status": status,
-            "message": "All tests passed" if status == "passed" else "Tests failing",
+            "status": "error",
+            "message": f"Function '{entrypoint}' not defined",
             "stdout": stdout_capture.getvalue(),
-            "passed": passed,
-            "failed": failed,
-            "total_tests": total,
+            "passed": 0,
+            "failed": len(tests),
+            "total_tests": len(tests),
             "execution_time": duration,
-            "details": details,
+            "details": [],
         }
+
+    total = len(tests)
+    if order is None or sorted(order) != list(range(total)):
+        order = list(range(total))
+    submission_deadline = start + submission_timeout if submission_timeout else None
+    details: List[Optional[Dict[str, Any]]] = [None] * total
+    passed = 0
+    stopped: Optional[str] = None
+    for idx in order:
+        test = tests[idx]
+        args = test.get("args", [])
+        kwargs = test.get("kwargs", {})
+        expected = test.get("expected")
+        budget = test_timeout
+        if stopped is None and submission_deadline is not None:
+            remaining = submission_deadline - time.perf_counter()
+            if remaining <= 0:
+                stopped = "submission_timeout"
+            else:
+                budget = min(budget, remaining) if budget else remaining
+        if stopped is not None:
+            details[idx] = {"index": idx, "args": args, "kwargs": kwargs, "expected": expected, "skipped": True, "passed": False}
+            continue
+
+        ok = False
+        try:
+            # Prints from the candidate belong to the submission's output, not the worker's stdout.
+            with contextlib.redirect_stdout(stdout_capture), _deadline(budget):
+                output = candidate(*args, **kwargs)
+            ok = output == expected
+            if ok:
+                passed += 1
+            details[idx] = {
+                "index": idx,
+                "args": args,
+                "kwargs": kwargs,
+                "expected": expected,
+                "output": output,
+                "passed": ok,
+            }
+        except _Timeout:
+            details[idx] = {
+                "index": idx,
+                "args": args,
+                "kwargs": kwargs,
+                "expected": expected,
+                "error": f"Timed out after {budget:.2g}s",
+                "timed_out": True,
+                "passed": False,
+            }
+        except Exception as exc:
+            details[idx] = {
+                "index": idx,
+                "args": args,
+                "kwargs": kwargs,
+                "expected": expected,
+                "error": str(exc),
+                "passed": False,
+            }
+        if on_test is not None:
+            on_test(details[idx])
+        if not ok and fail_fast:
+            stopped = "fail_fast"
+
+    duration = time.perf_counter() - start
+    # Skipped tests are neither passed nor failed; they still keep a run from counting as passed.
+    skipped = sum(1 for detail in details if detail.get("skipped"))
+    failed = sum(1 for detail in details if not detail.get("skipped") and not detail.get("passed"))
+    status = "passed" if passed == total else "partial" if passed > 0 else "failed"
+    if status == "passed":
+        message = "All tests passed"
+    elif stopped == "fail_fast":
+        message = "Stopped at the first failing test"
+    elif stopped == "submission_timeout":
+        message = "Submission time limit reached"
+    else:
+        message = "Tests failing"
+    return {
+        "status": status,
+        "message": message,
+        "stdout": stdout_capture.getvalue(),
+        "passed": passed,
+        "failed": failed,
+        "skipped": skipped,
+        "total_tests": total,
+        "execution_time": duration,
+        "order": order,
+        "details": details,
+    }
+
+
+# =========================================================
+# TEST ORDERING
+# =========================================================
+
+class TestDiscriminationStats:
+    """Per-problem pass/fail history used to run the most discriminating tests first.
+
+    A test's score is its smoothed failure rate across past submissions, so
+    the checks that usually catch broken code run (and, with fail_fast,
+    reject it) before the ones nearly everybody passes.
+    """
+
+    def __init__(self, max_problems: int = 5000):
+        self._max_problems = max_problems
+        self._stats: "OrderedDict[str, List[List[int]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def order(self, problem_id: str, test_count: int) -> List[int]:
+        with self._lock:
+            stats = self._stats.get(problem_id)
+            if stats is None or len(stats) != test_count:
+                return list(range(test_count))
+            self._stats.move_to_end(problem_id)
+            scores = [(failures + 1) / (runs + 2) for runs, failures in stats]
+        # sorted() is stable, so ties keep the author's order.
+        return sorted(range(test_count), key=lambda idx: -scores[idx])
+
+    def record(self, problem_id: str, details: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            stats = self._stats.get(problem_id)
+            if stats is None or len(stats) != len(details):
+                stats = [[0, 0] for _ in details]
+                self._stats[problem_id] = stats
+            self._stats.move_to_end(problem_id)
+            for idx, detail in enumerate(details):
+                if detail.get("skipped"):
+                    continue
+                stats[idx][0] += 1
+                if not detail.get("passed"):
+                    stats[idx][1] += 1
+            while len(self._stats) > self._max_problems:
+                self._stats.popitem(last=False)
+
+
+_test_stats = TestDiscriminationStats()
+
+
+def _replay(result: Dict[str, Any], on_test: Callable[[Dict[str, Any]], None]) -> None:
+    details = result.get("details", [])
+    for idx in result.get("order") or range(len(details)):
+        if not details[idx].get("skipped"):
+            on_test(details[idx])
+
+
+def run_suite(
+    pool: Optional[SandboxPool],
+    code: str,
+    entrypoint: str,
+    tests: List[Dict[str, Any]],
+    options: Dict[str, Any],
+    on_test: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """Execute one submission in ``pool``, or in-process when there is none."""
+    if pool is not None:
+        return pool.run(code, entrypoint, tests, options, on_test=on_test)
+    return execute_tests(code, entrypoint, tests, on_test=on_test, **options)
+
+
+_in_process_runner: Optional[ThreadPoolExecutor] = None
+
+
+def _in_process_executor() -> ThreadPoolExecutor:
+    global _in_process_runner
+    if _in_process_runner is None:
+        _in_process_runner = ThreadPoolExecutor(
+            max_workers=settings.SANDBOX_WORKERS or os.cpu_count() or 1, thread_name_prefix="skillproof-inprocess"
+        )
+    return _in_process_runner
+
+
+async def run_suite_async(
+    pool: Optional[SandboxPool],
+    code: str,
+    entrypoint: str,
+    tests: List[Dict[str, Any]],
+    options: Dict[str, Any],
+    on_test: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """``run_suite`` on threads reserved for candidate code, so it never holds ``event_executor``'s blocking pool."""
+    if pool is not None:
+        return await pool.run_async(code, entrypoint, tests, options, on_test)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _in_process_executor(), functools.partial(execute_tests, code, entrypoint, tests, on_test=on_test, **options)
+    )
+
+
+def _no_problem_result() -> Dict[str, Any]:
+    return {"status": "error", "message": "No active problem", "passed": 0, "failed": 0, "details": []}
+
+
+class CodeEvaluator:
+    def __init__(self, pool: Optional[SandboxPool] = None, cache: Optional[EvaluationCache] = None) -> None:
+        # Submissions run in the sandbox pool; in-process exec is only for SANDBOX_ENABLED=false.
+        self._pool = pool if pool is not None else get_sandbox_pool() if settings.SANDBOX_ENABLED else None
+        self._cache = cache if cache is not None else get_eval_cache()
+
+    def evaluate(
+        self,
+        code: str,
+        problem: ProblemSpec,
+        *,
+        fail_fast: bool = False,
+        on_test: Optional[Callable[[Dict[str, Any]], None]] = None,
+        session_key: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Blocking. ``on_test`` receives per-test details while the suite runs (replayed on cache hits)."""
+        if not problem:
+            return _no_problem_result()
+        code_hash, cached = self._lookup(code, problem, fail_fast, on_test)
+        if cached is not None:
+            return cached
+        result = self._run(code, problem, self._options(problem, fail_fast), on_test, session_key)
+        self._store(problem, code_hash, fail_fast, result)
+        return result
+
+    async def evaluate_async(
+        self,
+        code: str,
+        problem: ProblemSpec,
+        *,
+        fail_fast: bool = False,
+        on_test: Optional[Callable[[Dict[str, Any]], None]] = None,
+        session_key: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Like ``evaluate``; ``on_test`` may be called from the thread running the suite."""
+        if not problem:
+            return _no_problem_result()
+        code_hash, cached = await event_executor.run_blocking(self._lookup, code, problem, fail_fast, on_test)
+        if cached is not None:
+            return cached
+        result = await self._run_async(code, problem, self._options(problem, fail_fast), on_test, session_key)
+        self._store(problem, code_hash, fail_fast, result)
+        return result
+
+    def _lookup(
+        self,
+        code: str,
+        problem: ProblemSpec,
+        fail_fast: bool,
+        on_test: Optional[Callable[[Dict[str, Any]], None]],
+    ) -> Tuple[str, Optional[Dict[str, Any]]]:
+        code_hash = fingerprint(code) if self._cache is not None else ""
+        if self._cache is not None:
+            cached = self._cache.get(problem.id, code_hash, fail_fast)
+            if cached is not None:
+                cached["cached"] = True
+                if on_test is not None:
+                    _replay(cached, on_test)
+                return code_hash, cached
+        return code_hash, None
+
+    def _options(self, problem: ProblemSpec, fail_fast: bool) -> Dict[str, Any]:
+        return {
+            "order": _test_stats.order(problem.id, len(problem.tests)) if settings.EVAL_DISCRIMINATING_ORDER else None,
+            "test_timeout": settings.EVAL_TEST_TIMEOUT_SECONDS,
+            "submission_timeout": settings.EVAL_SUBMISSION_TIMEOUT_SECONDS,
+            "fail_fast": fail_fast,
+        }
+
+    def _store(self, problem: ProblemSpec, code_hash: str, fail_fast: bool, result: Dict[str, Any]) -> None:
+        if result.get("details"):
+            _test_stats.record(problem.id, result["details"])
+        if self._cache is not None and cacheable(result, fail_fast):
+            self._cache.put(problem.id, code_hash, fail_fast, result)
+
+    def _run(
+        self,
+        code: str,
+        problem: ProblemSpec,
+        options: Dict[str, Any],
+        on_test: Optional[Callable[[Dict[str, Any]], None]],
+        session_key: Optional[str],
+    ) -> Dict[str, Any]:
+        return run_suite(self._pool, code, problem.entrypoint, problem.tests, options, on_test)
+
+    async def _run_async(
+        self,
+        code: str,
+        problem: ProblemSpec,
+        options: Dict[str, Any],
+        on_test: Optional[Callable[[Dict[str, Any]], None]],
+        session_key: Optional[str],
+    ) -> Dict[str, Any]:
+        return await run_suite_async(self._pool, code, problem.entrypoint, problem.tests, options, on_test)
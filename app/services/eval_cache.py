@@ -0,0 +1,115 @@
+# app/services/eval_cache.py
+
+import copy
+import hashlib
+import io
+import logging
+import threading
+import tokenize
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from ..config import settings
+
+logger = logging.getLogger("skillproof.eval_cache")
+
+_LAYOUT_TOKENS = {tokenize.COMMENT, tokenize.NL, tokenize.ENCODING, tokenize.ENDMARKER}
+
+
+def fingerprint(code: str) -> str:
+    """Hash of the token stream, so whitespace- and comment-only edits map to the same key.
+
+    Block structure is kept as INDENT/DEDENT tokens, but not the indent width;
+    code that does not tokenize is hashed verbatim, minus surrounding whitespace.
+    """
+    digest = hashlib.sha256()
+    try:
+        for token in tokenize.generate_tokens(io.StringIO(code).readline):
+            if token.type in _LAYOUT_TOKENS:
+                continue
+            text = "" if token.type in (tokenize.INDENT, tokenize.NEWLINE) else token.string
+            digest.update(f"{token.type}:{text}\x00".encode("utf-8"))
+    except (tokenize.TokenError, IndentationError, SyntaxError):
+        digest = hashlib.sha256(b"raw\x00" + code.strip().encode("utf-8"))
+    return digest.hexdigest()
+
+
+def cacheable(result: Dict[str, Any], fail_fast: bool) -> bool:
+    """Only deterministic outcomes: no deadline hits, and nothing skipped except by fail_fast."""
+    if result.get("status") not in ("passed", "partial", "failed"):
+        return False
+    for detail in result.get("details", []):
+        if detail.get("timed_out") or (detail.get("skipped") and not fail_fast):
+            return False
+    return True
+
+
+class EvaluationCache:
+    """In-memory LRU of evaluation results shared by every session.
+
+    Keys are (problem id, code fingerprint, fail_fast). Results are copied on
+    the way in and out so callers can decorate them freely.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[Tuple[str, str, bool], Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.writes = 0
+
+    def get(self, problem_id: str, code_hash: str, fail_fast: bool) -> Optional[Dict[str, Any]]:
+        key = (problem_id, code_hash, fail_fast)
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return copy.deepcopy(result)
+
+    def put(self, problem_id: str, code_hash: str, fail_fast: bool, result: Dict[str, Any]) -> None:
+        stored = copy.deepcopy(result)
+        with self._lock:
+            self._entries[(problem_id, code_hash, fail_fast)] = stored
+            self._entries.move_to_end((problem_id, code_hash, fail_fast))
+            self.writes += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "writes": self.writes,
+        }
+
+
+# =========================================================
+# SINGLETON
+# =========================================================
+
+_eval_cache: Optional[EvaluationCache] = None
+
+
+def get_eval_cache() -> Optional[EvaluationCache]:
+    global _eval_cache
+    if not settings.EVAL_CACHE_ENABLED:
+        return None
+    if _eval_cache is None:
+        _eval_cache = EvaluationCache(settings.EVAL_CACHE_MAX_ENTRIES)
+        logger.info("Evaluation cache created", extra={"max_entries": settings.EVAL_CACHE_MAX_ENTRIES})
+    return _eval_cache
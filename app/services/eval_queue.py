@@ -0,0 +1,298 @@
+# app/services/eval_queue.py
+
+import asyncio
+import logging
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from ..config import settings
+from ..core.executor import event_executor
+from ..crud import crud_eval_job
+from ..db.session import SessionLocal
+from ..models.eval_job import EvalJob
+from .code_evaluator import CodeEvaluator
+from .eval_cache import EvaluationCache
+from .session_state import ProblemSpec
+
+logger = logging.getLogger("skillproof.eval_queue")
+
+
+def _queue_error_result(message: str, tests: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "status": "error",
+        "message": message,
+        "stdout": "",
+        "passed": 0,
+        "failed": len(tests),
+        "total_tests": len(tests),
+        "execution_time": 0.0,
+        "details": [],
+    }
+
+
+def _percentiles(samples: Deque[float]) -> Dict[str, float]:
+    values = sorted(tuple(samples))
+    if not values:
+        return {"avg": 0.0, "p95": 0.0, "max": 0.0}
+    return {
+        "avg": round(sum(values) / len(values) * 1000, 2),
+        "p95": round(values[min(len(values) - 1, int(len(values) * 0.95))] * 1000, 2),
+        "max": round(values[-1] * 1000, 2),
+    }
+
+
+# =========================================================
+# QUEUE
+# =========================================================
+
+class EvalQueue:
+    """Durable evaluation jobs in the ``eval_jobs`` table.
+
+    The web process enqueues a job and polls its row; standalone workers
+    (``python -m app.workers.eval_worker``) claim jobs with a lease, append
+    per-test progress for streaming sessions and write the final result.
+    A job whose worker dies is picked up again once its lease lapses.
+    """
+
+    def __init__(
+        self,
+        *,
+        poll_seconds: float,
+        result_timeout: float,
+        lease_seconds: float,
+        max_attempts: int,
+        retention_seconds: float,
+    ):
+        self.poll_seconds = poll_seconds
+        self.result_timeout = result_timeout
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max(1, max_attempts)
+        self.retention_seconds = retention_seconds
+        self._queue_waits: Deque[float] = deque(maxlen=500)
+        self._run_times: Deque[float] = deque(maxlen=500)
+        self._round_trips: Deque[float] = deque(maxlen=500)
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+
+    @classmethod
+    def from_settings(cls) -> "EvalQueue":
+        return cls(
+            poll_seconds=settings.EVAL_QUEUE_POLL_SECONDS,
+            result_timeout=settings.EVAL_QUEUE_RESULT_TIMEOUT_SECONDS,
+            lease_seconds=settings.EVAL_QUEUE_LEASE_SECONDS,
+            max_attempts=settings.EVAL_QUEUE_MAX_ATTEMPTS,
+            retention_seconds=settings.EVAL_QUEUE_RETENTION_SECONDS,
+        )
+
+    # ---- web side ----
+
+    def submit(self, session_key: str, problem: ProblemSpec, code: str, options: Dict[str, Any], *, stream: bool) -> int:
+        db = SessionLocal()
+        try:
+            job = crud_eval_job.enqueue(
+                db,
+                session_key=session_key,
+                problem_id=problem.id,
+                entrypoint=problem.entrypoint,
+                code=code,
+                tests=problem.tests,
+                options=options,
+                stream=stream,
+            )
+        finally:
+            db.close()
+        self.submitted += 1
+        return job.id
+
+    async def wait(
+        self,
+        job_id: int,
+        tests: List[Dict[str, Any]],
+        on_test: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> Dict[str, Any]:
+        """Poll the job row until a worker finishes it, forwarding new progress to ``on_test``.
+
+        Only the single-row read goes to a blocking thread; the wait between polls
+        happens on the event loop, so a slow job never pins a ``run_blocking`` worker.
+        """
+        started = time.monotonic()
+        seen = 0
+        while True:
+            snapshot = await event_executor.run_blocking(self._poll, job_id)
+            if snapshot is None:
+                return _queue_error_result("Evaluation job disappeared", tests)
+            status, progress, result = snapshot
+
+            if on_test is not None:
+                # A retried job restarts its progress; never replay a test twice.
+                for detail in progress[seen:]:
+                    on_test(detail)
+                seen = max(seen, len(progress))
+
+            if status == "done":
+                self.completed += 1
+                self._round_trips.append(time.monotonic() - started)
+                return result
+            if status == "failed":
+                self.failed += 1
+                self._round_trips.append(time.monotonic() - started)
+                return result or _queue_error_result("Evaluation failed on every worker attempt", tests)
+            if status == "cancelled" or time.monotonic() - started >= self.result_timeout:
+                return await event_executor.run_blocking(self._give_up, job_id, tests)
+            await asyncio.sleep(self.poll_seconds)
+
+    def _poll(self, job_id: int) -> Optional[Tuple[str, List[Dict[str, Any]], Optional[Dict[str, Any]]]]:
+        """Blocking: read one job row as ``(status, progress, result)``."""
+        db = SessionLocal()
+        try:
+            job = crud_eval_job.get(db, job_id)
+            if job is None:
+                return None
+            if job.status in ("done", "failed"):
+                self._record_timings(job)
+            return job.status, list(job.progress or []), job.result
+        finally:
+            db.close()
+
+    def _give_up(self, job_id: int, tests: List[Dict[str, Any]]) -> Dict[str, Any]:
+        self.timeouts += 1
+        db = SessionLocal()
+        try:
+            crud_eval_job.cancel_if_queued(db, job_id)
+        finally:
+            db.close()
+        logger.warning("Evaluation job timed out", extra={"job_id": job_id})
+        return _queue_error_result(f"No evaluation worker finished the job within {self.result_timeout:g}s", tests)
+
+    def _record_timings(self, job: EvalJob) -> None:
+        if job.started_at is not None:
+            self._queue_waits.append((job.started_at - job.enqueued_at).total_seconds())
+        if job.started_at is not None and job.finished_at is not None:
+            self._run_times.append((job.finished_at - job.started_at).total_seconds())
+
+    # ---- worker side ----
+
+    def claim(self, worker_id: str) -> Optional[EvalJob]:
+        db = SessionLocal()
+        try:
+            job = crud_eval_job.claim_next(
+                db, worker_id=worker_id, lease_seconds=self.lease_seconds, max_attempts=self.max_attempts
+            )
+            if job is not None:
+                db.expunge(job)
+            return job
+        finally:
+            db.close()
+
+    def report_progress(self, job: EvalJob, detail: Dict[str, Any]) -> None:
+        db = SessionLocal()
+        try:
+            crud_eval_job.append_progress(db, job.id, detail, worker_id=job.worker_id, attempt=job.attempts)
+        finally:
+            db.close()
+
+    def finish(self, job: EvalJob, result: Dict[str, Any], *, failed: bool = False) -> bool:
+        """Store the result unless the lease lapsed and the job was re-claimed in the meantime."""
+        db = SessionLocal()
+        try:
+            stored = crud_eval_job.finish(
+                db,
+                job.id,
+                worker_id=job.worker_id,
+                attempt=job.attempts,
+                status="failed" if failed else "done",
+                result=result,
+            )
+        finally:
+            db.close()
+        if not stored:
+            logger.warning(
+                "Evaluation job lease lost; result discarded",
+                extra={"job_id": job.id, "worker_id": job.worker_id, "attempt": job.attempts},
+            )
+        return stored
+
+    def purge(self) -> int:
+        db = SessionLocal()
+        try:
+            return crud_eval_job.purge_finished(db, datetime.utcnow() - timedelta(seconds=self.retention_seconds))
+        finally:
+            db.close()
+
+    def metrics(self) -> Dict[str, Any]:
+        db = SessionLocal()
+        try:
+            counts = crud_eval_job.count_by_status(db)
+            oldest = crud_eval_job.oldest_queued_at(db)
+        finally:
+            db.close()
+        return {
+            "queued": counts.get("queued", 0),
+            "running": counts.get("running", 0),
+            "oldest_queued_s": round((datetime.utcnow() - oldest).total_seconds(), 2) if oldest else 0.0,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "queue_wait_ms": _percentiles(self._queue_waits),
+            "run_ms": _percentiles(self._run_times),
+            "round_trip_ms": _percentiles(self._round_trips),
+        }
+
+
+# =========================================================
+# EVALUATOR
+# =========================================================
+
+class QueuedEvaluator(CodeEvaluator):
+    """CodeEvaluator that hands execution to the job queue instead of a local sandbox.
+
+    Caching and test ordering still happen here, in the process that owns the session.
+    """
+
+    def __init__(self, queue: Optional[EvalQueue] = None, cache: Optional[EvaluationCache] = None) -> None:
+        super().__init__(cache=cache)
+        self._pool = None
+        self._queue = queue or get_eval_queue()
+
+    async def _run_async(
+        self,
+        code: str,
+        problem: ProblemSpec,
+        options: Dict[str, Any],
+        on_test: Optional[Callable[[Dict[str, Any]], None]],
+        session_key: Optional[str],
+    ) -> Dict[str, Any]:
+        # Submitting is one row insert; waiting for the worker happens on the loop.
+        job_id = await event_executor.run_blocking(
+            self._queue.submit, session_key or "", problem, code, options, stream=on_test is not None
+        )
+        return await self._queue.wait(job_id, problem.tests, on_test)
+
+    def _run(
+        self,
+        code: str,
+        problem: ProblemSpec,
+        options: Dict[str, Any],
+        on_test: Optional[Callable[[Dict[str, Any]], None]],
+        session_key: Optional[str],
+    ) -> Dict[str, Any]:
+        raise RuntimeError("QueuedEvaluator waits for workers on the event loop; use evaluate_async")
+
+
+# =========================================================
+# SINGLETON
+# =========================================================
+
+_eval_queue: Optional[EvalQueue] = None
+
+
+def get_eval_queue() -> EvalQueue:
+    global _eval_queue
+    if _eval_queue is None:
+        _eval_queue = EvalQueue.from_settings()
+    return _eval_queue
@@ -0,0 +1,170 @@
+# app/services/llm_cache.py
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..config import settings
+
+logger = logging.getLogger("skillproof.llm_cache")
+
+
+# =========================================================
+# CACHE POLICY
+# =========================================================
+
+class CachePolicy:
+    """Opt-in list of call types whose completions may be served from cache."""
+
+    def __init__(self, call_types: Iterable[str]):
+        self.call_types = {name.strip() for name in call_types if name and name.strip()}
+
+    @classmethod
+    def from_settings(cls) -> "CachePolicy":
+        return cls(settings.LLM_CACHE_CALL_TYPES.split(","))
+
+    def allows(self, call_type: str) -> bool:
+        return call_type in self.call_types
+
+
+# =========================================================
+# STORE
+# =========================================================
+
+class LLMResponseCache:
+    """Content-addressed completion cache persisted in a local SQLite file.
+
+    Entries are keyed by a hash of (model, messages, temperature, max_tokens),
+    expire after ``ttl_seconds`` and are evicted least-recently-used once the
+    table grows past ``max_entries``.
+    """
+
+    def __init__(self, path: str, *, max_entries: int, ttl_seconds: int):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            " key TEXT PRIMARY KEY,"
+            " call_type TEXT NOT NULL,"
+            " response TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_cache_accessed_at ON llm_cache (accessed_at)")
+        # Running row count, so writes never need a full-table COUNT(*).
+        (self._entries,) = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self.writes = 0
+
+    @staticmethod
+    def make_key(model: str, messages: List[Dict[str, str]], temperature: float, max_tokens: int) -> str:
+        canonical = json.dumps(
+            {"model": model, "messages": messages, "temperature": temperature, "max_tokens": max_tokens},
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            response, created_at = row
+            if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                self._entries -= self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,)).rowcount
+                self.expired += 1
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return response
+
+    def put(self, key: str, call_type: str, response: str) -> None:
+        now = time.time()
+        with self._lock:
+            exists = self._conn.execute("SELECT 1 FROM llm_cache WHERE key = ?", (key,)).fetchone() is not None
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, call_type, response, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, call_type, response, now, now),
+            )
+            self.writes += 1
+            if not exists:
+                self._entries += 1
+            self._evict_locked()
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._entries -= self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,)).rowcount
+
+    def _evict_locked(self) -> None:
+        overflow = self._entries - self.max_entries
+        if overflow <= 0:
+            return
+        removed = self._conn.execute(
+            "DELETE FROM llm_cache WHERE key IN (SELECT key FROM llm_cache ORDER BY accessed_at ASC LIMIT ?)",
+            (overflow,),
+        ).rowcount
+        self._entries -= removed
+        self.evictions += removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._entries = 0
+
+    def stats(self) -> Dict[str, Any]:
+        entries = self._entries
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "writes": self.writes,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# =========================================================
+# SINGLETON
+# =========================================================
+
+_llm_cache: Optional[LLMResponseCache] = None
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    global _llm_cache
+    if not settings.LLM_CACHE_ENABLED:
+        return None
+    if _llm_cache is None:
+        _llm_cache = LLMResponseCache(
+            settings.LLM_CACHE_PATH,
+            max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+        )
+        logger.info("LLM response cache opened", extra={"path": settings.LLM_CACHE_PATH})
+    return _llm_cache
@@ -0,0 +1,259 @@
+# app/services/llm_providers.py
+
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import random
+import re
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from ..config import settings
+
+logger = logging.getLogger("skillproof.llm_providers")
+
+
+# =========================================================
+# PROVIDER INTERFACE
+# =========================================================
+
+class LLMProvider(ABC):
+    """Transport for chat completions; AIService only talks to this interface."""
+
+    name = "base"
+    model = ""
+
+    @abstractmethod
+    async def chat(
+        self,
+        messages: List[Dict[str, str]],
+        *,
+        max_tokens: int,
+        temperature: float,
+        retries: Optional[int] = None,
+        timeout: Optional[float] = None,
+        call_type: Optional[str] = None,
+    ) -> str:
+        """Return the full completion text."""
+
+    @abstractmethod
+    def stream_chat(
+        self,
+        messages: List[Dict[str, str]],
+        *,
+        max_tokens: int,
+        temperature: float,
+        retries: int = 0,
+        timeout: Optional[float] = None,
+        call_type: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """Yield completion text chunks as they arrive."""
+
+    async def aclose(self) -> None:
+        return None
+
+
+# =========================================================
+# LATENCY MODEL
+# =========================================================
+
+class LatencyModel:
+    """Samples simulated provider latency in seconds from a named distribution."""
+
+    DISTRIBUTIONS = {"fixed", "uniform", "normal", "lognormal"}
+
+    def __init__(self, distribution: str, *, mean_ms: float, jitter_ms: float, seed: int):
+        if distribution not in self.DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {distribution}")
+        self.distribution = distribution
+        self.mean_ms = max(0.0, mean_ms)
+        self.jitter_ms = max(0.0, jitter_ms)
+        self._rng = random.Random(seed)
+
+    def sample(self) -> float:
+        if self.distribution == "fixed" or self.mean_ms == 0:
+            value = self.mean_ms
+        elif self.distribution == "uniform":
+            value = self._rng.uniform(self.mean_ms - self.jitter_ms, self.mean_ms + self.jitter_ms)
+        elif self.distribution == "normal":
+            value = self._rng.gauss(self.mean_ms, self.jitter_ms)
+        else:
+            # Long right tail like real completion latency; jitter is the stddev of the result.
+            sigma = math.sqrt(math.log1p((self.jitter_ms / self.mean_ms) ** 2))
+            mu = math.log(self.mean_ms) - sigma ** 2 / 2
+            value = self._rng.lognormvariate(mu, sigma)
+        return max(0.0, value) / 1000.0
+
+
+# =========================================================
+# LOCAL PROVIDER
+# =========================================================
+
+_TOPIC = re.compile(r"^Topic: (.+)$", re.MULTILINE)
+_DIFFICULTY = re.compile(r"^Difficulty: (.+)$", re.MULTILINE)
+_HINT_LEVEL = re.compile(r"^Hint level: (\w+)", re.MULTILINE)
+_COUNT = re.compile(r"^Count: (\d+)$", re.MULTILINE)
+
+
+def _digest(messages: List[Dict[str, str]]) -> int:
+    canonical = json.dumps(messages, sort_keys=True, separators=(",", ":"))
+    return int(hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:12], 16)
+
+
+def _sum_of_multiples(k: int) -> Dict[str, Any]:
+    return {
+        "title": f"Sum of the first n multiples of {k}",
+        "description": f"solve(n) should return {k} + {2 * k} + ... + {k}*n, and 0 when n is 0.",
+        "starter_code": (
+            "def solve(n):\n"
+            "    if n == 0:\n"
+            "        return 1\n"
+            f"    return {k} * n + solve(n - 1)\n"
+        ),
+        "tests": [
+            {"args": [0], "kwargs": {}, "expected": 0},
+            {"args": [3], "kwargs": {}, "expected": 6 * k},
+            {"args": [5], "kwargs": {}, "expected": 15 * k},
+        ],
+        "bug_hint": "The base case returns the wrong value.",
+    }
+
+
+def _power(k: int) -> Dict[str, Any]:
+    return {
+        "title": f"Raise {k} to the power n",
+        "description": f"solve(n) should return {k} ** n for n >= 0 using recursion.",
+        "starter_code": (
+            "def solve(n):\n"
+            "    if n == 0:\n"
+            "        return 1\n"
+            f"    return {k} * solve(n - 2)\n"
+        ),
+        "tests": [
+            {"args": [0], "kwargs": {}, "expected": 1},
+            {"args": [1], "kwargs": {}, "expected": k},
+            {"args": [4], "kwargs": {}, "expected": k ** 4},
+        ],
+        "bug_hint": "The recursive call shrinks n by the wrong amount.",
+    }
+
+
+def _count_down(k: int) -> Dict[str, Any]:
+    return {
+        "title": f"Count steps of size {k}",
+        "description": f"solve(n) should return how many times {k} can be subtracted from n before it drops below {k}.",
+        "starter_code": (
+            "def solve(n):\n"
+            f"    if n <= {k}:\n"
+            "        return 0\n"
+            f"    return 1 + solve(n - {k})\n"
+        ),
+        "tests": [
+            {"args": [k - 1], "kwargs": {}, "expected": 0},
+            {"args": [k], "kwargs": {}, "expected": 1},
+            {"args": [3 * k + 1], "kwargs": {}, "expected": 3},
+        ],
+        "bug_hint": "The stopping condition is off by one.",
+    }
+
+
+_PROBLEM_TEMPLATES: List[Callable[[int], Dict[str, Any]]] = [_sum_of_multiples, _power, _count_down]
+
+_HINTS = {
+    "conceptual": "Think about what the smallest input should return and whether the code agrees.",
+    "directional": "Look closely at the base case and at how the argument shrinks in the recursive call.",
+    "code": "Trace solve with the smallest failing test by hand and fix the line whose value differs.",
+}
+
+
+class LocalLLMProvider(LLMProvider):
+    """Deterministic offline backend for load tests and benchmarks.
+
+    Responses are a pure function of the prompt, so repeated runs are
+    reproducible; only the simulated latency is random (seeded).
+    """
+
+    name = "local"
+    model = "local-deterministic"
+
+    def __init__(self, latency: LatencyModel, *, token_delay_ms: float):
+        self.latency = latency
+        self.token_delay = max(0.0, token_delay_ms) / 1000.0
+        self.calls = 0
+
+    @classmethod
+    def from_settings(cls) -> "LocalLLMProvider":
+        return cls(
+            LatencyModel(
+                settings.LOCAL_LLM_LATENCY_DISTRIBUTION,
+                mean_ms=settings.LOCAL_LLM_LATENCY_MS,
+                jitter_ms=settings.LOCAL_LLM_LATENCY_JITTER_MS,
+                seed=settings.LOCAL_LLM_SEED,
+            ),
+            token_delay_ms=settings.LOCAL_LLM_TOKEN_DELAY_MS,
+        )
+
+    async def chat(
+        self,
+        messages: List[Dict[str, str]],
+        *,
+        max_tokens: int,
+        temperature: float,
+        retries: Optional[int] = None,
+        timeout: Optional[float] = None,
+        call_type: Optional[str] = None,
+    ) -> str:
+        self.calls += 1
+        await asyncio.sleep(self.latency.sample())
+        return self._respond(messages, call_type)
+
+    async def stream_chat(
+        self,
+        messages: List[Dict[str, str]],
+        *,
+        max_tokens: int,
+        temperature: float,
+        retries: int = 0,
+        timeout: Optional[float] = None,
+        call_type: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        self.calls += 1
+        await asyncio.sleep(self.latency.sample())
+        words = self._respond(messages, call_type).split(" ")
+        for idx, word in enumerate(words):
+            if idx:
+                await asyncio.sleep(self.token_delay)
+            yield word if idx == 0 else f" {word}"
+
+    def _respond(self, messages: List[Dict[str, str]], call_type: Optional[str]) -> str:
+        prompt = messages[-1]["content"] if messages else ""
+        if call_type == "problem":
+            return json.dumps(self._problem(prompt, _digest(messages)))
+        if call_type == "problem_batch":
+            count = _COUNT.search(prompt)
+            digest = _digest(messages)
+            problems = [self._problem(prompt, digest + idx * 7919) for idx in range(int(count.group(1)) if count else 1)]
+            return json.dumps({"problems": problems})
+        if call_type == "analysis":
+            return json.dumps({"analysis": "The code follows the right recursive shape but mishandles the smallest input."})
+        level = _HINT_LEVEL.search(prompt)
+        return _HINTS.get(level.group(1) if level else "", _HINTS["conceptual"])
+
+    @staticmethod
+    def _problem(prompt: str, digest: int) -> Dict[str, Any]:
+        topic = _TOPIC.search(prompt)
+        difficulty = _DIFFICULTY.search(prompt)
+        topic = topic.group(1).strip() if topic else "recursion"
+        difficulty = difficulty.group(1).strip() if difficulty else "easy"
+        template = _PROBLEM_TEMPLATES[digest % len(_PROBLEM_TEMPLATES)]
+        body = template(2 + (digest >> 4) % 9)
+        return {
+            "id": f"local-{topic.lower()}-{difficulty.lower()}-{digest % 16 ** 8:08x}",
+            "topic": topic,
+            "difficulty": difficulty,
+            "entrypoint": "solve",
+            "hints": [_HINTS["conceptual"], _HINTS["directional"], _HINTS["code"]],
+            **body,
+        }
@@ -0,0 +1,71 @@
+# app/services/problem_admission.py
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from ..config import settings
+from .code_evaluator import run_suite_async
+from .sandbox import SandboxPool, get_sandbox_pool
+from .session_state import ProblemSpec
+
+logger = logging.getLogger("skillproof.problem_admission")
+
+_BASELINE_KEYS = ("index", "passed", "output", "error", "timed_out", "skipped")
+
+
+class ProblemAdmission:
+    """Runs a generated problem's starter code against its own tests before it is served.
+
+    The prompt asks for buggy starter code, so a problem is only admitted when
+    the harness runs cleanly and at least one test fails. The per-test
+    outcome is kept on the problem as its baseline.
+    """
+
+    def __init__(self, pool: Optional[SandboxPool] = None):
+        self._pool = pool if pool is not None else get_sandbox_pool() if settings.SANDBOX_ENABLED else None
+        self.checked = 0
+        self.admitted = 0
+        self.rejected_passing = 0
+        self.rejected_crash = 0
+
+    async def admit(self, problem: ProblemSpec) -> bool:
+        self.checked += 1
+        options = {
+            "test_timeout": settings.EVAL_TEST_TIMEOUT_SECONDS,
+            "submission_timeout": settings.EVAL_SUBMISSION_TIMEOUT_SECONDS,
+        }
+        try:
+            result = await run_suite_async(self._pool, problem.starter_code, problem.entrypoint, problem.tests, options)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Problem admission run failed", extra={"problem_id": problem.id})
+            self.rejected_crash += 1
+            return False
+
+        status = result.get("status")
+        if status == "error":
+            self.rejected_crash += 1
+            logger.warning(
+                "Problem rejected: starter code crashes the harness",
+                extra={"problem_id": problem.id, "reason": result.get("message")},
+            )
+            return False
+        if status == "passed":
+            self.rejected_passing += 1
+            logger.warning("Problem rejected: starter code already passes", extra={"problem_id": problem.id})
+            return False
+
+        problem.baseline = self.baseline(result.get("details", []))
+        self.admitted += 1
+        return True
+
+    @staticmethod
+    def baseline(details: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [{key: detail[key] for key in _BASELINE_KEYS if key in detail} for detail in details]
+
+    def metrics(self) -> Dict[str, int]:
+        return {
+            "checked": self.checked,
+            "admitted": self.admitted,
+            "rejected_passing": self.rejected_passing,
+            "rejected_crash": self.rejected_crash,
+        }
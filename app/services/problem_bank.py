@@ -0,0 +1,155 @@
+# app/services/problem_bank.py
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Set, Tuple
+
+from ..crud import crud_problem
+from ..db.session import SessionLocal
+from .session_state import ProblemSpec
+
+logger = logging.getLogger("skillproof.problem_bank")
+
+_HASHED_FIELDS = ("topic", "difficulty", "title", "description", "starter_code", "entrypoint", "tests", "hints")
+
+
+def content_hash(problem: ProblemSpec) -> str:
+    payload = {name: getattr(problem, name) for name in _HASHED_FIELDS}
+    payload["topic"] = str(payload["topic"]).lower()
+    payload["difficulty"] = str(payload["difficulty"]).lower()
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ProblemBank:
+    """Problems persisted in the ``problems`` table, fronted by a per-worker read cache.
+
+    The whole table is bulk-loaded at startup; afterwards a (topic, difficulty)
+    bucket is re-read from the database at most every ``refresh_seconds`` so
+    problems written by other workers become visible without a restart.
+    """
+
+    def __init__(self, *, refresh_seconds: float):
+        self._refresh_seconds = refresh_seconds
+        self._by_key: Dict[Tuple[str, str], Dict[str, ProblemSpec]] = {}
+        self._hashes: Dict[str, str] = {}
+        self._refreshed_at: Dict[Tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+        self.loaded = 0
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.writes = 0
+        self.duplicates = 0
+
+    @staticmethod
+    def _key(topic: str, difficulty: str) -> Tuple[str, str]:
+        return topic.lower(), difficulty.lower()
+
+    def _remember(self, problem: ProblemSpec, digest: str) -> None:
+        self._by_key.setdefault(self._key(problem.topic, problem.difficulty), {})[problem.id] = problem
+        self._hashes[digest] = problem.id
+
+    def load(self) -> int:
+        db = SessionLocal()
+        try:
+            rows = crud_problem.list_all(db)
+        finally:
+            db.close()
+        now = time.monotonic()
+        with self._lock:
+            self._by_key.clear()
+            self._hashes.clear()
+            for row in rows:
+                self._remember(ProblemSpec(**row.as_spec_payload()), row.content_hash)
+            self._refreshed_at = {key: now for key in self._by_key}
+            self.loaded = len(rows)
+        logger.info("Problem bank loaded", extra={"problems": len(rows)})
+        return len(rows)
+
+    def lookup(self, topic: str, difficulty: str, exclude: Set[str]) -> List[ProblemSpec]:
+        with self._lock:
+            bucket = self._by_key.get(self._key(topic, difficulty), {})
+            candidates = [problem for problem_id, problem in bucket.items() if problem_id not in exclude]
+        if candidates:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return candidates
+
+    def is_stale(self, topic: str, difficulty: str) -> bool:
+        refreshed = self._refreshed_at.get(self._key(topic, difficulty))
+        return refreshed is None or time.monotonic() - refreshed >= self._refresh_seconds
+
+    def refresh(self, topic: str, difficulty: str) -> None:
+        key = self._key(topic, difficulty)
+        db = SessionLocal()
+        try:
+            rows = crud_problem.list_by_topic_difficulty(db, *key)
+        finally:
+            db.close()
+        with self._lock:
+            for row in rows:
+                self._remember(ProblemSpec(**row.as_spec_payload()), row.content_hash)
+            self._refreshed_at[key] = time.monotonic()
+            self.refreshes += 1
+
+    def save(self, problem: ProblemSpec, *, source: str = "ai") -> ProblemSpec:
+        digest = content_hash(problem)
+        with self._lock:
+            existing_id = self._hashes.get(digest)
+            if existing_id is not None:
+                self.duplicates += 1
+                return self._by_key[self._key(problem.topic, problem.difficulty)].get(existing_id, problem)
+
+        db = SessionLocal()
+        try:
+            record = crud_problem.get_by_hash(db, digest)
+            if record is not None:
+                stored = ProblemSpec(**record.as_spec_payload())
+                self.duplicates += 1
+            else:
+                if crud_problem.get(db, problem.id) is not None:
+                    # Model-chosen ids are not unique across generations; keep ours stable.
+                    problem.id = f"{problem.topic.lower()}-{problem.difficulty.lower()}-{digest[:12]}"
+                crud_problem.create_problem(db, content_hash=digest, source=source, payload=self._payload(problem))
+                stored = problem
+                self.writes += 1
+        finally:
+            db.close()
+
+        with self._lock:
+            self._remember(stored, digest)
+        return stored
+
+    @staticmethod
+    def _payload(problem: ProblemSpec) -> Dict[str, Any]:
+        return {
+            "id": problem.id,
+            "topic": problem.topic.lower(),
+            "difficulty": problem.difficulty.lower(),
+            "title": problem.title,
+            "description": problem.description,
+            "starter_code": problem.starter_code,
+            "entrypoint": problem.entrypoint,
+            "tests": problem.tests,
+            "hints": problem.hints,
+            "bug_hint": problem.bug_hint,
+            "baseline": problem.baseline,
+        }
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            sizes = {f"{topic}/{difficulty}": len(bucket) for (topic, difficulty), bucket in self._by_key.items()}
+        return {
+            "loaded": self.loaded,
+            "cached": sizes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "writes": self.writes,
+            "duplicates": self.duplicates,
+        }
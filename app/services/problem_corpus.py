@@ -0,0 +1,135 @@
+# app/services/problem_corpus.py
+
+import json
+import logging
+import mmap
+import os
+import random
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .ai_service import ProblemValidator
+from .session_state import ProblemSpec
+
+logger = logging.getLogger("skillproof.problem_corpus")
+
+
+class ProblemCorpus:
+    """Vetted problems stored one JSON object per line in a read-only JSONL file.
+
+    The file is memory-mapped and only byte offsets are indexed by
+    (topic, difficulty) and by id, so thousands of problems cost a few
+    bytes each until one is actually served. Parsed problems are kept in a
+    small LRU so hot entries are not re-decoded on every lookup.
+    """
+
+    def __init__(self, path: str, *, parsed_cache_size: int = 256):
+        self.path = path
+        self._parsed_cache_size = parsed_cache_size
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+        self._by_key: Dict[Tuple[str, str], array] = {}
+        self._by_id: Dict[str, int] = {}
+        self._parsed: "OrderedDict[int, ProblemSpec]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._rng = random.Random()
+        self.skipped = 0
+        self.hits = 0
+        self.misses = 0
+
+    def load(self) -> int:
+        with self._lock:
+            if not self._loaded:
+                self._build_index()
+                self._loaded = True
+        return len(self._by_id)
+
+    def _build_index(self) -> None:
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            logger.warning("Problem corpus not found", extra={"path": self.path})
+            return
+        self._file = open(self.path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        offset = 0
+        size = len(self._map)
+        while offset < size:
+            end = self._map.find(b"\n", offset)
+            if end == -1:
+                end = size
+            line = self._map[offset:end].strip()
+            if line:
+                self._index_line(line, offset)
+            offset = end + 1
+        logger.info("Problem corpus indexed", extra={"problems": len(self._by_id), "skipped": self.skipped})
+
+    def _index_line(self, line: bytes, offset: int) -> None:
+        try:
+            record = json.loads(line)
+            ProblemValidator.validate(record)
+        except ValueError as exc:
+            self.skipped += 1
+            logger.warning("Skipping corpus entry", extra={"offset": offset, "error": str(exc)})
+            return
+        key = (str(record["topic"]).lower(), str(record["difficulty"]).lower())
+        self._by_key.setdefault(key, array("Q")).append(offset)
+        self._by_id[record["id"]] = offset
+
+    def _read(self, offset: int) -> ProblemSpec:
+        problem = self._parsed.get(offset)
+        if problem is not None:
+            self._parsed.move_to_end(offset)
+            return problem
+        end = self._map.find(b"\n", offset)
+        record = json.loads(self._map[offset:end if end != -1 else len(self._map)])
+        problem = ProblemSpec(**{name: record[name] for name in ProblemValidator.REQUIRED_FIELDS})
+        self._parsed[offset] = problem
+        if len(self._parsed) > self._parsed_cache_size:
+            self._parsed.popitem(last=False)
+        return problem
+
+    def get(self, problem_id: str) -> Optional[ProblemSpec]:
+        self.load()
+        offset = self._by_id.get(problem_id)
+        if offset is None:
+            return None
+        with self._lock:
+            return self._read(offset)
+
+    def pick(self, topic: str, difficulty: str, exclude: Set[str]) -> Optional[ProblemSpec]:
+        self.load()
+        offsets = self._by_key.get((topic.lower(), difficulty.lower()))
+        if offsets:
+            excluded = {self._by_id[problem_id] for problem_id in exclude if problem_id in self._by_id}
+            candidates: List[int] = [offset for offset in offsets if offset not in excluded]
+            if candidates:
+                self.hits += 1
+                with self._lock:
+                    return self._read(self._rng.choice(candidates))
+        self.misses += 1
+        return None
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "problems": len(self._by_id),
+            "buckets": {f"{topic}/{difficulty}": len(offsets) for (topic, difficulty), offsets in self._by_key.items()},
+            "parsed_cached": len(self._parsed),
+            "skipped": self.skipped,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self._by_key.clear()
+            self._by_id.clear()
+            self._parsed.clear()
+            self._loaded = False
@@ -1,11 +1,20 @@
 # app/services/problem_repository.py
 
+import asyncio
 import logging
 import random
-from typing import Dict, Iterable, List, Optional, Set, Tuple
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
 from uuid import uuid4
 
+from ..config import settings
+from ..core.errors import CircuitOpenError
+from ..core.executor import event_executor
 from .ai_service import get_ai_service
+from .problem_admission import ProblemAdmission
+from .problem_bank import ProblemBank
+from .problem_corpus import ProblemCorpus
+from .resilience import retry_budget, spend_retry
 from .session_state import ProblemSpec
 
 logger = logging.getLogger("skillproof.problem_repository")
@@ -40,14 +49,72 @@ class ProblemCache:
         self._store.clear()
 
 
+# =========================================================
+# SINGLE FLIGHT
+# =========================================================
+
+class SingleFlight:
+    """Runs at most one call per key; concurrent callers share its result."""
+
+    def __init__(self):
+        self._inflight: Dict[Tuple[str, str], asyncio.Task] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def run(self, key: Tuple[str, str], factory: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        task = self._inflight.get(key)
+        shared = task is not None
+        if task is None:
+            # Run as its own task so a cancelled caller does not abort everyone's generation.
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            self.started += 1
+            task.add_done_callback(lambda done, key=key: self._forget(key, done))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task), shared
+
+    def _forget(self, key: Tuple[str, str], task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    def metrics(self) -> Dict[str, int]:
+        return {
+            "in_flight": len(self._inflight),
+            "started": self.started,
+            "coalesced": self.coalesced,
+        }
+
+
 # =========================================================
 # GENERATOR
 # =========================================================
 
 class ProblemGenerator:
-    MAX_ATTEMPTS = 5
+    MAX_ATTEMPTS = 3
+
+    def __init__(self, admission: Optional[ProblemAdmission] = None):
+        self._admission = admission if admission is not None else ProblemAdmission() if settings.PROBLEM_ADMISSION_ENABLED else None
 
-    def generate(
+    async def _admit(self, problem: ProblemSpec) -> bool:
+        return self._admission is None or await self._admission.admit(problem)
+
+    def admission_metrics(self) -> Optional[Dict[str, int]]:
+        return self._admission.metrics() if self._admission is not None else None
+
+    async def generate(
+        self,
+        topic: str,
+        difficulty: str,
+        exclude_ids: Set[str],
+        user_id: Optional[str],
+        session_id: Optional[str],
+    ) -> Optional[ProblemSpec]:
+
+        with retry_budget(settings.LLM_RETRY_BUDGET):
+            return await self._generate(topic, difficulty, exclude_ids, user_id, session_id)
+
+    async def _generate(
         self,
         topic: str,
         difficulty: str,
@@ -57,8 +124,11 @@ class ProblemGenerator:
     ) -> Optional[ProblemSpec]:
 
         for attempt in range(1, self.MAX_ATTEMPTS + 1):
+            if attempt > 1 and not spend_retry():
+                logger.warning("Retry budget exhausted for problem generation")
+                return None
             try:
-                payload = get_ai_service().generate_problem_spec(
+                payload = await get_ai_service().generate_problem_spec(
                     topic=topic,
                     difficulty=difficulty,
                     user_id=user_id,
@@ -66,8 +136,14 @@ class ProblemGenerator:
                     seed=random.randint(0, 1_000_000),
                     temperature=0.8,
                 )
+            except CircuitOpenError:
+                logger.warning("LLM circuit open — skipping generation")
+                return None
             except Exception:
+                # The client has already retried transport failures behind the rate limiter.
                 logger.exception("AI generation failed")
+                return None
+            if not payload:
                 continue
 
             payload.setdefault("id", f"{topic}-{difficulty}-{uuid4().hex[:8]}")
@@ -75,13 +151,190 @@ class ProblemGenerator:
                 continue
 
             try:
-                return ProblemSpec(**payload)
+                problem = ProblemSpec(**payload)
             except Exception:
                 logger.exception("Invalid ProblemSpec from AI")
                 return None
+            # A problem whose starter code passes or crashes is as useless as a malformed one: try again.
+            if await self._admit(problem):
+                return problem
 
         return None
 
+    async def generate_batch(self, topic: str, difficulty: str, count: int, exclude_ids: Set[str]) -> List[ProblemSpec]:
+        """One LLM call for up to ``count`` problems; invalid or duplicate entries are dropped."""
+        try:
+            payloads = await get_ai_service().generate_problem_batch(
+                topic=topic,
+                difficulty=difficulty,
+                count=count,
+                seed=random.randint(0, 1_000_000),
+            )
+        except CircuitOpenError:
+            logger.warning("LLM circuit open — skipping batch generation")
+            return []
+        except Exception:
+            logger.exception("AI batch generation failed")
+            return []
+
+        problems: List[ProblemSpec] = []
+        seen = set(exclude_ids)
+        for payload in payloads:
+            payload.setdefault("id", f"{topic}-{difficulty}-{uuid4().hex[:8]}")
+            if payload["id"] in seen:
+                continue
+            try:
+                problem = ProblemSpec(**payload)
+            except Exception:
+                logger.exception("Invalid ProblemSpec in AI batch")
+                continue
+            seen.add(problem.id)
+            problems.append(problem)
+        if self._admission is None:
+            return problems
+        verdicts = await asyncio.gather(*(self._admit(problem) for problem in problems))
+        return [problem for problem, admitted in zip(problems, verdicts) if admitted]
+
+
+# =========================================================
+# WARM POOL
+# =========================================================
+
+class ProblemWarmPool:
+    """Keeps pre-generated problems ready per (topic, difficulty).
+
+    A background task tops each target up to the high watermark whenever it
+    drops below the low watermark, so assignment is usually a pop from memory.
+    """
+
+    def __init__(
+        self,
+        generator: ProblemGenerator,
+        *,
+        targets: Iterable[Tuple[str, str]],
+        low_watermark: int,
+        high_watermark: int,
+        refill_concurrency: int,
+        refill_interval: float,
+        batch_size: int = 1,
+    ):
+        self._generator = generator
+        self._pools: Dict[Tuple[str, str], Deque[ProblemSpec]] = {
+            (topic.lower(), difficulty.lower()): deque() for topic, difficulty in targets
+        }
+        self.low_watermark = low_watermark
+        self.high_watermark = max(high_watermark, low_watermark)
+        self._refill_concurrency = max(1, refill_concurrency)
+        self._refill_interval = refill_interval
+        self._batch_size = max(1, batch_size)
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+        self.generated = 0
+        self.failed_refills = 0
+
+    @classmethod
+    def from_settings(cls, generator: ProblemGenerator) -> "ProblemWarmPool":
+        topics = [item.strip() for item in settings.PROBLEM_POOL_TOPICS.split(",") if item.strip()]
+        difficulties = [item.strip() for item in settings.PROBLEM_POOL_DIFFICULTIES.split(",") if item.strip()]
+        return cls(
+            generator,
+            targets=[(topic, difficulty) for topic in topics for difficulty in difficulties],
+            low_watermark=settings.PROBLEM_POOL_LOW_WATERMARK,
+            high_watermark=settings.PROBLEM_POOL_HIGH_WATERMARK,
+            refill_concurrency=settings.PROBLEM_POOL_REFILL_CONCURRENCY,
+            refill_interval=settings.PROBLEM_POOL_REFILL_INTERVAL,
+            batch_size=settings.PROBLEM_BATCH_SIZE,
+        )
+
+    def pop(self, topic: str, difficulty: str, exclude: Set[str]) -> Optional[ProblemSpec]:
+        pool = self._pools.get((topic.lower(), difficulty.lower()))
+        if pool is None:
+            return None
+        for problem in pool:
+            if problem.id not in exclude:
+                pool.remove(problem)
+                self.hits += 1
+                if len(pool) < self.low_watermark and self._wakeup is not None:
+                    self._wakeup.set()
+                return problem
+        self.misses += 1
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return None
+
+    def start(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run(), name="skillproof-problem-pool")
+        logger.info("Problem warm pool started", extra={"targets": len(self._pools)})
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._refill_all()
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Problem pool refill round failed")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._refill_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def _refill_all(self) -> None:
+        semaphore = asyncio.Semaphore(self._refill_concurrency)
+
+        async def refill(key: Tuple[str, str]) -> None:
+            async with semaphore:
+                await self._refill(key)
+
+        low = [key for key, pool in self._pools.items() if len(pool) < self.low_watermark]
+        if low:
+            await asyncio.gather(*(refill(key) for key in low))
+
+    async def _refill(self, key: Tuple[str, str]) -> None:
+        pool = self._pools[key]
+        topic, difficulty = key
+        while len(pool) < self.high_watermark:
+            missing = self.high_watermark - len(pool)
+            if self._batch_size > 1 and missing > 1:
+                problems = await self._generator.generate_batch(
+                    topic, difficulty, min(missing, self._batch_size), {p.id for p in pool}
+                )
+            else:
+                problem = await self._generator.generate(topic, difficulty, {p.id for p in pool}, None, None)
+                problems = [problem] if problem is not None else []
+            if not problems:
+                # Leave the rest for the next round rather than hammering a failing provider.
+                self.failed_refills += 1
+                return
+            pool.extend(problems[:missing])
+            self.generated += len(problems[:missing])
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "low_watermark": self.low_watermark,
+            "high_watermark": self.high_watermark,
+            "ready": {f"{topic}/{difficulty}": len(pool) for (topic, difficulty), pool in self._pools.items()},
+            "hits": self.hits,
+            "misses": self.misses,
+            "generated": self.generated,
+            "failed_refills": self.failed_refills,
+        }
+
 
 # =========================================================
 # REPOSITORY
@@ -92,8 +345,37 @@ class ProblemRepository:
         self._cache = ProblemCache()
         self._generator = ProblemGenerator()
         self._rng = random.Random()
+        self._single_flight = SingleFlight()
+        self._excluded_fanout = 0
+        self._pool = ProblemWarmPool.from_settings(self._generator)
+        self._bank = ProblemBank(refresh_seconds=settings.PROBLEM_BANK_REFRESH_SECONDS) if settings.PROBLEM_BANK_ENABLED else None
+        self._corpus = ProblemCorpus(settings.PROBLEM_CORPUS_PATH) if settings.PROBLEM_CORPUS_ENABLED else None
 
-    def _fallback_problem(self, topic: str, difficulty: str) -> ProblemSpec:
+    async def start(self) -> None:
+        if self._bank is not None:
+            try:
+                await event_executor.run_blocking(self._bank.load)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Problem bank bulk load failed")
+        if self._corpus is not None:
+            try:
+                await event_executor.run_blocking(self._corpus.load)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Problem corpus indexing failed")
+        if settings.PROBLEM_POOL_ENABLED:
+            self._pool.start()
+
+    async def stop(self) -> None:
+        await self._pool.stop()
+        if self._corpus is not None:
+            self._corpus.close()
+
+    def _fallback_problem(self, topic: str, difficulty: str, exclude: Set[str]) -> ProblemSpec:
+        # Prefer a vetted corpus problem, even one the learner has seen, over the built-in one.
+        if self._corpus is not None:
+            curated = self._corpus.pick(topic, difficulty, exclude) or self._corpus.pick(topic, difficulty, set())
+            if curated:
+                return curated
         return ProblemSpec(
             id=f"fallback-{uuid4().hex[:8]}",
             topic=topic,
@@ -107,11 +389,11 @@ class ProblemRepository:
                 "    return n + solve(n - 1)\n"
             ),
             entrypoint="solve",
-            hints={
-                "conceptual": "Check the base case.",
-                "strategic": "What should solve(0) return?",
-                "implementation": "Fix the incorrect return value.",
-            },
+            hints=[
+                "Check the base case.",
+                "What should solve(0) return?",
+                "Fix the incorrect return value.",
+            ],
             tests=[
                 {"args": [3], "kwargs": {}, "expected": 6},
                 {"args": [0], "kwargs": {}, "expected": 0},
@@ -119,7 +401,10 @@ class ProblemRepository:
             bug_hint="Base case returns incorrect value",
         )
 
-    def find(
+    def fallback(self, topic: str, difficulty: str, *, exclude_ids: Optional[Iterable[str]] = None) -> ProblemSpec:
+        return self._fallback_problem(topic, difficulty, set(exclude_ids or []))
+
+    async def find(
         self,
         topic: str,
         difficulty: str,
@@ -138,16 +423,109 @@ class ProblemRepository:
         if cached:
             return self._rng.choice(cached)
 
-        problem = self._generator.generate(topic, difficulty, exclude, user_id, session_id)
+        banked = await self._from_bank(topic, difficulty, exclude)
+        if banked:
+            self._cache.add(banked, user_id, session_id)
+            return banked
+
+        pooled = self._pool.pop(topic, difficulty, exclude)
+        if pooled:
+            pooled = await self._persist(pooled, exclude)
+            self._cache.add(pooled, user_id, session_id)
+            return pooled
+
+        # Curated problems are served before paying for an on-demand LLM call.
+        curated = self._corpus.pick(topic, difficulty, exclude) if self._corpus is not None else None
+        if curated:
+            self._cache.add(curated, user_id, session_id)
+            return curated
+
+        # One retry budget covers every LLM call made on behalf of this lookup.
+        with retry_budget(settings.LLM_RETRY_BUDGET):
+            # Concurrent misses for the same topic/difficulty wait on one generation.
+            problem, shared = await self._single_flight.run(
+                (topic.lower(), difficulty.lower()),
+                lambda: self._generate_and_admit(topic, difficulty, exclude, user_id, session_id),
+            )
+            if shared and problem.id in exclude:
+                self._excluded_fanout += 1
+                problem = await self._generate_and_admit(topic, difficulty, exclude, user_id, session_id)
+        return problem
+
+    async def _generate_and_admit(
+        self,
+        topic: str,
+        difficulty: str,
+        exclude: Set[str],
+        user_id: Optional[str],
+        session_id: Optional[str],
+    ) -> ProblemSpec:
+        problem = await self._generator.generate(topic, difficulty, exclude, user_id, session_id)
         if problem:
+            problem = await self._persist(problem, exclude)
             self._cache.add(problem, user_id, session_id)
             return problem
 
         logger.critical("AI generation failed — using fallback")
-        fallback = self._fallback_problem(topic, difficulty)
+        fallback = self._fallback_problem(topic, difficulty, exclude)
         self._cache.add(fallback, user_id, session_id)
         return fallback
 
+    async def _from_bank(self, topic: str, difficulty: str, exclude: Set[str]) -> Optional[ProblemSpec]:
+        if self._bank is None:
+            return None
+        candidates = self._bank.lookup(topic, difficulty, exclude)
+        if not candidates and self._bank.is_stale(topic, difficulty):
+            # Other workers may have banked problems since our last read.
+            try:
+                await event_executor.run_blocking(self._bank.refresh, topic, difficulty)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Problem bank refresh failed")
+                return None
+            candidates = self._bank.lookup(topic, difficulty, exclude)
+        return self._rng.choice(candidates) if candidates else None
+
+    async def _persist(self, problem: ProblemSpec, exclude: Set[str]) -> ProblemSpec:
+        if self._bank is None:
+            return problem
+        try:
+            stored = await event_executor.run_blocking(self._bank.save, problem)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Failed to write problem to bank")
+            return problem
+        # A regenerated duplicate resolves to the banked copy, which the caller may have seen already.
+        return problem if stored.id in exclude else stored
+
+    async def prefill(self, topic: str, difficulty: str, count: int) -> List[ProblemSpec]:
+        """Bank ``count`` new problems for a cohort using batched generation calls."""
+        admitted: List[ProblemSpec] = []
+        seen: Set[str] = set()
+        batch_size = max(1, settings.PROBLEM_BATCH_SIZE)
+        with retry_budget(settings.LLM_RETRY_BUDGET):
+            while len(admitted) < count:
+                problems = await self._generator.generate_batch(
+                    topic, difficulty, min(batch_size, count - len(admitted)), seen
+                )
+                if not problems:
+                    if not spend_retry():
+                        break
+                    continue
+                for problem in problems:
+                    stored = await self._persist(problem, seen)
+                    seen.add(stored.id)
+                    admitted.append(stored)
+        logger.info("Problem prefill finished", extra={"requested": count, "admitted": len(admitted)})
+        return admitted
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "bank": self._bank.metrics() if self._bank is not None else None,
+            "corpus": self._corpus.metrics() if self._corpus is not None else None,
+            "single_flight": {**self._single_flight.metrics(), "excluded_fanout": self._excluded_fanout},
+            "warm_pool": self._pool.metrics(),
+            "admission": self._generator.admission_metrics(),
+        }
+
     def refresh(self) -> None:
         self._cache.clear()
 # =========================================================
\ No newline at end of file
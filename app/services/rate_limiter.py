@@ -0,0 +1,278 @@
+# app/services/rate_limiter.py
+
+import asyncio
+import logging
+import random
+import re
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Mapping, Optional
+
+from ..config import settings
+
+logger = logging.getLogger("skillproof.rate_limiter")
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """Parse ``Retry-After`` / ``x-ratelimit-reset-*`` values ("7.66s", "2m59.5s", "120ms", "3")."""
+    if value is None:
+        return None
+    value = value.strip()
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+# =========================================================
+# TOKEN BUCKET
+# =========================================================
+
+class TokenBucket:
+    """Request-rate bucket that can also be paused until a provider-announced reset."""
+
+    def __init__(self, *, rate_per_second: float, capacity: float):
+        self.rate = rate_per_second
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        # Waiters queue on the lock, so tokens are handed out in arrival order.
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self._tokens) / self.rate)
+
+    def block_for(self, seconds: float) -> None:
+        until = time.monotonic() + seconds
+        if until > self._blocked_until:
+            self._blocked_until = until
+            self._tokens = 0.0
+
+    @property
+    def tokens(self) -> float:
+        self._refill(time.monotonic())
+        return self._tokens
+
+    @property
+    def blocked_for(self) -> float:
+        return max(0.0, self._blocked_until - time.monotonic())
+
+
+# =========================================================
+# AIMD CONCURRENCY
+# =========================================================
+
+class AIMDController:
+    """Concurrency limit that grows by ~1 per window of successes and halves on throttling."""
+
+    def __init__(self, *, initial: int, minimum: int, maximum: int, backoff_factor: float = 0.5, cooldown: float = 1.0):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(self.maximum, max(self.minimum, initial)))
+        self.backoff_factor = backoff_factor
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self) -> None:
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def on_success(self) -> None:
+        self.limit = min(float(self.maximum), self.limit + 1.0 / self.limit)
+
+    def on_overload(self) -> None:
+        # Concurrent failures from the same burst should only cut the limit once.
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        self.limit = max(float(self.minimum), self.limit * self.backoff_factor)
+        logger.warning("LLM concurrency reduced", extra={"limit": int(self.limit)})
+
+
+# =========================================================
+# LIMITER
+# =========================================================
+
+class LLMRateLimiter:
+    """Single admission point for outbound LLM requests.
+
+    Every call takes a token from the request bucket and a slot from the AIMD
+    controller. Responses feed back into both: rate-limit headers and
+    ``Retry-After`` pause the bucket for everyone, throttling and server errors
+    shrink concurrency, successes grow it back.
+    """
+
+    def __init__(
+        self,
+        *,
+        requests_per_minute: float,
+        burst: int,
+        initial_concurrency: int,
+        min_concurrency: int,
+        max_concurrency: int,
+        backoff_base: float,
+        backoff_max: float,
+    ):
+        self.bucket = TokenBucket(rate_per_second=max(requests_per_minute, 1.0) / 60.0, capacity=burst)
+        self.concurrency = AIMDController(initial=initial_concurrency, minimum=min_concurrency, maximum=max_concurrency)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._waits: Deque[float] = deque(maxlen=500)
+        self.waiting = 0
+        self.admitted = 0
+        self.succeeded = 0
+        self.throttled = 0
+        self.errors = 0
+        self.retries = 0
+
+    @classmethod
+    def from_settings(cls) -> "LLMRateLimiter":
+        return cls(
+            requests_per_minute=settings.LLM_RATE_LIMIT_RPM,
+            burst=settings.LLM_RATE_LIMIT_BURST,
+            initial_concurrency=settings.LLM_CONCURRENCY_INITIAL,
+            min_concurrency=settings.LLM_CONCURRENCY_MIN,
+            max_concurrency=settings.LLM_CONCURRENCY_MAX,
+            backoff_base=settings.LLM_BACKOFF_BASE,
+            backoff_max=settings.LLM_BACKOFF_MAX,
+        )
+
+    def _bind_loop(self) -> None:
+        # asyncio primitives belong to one loop; rebuild them for a new one.
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self.bucket._lock = asyncio.Lock()
+        self.concurrency._condition = asyncio.Condition()
+        self.concurrency.in_flight = 0
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        self._bind_loop()
+        started = time.perf_counter()
+        self.waiting += 1
+        try:
+            await self.bucket.acquire()
+            await self.concurrency.acquire()
+        finally:
+            self.waiting -= 1
+        self._waits.append(time.perf_counter() - started)
+        self.admitted += 1
+        try:
+            yield
+        finally:
+            await self.concurrency.release()
+
+    def observe_headers(self, headers: Mapping[str, str]) -> None:
+        """Pause the bucket when the provider reports an exhausted request or token budget."""
+        for budget in ("requests", "tokens"):
+            remaining = headers.get(f"x-ratelimit-remaining-{budget}")
+            if remaining is None:
+                continue
+            try:
+                exhausted = float(remaining) <= 0
+            except ValueError:
+                continue
+            if exhausted:
+                reset = parse_duration(headers.get(f"x-ratelimit-reset-{budget}"))
+                if reset:
+                    self.bucket.block_for(reset)
+
+    def on_success(self, headers: Mapping[str, str]) -> None:
+        self.succeeded += 1
+        self.observe_headers(headers)
+        self.concurrency.on_success()
+
+    def on_throttled(self, headers: Mapping[str, str]) -> Optional[float]:
+        """Record a 429; returns the provider's ``Retry-After`` when it sent one."""
+        self.throttled += 1
+        self.observe_headers(headers)
+        retry_after = parse_duration(headers.get("retry-after"))
+        if retry_after is not None:
+            self.bucket.block_for(retry_after)
+        self.concurrency.on_overload()
+        return retry_after
+
+    def on_error(self) -> None:
+        self.errors += 1
+        self.concurrency.on_overload()
+
+    async def backoff(self, attempt: int, retry_after: Optional[float] = None) -> None:
+        """Sleep before a retry: the provider's hint if any, else capped full-jitter exponential."""
+        self.retries += 1
+        if retry_after is not None:
+            delay = min(retry_after, self.backoff_max)
+        else:
+            delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        await asyncio.sleep(delay)
+
+    def metrics(self) -> Dict[str, Any]:
+        waits = sorted(tuple(self._waits))
+        return {
+            "concurrency_limit": int(self.concurrency.limit),
+            "in_flight": self.concurrency.in_flight,
+            "waiting": self.waiting,
+            "tokens": round(self.bucket.tokens, 2),
+            "blocked_for_s": round(self.bucket.blocked_for, 2),
+            "admitted": self.admitted,
+            "succeeded": self.succeeded,
+            "throttled": self.throttled,
+            "errors": self.errors,
+            "retries": self.retries,
+            "wait_ms": {
+                "avg": round(sum(waits) / len(waits) * 1000, 2) if waits else 0.0,
+                "p95": round(waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000, 2) if waits else 0.0,
+                "max": round(waits[-1] * 1000, 2) if waits else 0.0,
+            },
+        }
+
+
+# =========================================================
+# SINGLETON
+# =========================================================
+
+_rate_limiter: Optional[LLMRateLimiter] = None
+
+
+def get_rate_limiter() -> LLMRateLimiter:
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = LLMRateLimiter.from_settings()
+        logger.info("LLM rate limiter created", extra={"rpm": settings.LLM_RATE_LIMIT_RPM})
+    return _rate_limiter
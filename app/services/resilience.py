@@ -0,0 +1,176 @@
+# app/services/resilience.py
+
+import contextvars
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from ..config import settings
+from ..core.errors import CircuitOpenError
+
+logger = logging.getLogger("skillproof.resilience")
+
+
+# =========================================================
+# CIRCUIT BREAKER
+# =========================================================
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker around a downstream dependency.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    every call is rejected immediately. Once ``recovery_timeout`` has passed
+    it lets up to ``half_open_max_calls`` probes through; one success closes
+    it again, one failure re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, *, failure_threshold: int, recovery_timeout: float, half_open_max_calls: int = 1):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = max(1, half_open_max_calls)
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_started = 0.0
+        self.opened = 0
+        self.rejected = 0
+        self.successes = 0
+        self.failures = 0
+
+    @classmethod
+    def from_settings(cls, name: str) -> "CircuitBreaker":
+        return cls(
+            name,
+            failure_threshold=settings.LLM_BREAKER_FAILURE_THRESHOLD,
+            recovery_timeout=settings.LLM_BREAKER_RECOVERY_SECONDS,
+            half_open_max_calls=settings.LLM_BREAKER_HALF_OPEN_CALLS,
+        )
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._state = self.HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    def before_call(self) -> None:
+        state = self.state
+        if state == self.CLOSED:
+            return
+        if state == self.HALF_OPEN:
+            now = time.monotonic()
+            # A probe that never reported back (e.g. cancelled) must not wedge the breaker.
+            if self._probes >= self.half_open_max_calls and now - self._probe_started >= self.recovery_timeout:
+                self._probes = 0
+            if self._probes < self.half_open_max_calls:
+                self._probes += 1
+                self._probe_started = now
+                return
+        self.rejected += 1
+        raise CircuitOpenError(
+            f"{self.name} is unavailable",
+            code="circuit_open",
+            context={"breaker": self.name, "retry_in_s": round(self.retry_in, 1)},
+        )
+
+    def record_success(self) -> None:
+        self.successes += 1
+        self._consecutive_failures = 0
+        if self._state != self.CLOSED:
+            logger.info("Circuit closed", extra={"breaker": self.name})
+        self._state = self.CLOSED
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._consecutive_failures += 1
+        if self._state == self.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+            self._trip()
+
+    def _trip(self) -> None:
+        if self._state != self.OPEN:
+            self.opened += 1
+            logger.warning("Circuit opened", extra={"breaker": self.name, "failures": self._consecutive_failures})
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+
+    @property
+    def retry_in(self) -> float:
+        if self._state != self.OPEN:
+            return 0.0
+        return max(0.0, self.recovery_timeout - (time.monotonic() - self._opened_at))
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "state": self.state,
+            "consecutive_failures": self._consecutive_failures,
+            "failure_threshold": self.failure_threshold,
+            "retry_in_s": round(self.retry_in, 1),
+            "opened": self.opened,
+            "rejected": self.rejected,
+            "successes": self.successes,
+            "failures": self.failures,
+        }
+
+
+# =========================================================
+# RETRY BUDGET
+# =========================================================
+
+class RetryBudget:
+    """Retries shared by every layer working on one logical request."""
+
+    def __init__(self, limit: int):
+        self.limit = max(0, limit)
+        self.spent = 0
+
+    def try_spend(self) -> bool:
+        if self.spent >= self.limit:
+            return False
+        self.spent += 1
+        return True
+
+
+_retry_budget: contextvars.ContextVar[Optional[RetryBudget]] = contextvars.ContextVar("skillproof_retry_budget", default=None)
+
+
+@contextmanager
+def retry_budget(limit: int) -> Iterator[RetryBudget]:
+    """Install a budget for the current request; nested scopes keep drawing from the outer one."""
+    current = _retry_budget.get()
+    if current is not None:
+        yield current
+        return
+    budget = RetryBudget(limit)
+    token = _retry_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _retry_budget.reset(token)
+
+
+def spend_retry() -> bool:
+    """True if the caller may retry; calls outside any budget scope are not limited here."""
+    budget = _retry_budget.get()
+    return budget is None or budget.try_spend()
+
+
+# =========================================================
+# SINGLETON
+# =========================================================
+
+_llm_breaker: Optional[CircuitBreaker] = None
+
+
+def get_llm_breaker() -> CircuitBreaker:
+    global _llm_breaker
+    if _llm_breaker is None:
+        _llm_breaker = CircuitBreaker.from_settings("llm")
+    return _llm_breaker
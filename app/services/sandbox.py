@@ -0,0 +1,331 @@
+# app/services/sandbox.py
+
+import asyncio
+import functools
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from ..config import settings
+
+try:  # POSIX only; without it workers still isolate the server but run unlimited.
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+logger = logging.getLogger("skillproof.sandbox")
+
+
+# =========================================================
+# WORKER PROCESS
+# =========================================================
+
+def _apply_memory_limit(memory_mb: int) -> None:
+    if resource is None or memory_mb <= 0:
+        return
+    limit = memory_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    # Submissions have no business writing files.
+    resource.setrlimit(resource.RLIMIT_FSIZE, (0, 0))
+
+
+def _set_cpu_budget(cpu_seconds: float) -> None:
+    # RLIMIT_CPU counts the whole process lifetime, so re-arm it relative to what earlier jobs used.
+    if resource is None or cpu_seconds <= 0:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    soft = int(usage.ru_utime + usage.ru_stime + cpu_seconds) + 1
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _json_safe(value: Any) -> Any:
+    try:
+        json.dumps(value)
+    except (TypeError, ValueError):
+        return repr(value)
+    return value
+
+
+def _sanitize_detail(detail: Dict[str, Any]) -> Dict[str, Any]:
+    if "output" in detail:
+        detail["output"] = _json_safe(detail["output"])
+    return detail
+
+
+def _sanitize(result: Dict[str, Any], max_output_chars: int) -> Dict[str, Any]:
+    # Results cross a pipe and end up in websocket frames: keep them small and JSON-safe.
+    stdout = result.get("stdout") or ""
+    if len(stdout) > max_output_chars:
+        result["stdout"] = stdout[:max_output_chars] + "\n…[output truncated]"
+    for detail in result.get("details", []):
+        _sanitize_detail(detail)
+    return result
+
+
+def _worker_main(conn, cpu_seconds: float, memory_mb: int, max_output_chars: int) -> None:
+    from .code_evaluator import execute_tests
+
+    _apply_memory_limit(memory_mb)
+    while True:
+        try:
+            code, entrypoint, tests, options, stream = conn.recv()
+        except (EOFError, OSError):
+            return
+        _set_cpu_budget(cpu_seconds)
+        # Streaming jobs report each test as ("test", detail) ahead of the final ("done", result).
+        on_test = (lambda detail: conn.send(("test", _sanitize_detail(dict(detail))))) if stream else None
+        try:
+            result = execute_tests(code, entrypoint, tests, on_test=on_test, **options)
+        except BaseException as exc:  # pylint: disable=broad-except
+            # sys.exit() and friends from the submission must not take the worker down silently.
+            result = _error_result(f"Execution aborted: {type(exc).__name__}", tests)
+        try:
+            conn.send(("done", _sanitize(result, max_output_chars)))
+        except (EOFError, OSError):
+            return
+        except Exception as exc:  # pylint: disable=broad-except
+            conn.send(("done", _error_result(f"Result could not be returned: {exc}", tests)))
+
+
+def _error_result(message: str, tests: List[Dict[str, Any]], duration: float = 0.0) -> Dict[str, Any]:
+    return {
+        "status": "error",
+        "message": message,
+        "stdout": "",
+        "passed": 0,
+        "failed": len(tests),
+        "total_tests": len(tests),
+        "execution_time": duration,
+        "details": [],
+    }
+
+
+# =========================================================
+# POOL
+# =========================================================
+
+class _Worker:
+    def __init__(self, process: multiprocessing.Process, conn) -> None:
+        self.process = process
+        self.conn = conn
+        self.jobs = 0
+
+    def kill(self) -> None:
+        try:
+            self.conn.close()
+        except OSError:
+            pass
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=1)
+
+
+class SandboxPool:
+    """Pre-forked worker processes that execute submissions under rlimits.
+
+    Each job gets a CPU-time budget (RLIMIT_CPU, enforced by the kernel) and
+    a wall-clock deadline (enforced here by killing the worker); the address
+    space is capped with RLIMIT_AS. Workers are recycled after
+    ``max_jobs_per_worker`` jobs and replaced whenever one dies, so a hostile
+    or runaway submission only ever costs a single process.
+    """
+
+    def __init__(
+        self,
+        *,
+        size: int,
+        max_jobs_per_worker: int,
+        cpu_seconds: float,
+        wall_seconds: float,
+        memory_mb: int,
+        max_output_chars: int,
+    ):
+        self.size = max(1, size)
+        self.max_jobs_per_worker = max(1, max_jobs_per_worker)
+        self.cpu_seconds = cpu_seconds
+        self.wall_seconds = wall_seconds
+        self.memory_mb = memory_mb
+        self.max_output_chars = max_output_chars
+        methods = multiprocessing.get_all_start_methods()
+        # forkserver children come from a clean single-threaded server, not from our threaded process.
+        self._ctx = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._workers: List[_Worker] = []
+        self._lock = threading.Lock()
+        self._started = False
+        self._runner: Optional[ThreadPoolExecutor] = None
+        self.jobs = 0
+        self.busy = 0
+        self.timeouts = 0
+        self.crashes = 0
+        self.recycled = 0
+
+    @classmethod
+    def from_settings(cls) -> "SandboxPool":
+        return cls(
+            size=settings.SANDBOX_WORKERS or os.cpu_count() or 1,
+            max_jobs_per_worker=settings.SANDBOX_MAX_JOBS_PER_WORKER,
+            cpu_seconds=settings.SANDBOX_CPU_SECONDS,
+            wall_seconds=settings.SANDBOX_WALL_SECONDS,
+            memory_mb=settings.SANDBOX_MEMORY_MB,
+            max_output_chars=settings.SANDBOX_MAX_OUTPUT_CHARS,
+        )
+
+    def start(self) -> None:
+        with self._lock:
+            if self._started:
+                return
+            if self._ctx.get_start_method() == "forkserver":
+                self._ctx.set_forkserver_preload(["app.services.code_evaluator"])
+            for _ in range(self.size):
+                worker = self._spawn()
+                self._workers.append(worker)
+                self._idle.put(worker)
+            self._started = True
+        logger.info("Sandbox pool started", extra={"workers": self.size, "start_method": self._ctx.get_start_method()})
+
+    def _spawn(self) -> _Worker:
+        parent_conn, child_conn = self._ctx.Pipe()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(child_conn, self.cpu_seconds, self.memory_mb, self.max_output_chars),
+            name="skillproof-sandbox",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        return _Worker(process, parent_conn)
+
+    def _retire(self, worker: _Worker) -> _Worker:
+        worker.kill()
+        replacement = self._spawn()
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+            self._workers.append(replacement)
+        return replacement
+
+    def _executor(self) -> ThreadPoolExecutor:
+        # One thread per worker process: waiting jobs queue here instead of holding
+        # event_executor's blocking threads, which DB and bookkeeping calls need.
+        with self._lock:
+            if self._runner is None:
+                self._runner = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="skillproof-sandbox")
+            return self._runner
+
+    async def run_async(
+        self,
+        code: str,
+        entrypoint: str,
+        tests: List[Dict[str, Any]],
+        options: Optional[Dict[str, Any]] = None,
+        on_test: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> Dict[str, Any]:
+        """``run`` on the pool's own threads; ``on_test`` is called from one of them."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor(), functools.partial(self.run, code, entrypoint, tests, options, on_test)
+        )
+
+    def run(
+        self,
+        code: str,
+        entrypoint: str,
+        tests: List[Dict[str, Any]],
+        options: Optional[Dict[str, Any]] = None,
+        on_test: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> Dict[str, Any]:
+        """Blocking; async callers use ``run_async``. ``options`` go to ``execute_tests``.
+
+        ``on_test`` is called on this thread with each test's detail as the worker reports it.
+        """
+        self.start()
+        worker = self._idle.get()
+        self.busy += 1
+        started = time.perf_counter()
+        try:
+            try:
+                worker.conn.send((code, entrypoint, tests, options or {}, on_test is not None))
+                deadline = started + self.wall_seconds
+                while True:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0 or not worker.conn.poll(remaining):
+                        self.timeouts += 1
+                        worker = self._retire(worker)
+                        return _error_result(
+                            f"Execution timed out after {self.wall_seconds:g}s", tests, time.perf_counter() - started
+                        )
+                    kind, body = worker.conn.recv()
+                    if kind == "done":
+                        result = body
+                        break
+                    try:
+                        on_test(body)
+                    except Exception:  # pylint: disable=broad-except
+                        logger.exception("Test result callback failed")
+            except (EOFError, OSError):
+                # Killed by RLIMIT_CPU (SIGXCPU), the OOM killer or a hard crash.
+                self.crashes += 1
+                process = worker.process
+                worker = self._retire(worker)
+                exitcode = process.exitcode
+                return _error_result(
+                    f"Execution aborted: sandbox worker died (exit code {exitcode})", tests, time.perf_counter() - started
+                )
+
+            worker.jobs += 1
+            if worker.jobs >= self.max_jobs_per_worker:
+                self.recycled += 1
+                worker = self._retire(worker)
+            return result
+        finally:
+            self.jobs += 1
+            self.busy -= 1
+            self._idle.put(worker)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "workers": self.size,
+            "started": self._started,
+            "idle": self._idle.qsize(),
+            "busy": self.busy,
+            "jobs": self.jobs,
+            "timeouts": self.timeouts,
+            "crashes": self.crashes,
+            "recycled": self.recycled,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            workers, self._workers = self._workers, []
+            runner, self._runner = self._runner, None
+            self._started = False
+        if runner is not None:
+            runner.shutdown(wait=False, cancel_futures=True)
+        for worker in workers:
+            worker.kill()
+        while not self._idle.empty():
+            self._idle.get_nowait()
+
+
+# =========================================================
+# SINGLETON
+# =========================================================
+
+_sandbox_pool: Optional[SandboxPool] = None
+
+
+def get_sandbox_pool() -> SandboxPool:
+    global _sandbox_pool
+    if _sandbox_pool is None:
+        _sandbox_pool = SandboxPool.from_settings()
+    return _sandbox_pool
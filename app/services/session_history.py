@@ -0,0 +1,91 @@
+# app/services/session_history.py
+
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..crud import crud_session_history
+from ..db.session import SessionLocal
+from .session_state import BoundedHistory, SessionState
+from .submission_store import get_submission_store
+
+logger = logging.getLogger("skillproof.session_history")
+
+
+def spill(state: SessionState, *, include_window: bool = False) -> int:
+    """Write entries evicted from the in-memory windows to ``session_history``.
+
+    Blocking; callers run it off the event loop. With ``include_window`` the
+    entries still in memory are written too, which is how a closing session
+    leaves its complete history behind. Entries that fail to write are put
+    back and retried on the next spill; a closing spill has no next one, so
+    it is retried once on the spot.
+    """
+    if not state.session_id:
+        # Nothing to write to yet; leave evicted entries queued rather than dropping them.
+        return 0
+    drained = [(history, history.drain()) for history in state.histories() if history.spills]
+    entries: List[Tuple[str, int, Dict[str, Any]]] = []
+    window = 0
+    for history, pending in drained:
+        entries.extend((history.kind, seq, payload) for seq, payload in pending)
+        if include_window:
+            snapshot = history.snapshot()
+            window += len(snapshot)
+            entries.extend((history.kind, seq, payload) for seq, payload in snapshot)
+    if not entries:
+        return 0
+    written = _write(state.session_id, entries)
+    if written is None and include_window:
+        written = _write(state.session_id, entries)
+    if written is not None:
+        return written
+    for history, pending in drained:
+        history.restore(pending)
+    if include_window:
+        logger.error(
+            "Session history lost on close",
+            extra={"session_id": state.session_id, "entries": len(entries), "window_entries": window},
+        )
+    return 0
+
+
+def _write(session_id: int, entries: List[Tuple[str, int, Dict[str, Any]]]) -> Optional[int]:
+    db = SessionLocal()
+    try:
+        return crud_session_history.add_entries(db, session_id, entries)
+    except Exception:  # pylint: disable=broad-except
+        db.rollback()
+        logger.exception("Session history spill failed", extra={"session_id": session_id, "entries": len(entries)})
+        return None
+    finally:
+        db.close()
+
+
+def full_history(session_id: Optional[int], history: BoundedHistory) -> List[Dict[str, Any]]:
+    """Every entry of ``history`` in order: spilled rows read back lazily, then what is still in memory."""
+    entries: Dict[int, Dict[str, Any]] = {}
+    if session_id and history.first_seq > 0:
+        try:
+            entries.update(_load_stored(session_id, history))
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Session history read-back failed", extra={"session_id": session_id, "kind": history.kind})
+    entries.update(history.pending())
+    entries.update(history.snapshot())
+    return [entries[seq] for seq in sorted(entries)]
+
+
+def _load_stored(session_id: int, history: BoundedHistory) -> List[Tuple[int, Dict[str, Any]]]:
+    if not history.spills:
+        # Submissions are persisted by the submission store rather than spilled.
+        store = get_submission_store()
+        return store.history(session_id) if store is not None else []
+    db = SessionLocal()
+    try:
+        return crud_session_history.list_entries(db, session_id, history.kind)
+    finally:
+        db.close()
+
+
+def full_histories(state: SessionState) -> Tuple[List[Dict[str, Any]], ...]:
+    """Full submissions, hints and decision log of a session, in ``state.histories()`` order."""
+    return tuple(full_history(state.session_id, history) for history in state.histories())
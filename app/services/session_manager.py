@@ -1,3 +1,4 @@
+import threading
 from datetime import datetime
 from typing import Dict, Optional
 
@@ -10,6 +11,7 @@ from ..schemas.skill_profile import SkillProfileUpdate
 from ..schemas.feedback import AgentFeedbackCreate
 from ..core.errors import ServiceError, build_error_payload
 from .problem_repository import ProblemRepository
+from .session_history import spill
 from .session_state import SessionState
 
 
@@ -26,11 +28,23 @@ class SessionManager:
     def __init__(self) -> None:
         self._problem_repository = ProblemRepository()
         self._active: Dict[str, Dict[str, object]] = {}
+        self._lock = threading.Lock()
+        self._start_locks: Dict[str, threading.Lock] = {}
+
+    def _start_lock(self, user_id: str) -> threading.Lock:
+        with self._lock:
+            return self._start_locks.setdefault(user_id, threading.Lock())
 
     def start_session(self, user_id: str, meta: Optional[Dict[str, object]] = None) -> Dict[str, object]:
-        if user_id in self._active:
-            return self._active[user_id]
+        # Sessions start from worker threads; serialise per user so two frames
+        # cannot both miss the lookup and create duplicate session rows.
+        with self._start_lock(user_id):
+            existing = self._active.get(user_id)
+            if existing:
+                return existing
+            return self._create_session(user_id, meta)
 
+    def _create_session(self, user_id: str, meta: Optional[Dict[str, object]]) -> Dict[str, object]:
         meta = meta or {}
         mode = meta.get("mode", "learning")
         state = SessionState(user_id=user_id, mode=mode)
@@ -46,8 +60,10 @@ class SessionManager:
                 context={"user_id": user_id, "error": str(exc)},
             ) from exc
         orchestrator = OrchestratorAgent(state, self._problem_repository)
-        self._active[user_id] = {"state": state, "agent": orchestrator}
-        return self._active[user_id]
+        bundle = {"state": state, "agent": orchestrator}
+        with self._lock:
+            self._active[user_id] = bundle
+        return bundle
 
     def get_session(self, user_id: str) -> Optional[Dict[str, object]]:
         return self._active.get(user_id)
@@ -60,23 +76,54 @@ class SessionManager:
         bundle = self._active.get(user_id)
         return bundle["state"] if bundle else None
 
+    @property
+    def problem_repository(self) -> ProblemRepository:
+        return self._problem_repository
+
+    def all_states(self) -> Dict[str, SessionState]:
+        return {user_id: bundle["state"] for user_id, bundle in list(self._active.items())}
+
     def close_session(self, user_id: str) -> None:
-        bundle = self._active.pop(user_id, None)
+        with self._lock:
+            bundle = self._active.pop(user_id, None)
+            self._start_locks.pop(user_id, None)
         if bundle:
             self._finalize_persistent_session(bundle["state"])
 
     def record_feedback(self, state: SessionState) -> None:
-        if not state.session_id or not state.feedback_events:
+        """Persist queued feedback notes and spill history evicted from memory; runs after every event."""
+        if not state.session_id:
+            return
+        spill(state)
+        if not state.feedback_events:
             return
         db = SessionLocal()
         try:
-            record = crud_session.create_session(db, SessionCreate(user_id=state.user_id, mode=state.mode))
-            return record.id
+            self._flush_feedback(db, state)
         except Exception as exc:  # pylint: disable=broad-except
-            raise ServiceError("Failed to create session record", code="session_create_failed", context={"error": str(exc)}) from exc
+            raise ServiceError(
+                "Failed to record agent feedback",
+                code="feedback_record_failed",
+                context={"session_id": state.session_id, "error": str(exc)},
+            ) from exc
         finally:
             db.close()
 
+    def _flush_feedback(self, db, state: SessionState) -> None:
+        events, state.feedback_events = state.feedback_events, []
+        for idx, event in enumerate(events):
+            payload = AgentFeedbackCreate(
+                session_id=state.session_id,
+                agent=event["agent"],
+                note=event["note"],
+            )
+            try:
+                crud_agent_feedback.create_feedback(db, payload)
+            except Exception:
+                # Keep the unwritten notes queued for the next flush.
+                state.feedback_events[:0] = events[idx:]
+                raise
+
     def _finalize_persistent_session(self, state: SessionState) -> None:
         if not state.session_id:
             return
@@ -92,14 +139,8 @@ class SessionManager:
                 crud_skill_profile.update_profile(db, state.user_id, update_payload)
                 state.skill_profile.mark_clean()
             if state.feedback_events:
-                for event in state.feedback_events:
-                    payload = AgentFeedbackCreate(
-                        session_id=state.session_id,
-                        agent=event["agent"],
-                        note=event["note"],
-                    )
-                    crud_agent_feedback.create_feedback(db, payload)
-                state.feedback_events.clear()
+                self._flush_feedback(db, state)
+            spill(state, include_window=True)
         except Exception as exc:  # pylint: disable=broad-except
             raise ServiceError(
                 "Failed to finalize session",
@@ -1,9 +1,21 @@
 from __future__ import annotations
 
+import time
+from collections import deque
 from dataclasses import dataclass, field
-from datetime import datetime
-from difflib import SequenceMatcher
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Callable, Deque, Dict, Generic, Iterator, List, Optional, Set, Tuple, TypeVar, Union
+
+from ..config import settings
+from ..core.clock import to_iso
+from ..core.decision import AgentDecision
+from .similarity import get_similarity_engine
+from .submission_store import get_submission_store
+
+T = TypeVar("T")
+
+HINT_LEVELS = ("conceptual", "directional", "code")
+# How many of the latest same-difficulty submissions recent_failures() looks at.
+RECENT_FAILURE_WINDOW = 3
 
 
 @dataclass
@@ -18,6 +30,8 @@ class ProblemSpec:
     tests: List[Dict[str, Any]]
     hints: List[str]
     bug_hint: Optional[str] = None
+    # Per-test outcome of the starter code, recorded when the problem was admitted.
+    baseline: Optional[List[Dict[str, Any]]] = None
 
     def for_delivery(self) -> Dict[str, Any]:
         return {
@@ -30,10 +44,12 @@ class ProblemSpec:
         }
 
 
-@dataclass
+# Per-session records are slotted and keep epoch-float timestamps; ISO strings
+# are only produced when a record is serialized.
+@dataclass(slots=True)
 class SubmissionRecord:
     code: str
-    created_at: datetime
+    created_at: float
     diff_ratio: float
     time_delta: float
     tests_passed: int
@@ -44,16 +60,50 @@ class SubmissionRecord:
     reasoning_label: str = "undetermined"
     notes: str = ""
     difficulty: str = ""
+    problem_id: str = ""
+    # Position in the session's submission history; with session_id, the key in the submissions table.
+    seq: int = 0
 
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "timestamp": to_iso(self.created_at),
+            "problem_id": self.problem_id,
+            "status": self.status,
+            "tests_passed": self.tests_passed,
+            "tests_failed": self.tests_failed,
+            "total_tests": self.total_tests,
+            "diff_ratio": self.diff_ratio,
+            "time_delta": self.time_delta,
+            "guess_probability": self.guess_probability,
+            "reasoning_label": self.reasoning_label,
+            "notes": self.notes,
+            "difficulty": self.difficulty,
+            "code": self.code,
+        }
 
-@dataclass
+
+@dataclass(slots=True)
 class HintRecord:
     level: str
     text: str
-    created_at: datetime
+    created_at: float
 
+    def as_dict(self) -> Dict[str, Any]:
+        return {"level": self.level, "text": self.text, "timestamp": to_iso(self.created_at)}
 
-@dataclass
+
+@dataclass(slots=True)
+class DecisionRecord:
+    agent: str
+    decision: Union[AgentDecision, Dict[str, Any]]
+    created_at: float
+
+    def as_dict(self) -> Dict[str, Any]:
+        decision = self.decision.as_payload() if isinstance(self.decision, AgentDecision) else self.decision
+        return {"agent": self.agent, "decision": decision, "timestamp": to_iso(self.created_at)}
+
+
+@dataclass(slots=True)
 class IntegrityState:
     focus_losses: int = 0
     inactivity_flags: int = 0
@@ -63,9 +113,9 @@ class IntegrityState:
     severity: str = "normal"
     paused: bool = False
     terminated: bool = False
-    last_event_at: datetime = field(default_factory=datetime.utcnow)
+    last_event_at: float = field(default_factory=time.time)
 
-    def advance(self, timestamp: datetime) -> None:
+    def advance(self, timestamp: float) -> None:
         self.last_event_at = timestamp
 
     def register_focus_loss(self) -> str:
@@ -136,7 +186,7 @@ class IntegrityState:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class SkillProfile:
     debugging: float = 0.5
     logic: float = 0.5
@@ -203,25 +253,113 @@ class SkillProfile:
         }
 
 
-@dataclass
+class BoundedHistory(Generic[T]):
+    """Append-only history that keeps only the most recent ``window`` entries in memory.
+
+    Entries pushed out of the window are serialized and parked until the
+    session manager spills them to the ``session_history`` table; ``total``
+    counts everything ever appended. Indexing, slicing and iteration see the
+    in-memory window only.
+    """
+
+    __slots__ = ("kind", "spills", "total", "_items", "_serialize", "_evicted")
+
+    def __init__(self, kind: str, window: int, serialize: Callable[[T], Dict[str, Any]], *, spills: bool = True):
+        self.kind = kind
+        # False when entries are persisted by their own store and evictions can simply be dropped.
+        self.spills = spills
+        self.total = 0
+        self._items: Deque[T] = deque(maxlen=max(2, window))
+        self._serialize = serialize
+        self._evicted: List[Tuple[int, Dict[str, Any]]] = []
+
+    def append(self, item: T) -> None:
+        if self.spills and len(self._items) == self._items.maxlen:
+            self._evicted.append((self.total - len(self._items), self._serialize(self._items[0])))
+        self._items.append(item)
+        self.total += 1
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._items)
+
+    def __reversed__(self) -> Iterator[T]:
+        return reversed(self._items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self._items)[index]
+        return self._items[index]
+
+    @property
+    def window(self) -> int:
+        return self._items.maxlen or 0
+
+    @property
+    def first_seq(self) -> int:
+        """Sequence number of the oldest entry still held in memory."""
+        return self.total - len(self._items)
+
+    def drain(self) -> List[Tuple[int, Dict[str, Any]]]:
+        """Hand over evicted entries waiting to be written, as ``(seq, payload)`` pairs."""
+        pending, self._evicted = self._evicted, []
+        return pending
+
+    def restore(self, pending: List[Tuple[int, Dict[str, Any]]]) -> None:
+        """Put back entries whose spill failed so the next flush retries them."""
+        self._evicted[:0] = pending
+
+    def pending(self) -> List[Tuple[int, Dict[str, Any]]]:
+        return list(self._evicted)
+
+    def snapshot(self) -> List[Tuple[int, Dict[str, Any]]]:
+        """The in-memory window serialized like spilled entries."""
+        return [(self.first_seq + idx, self._serialize(item)) for idx, item in enumerate(list(self._items))]
+
+
+def _submission_history() -> BoundedHistory[SubmissionRecord]:
+    return BoundedHistory(
+        "submission",
+        settings.SESSION_SUBMISSION_WINDOW,
+        SubmissionRecord.as_dict,
+        spills=not settings.SUBMISSION_STORE_ENABLED,
+    )
+
+
+def _hint_history() -> BoundedHistory[HintRecord]:
+    return BoundedHistory("hint", settings.SESSION_HINT_WINDOW, HintRecord.as_dict)
+
+
+def _decision_history() -> BoundedHistory[DecisionRecord]:
+    return BoundedHistory("decision", settings.SESSION_DECISION_WINDOW, DecisionRecord.as_dict)
+
+
+@dataclass(slots=True)
 class SessionState:
     user_id: str
     mode: str = "learning"
     session_id: Optional[int] = None
-    started_at: datetime = field(default_factory=datetime.utcnow)
+    started_at: float = field(default_factory=time.time)
     current_problem: Optional[ProblemSpec] = None
     difficulty: str = "easy"
     topic: str = "recursion"
     status: str = "active"
-    submissions: List[SubmissionRecord] = field(default_factory=list)
-    hints: List[HintRecord] = field(default_factory=list)
+    submissions: BoundedHistory[SubmissionRecord] = field(default_factory=_submission_history)
+    hints: BoundedHistory[HintRecord] = field(default_factory=_hint_history)
     integrity: IntegrityState = field(default_factory=IntegrityState)
     skill_profile: SkillProfile = field(default_factory=SkillProfile)
     difficulty_history: List[str] = field(default_factory=list)
-    decision_history: List[Dict[str, Any]] = field(default_factory=list)
+    decision_history: BoundedHistory[DecisionRecord] = field(default_factory=_decision_history)
     agent_feedback: Dict[str, List[str]] = field(default_factory=dict)
     feedback_events: List[Dict[str, Any]] = field(default_factory=list)
     assigned_problem_ids: Set[str] = field(default_factory=set)
+    # Maintained as records are added so adaptation and hint decisions never rescan the histories.
+    pass_streaks: Dict[str, int] = field(default_factory=dict)
+    failure_bits: Dict[str, int] = field(default_factory=dict)
+    last_submission_difficulty: Optional[str] = None
+    hint_level_bits: int = 0
 
     def mark_problem(self, problem: ProblemSpec) -> None:
         self.current_problem = problem
@@ -231,13 +369,13 @@ class SessionState:
         self.assigned_problem_ids.add(problem.id)
 
     def add_submission(self, code: str, evaluation: Dict[str, Any]) -> SubmissionRecord:
-        now = datetime.utcnow()
+        now = time.time()
         diff_ratio = 1.0
         time_delta = 0.0
         if self.submissions:
             previous = self.submissions[-1]
-            diff_ratio = SequenceMatcher(None, previous.code, code).ratio()
-            time_delta = (now - previous.created_at).total_seconds()
+            diff_ratio = get_similarity_engine().ratio(previous.code, code)
+            time_delta = now - previous.created_at
         passed = evaluation.get("passed", 0)
         failed = evaluation.get("failed", 0)
         total_tests = evaluation.get("total_tests", passed + failed)
@@ -252,30 +390,62 @@ class SessionState:
             total_tests=total_tests,
             status=status,
             difficulty=self.difficulty,
+            problem_id=self.current_problem.id if self.current_problem else "",
+            seq=self.submissions.total,
         )
         self.submissions.append(record)
+        self._track_outcome(record)
+        self._persist_submission(record)
         return record
 
+    def _track_outcome(self, record: SubmissionRecord) -> None:
+        difficulty = record.difficulty
+        passed = record.status == "passed"
+        # A pass streak is a run of passes at one difficulty; any submission at another difficulty ends it.
+        streak = self.pass_streaks.get(difficulty, 0) if self.last_submission_difficulty == difficulty else 0
+        self.pass_streaks[difficulty] = streak + 1 if passed else 0
+        bits = (self.failure_bits.get(difficulty, 0) << 1) | (not passed)
+        self.failure_bits[difficulty] = bits & ((1 << RECENT_FAILURE_WINDOW) - 1)
+        self.last_submission_difficulty = difficulty
+
+    def annotate_submission(self, record: SubmissionRecord, *, guess_probability: float, reasoning_label: str, notes: str) -> None:
+        record.guess_probability = guess_probability
+        record.reasoning_label = reasoning_label
+        record.notes = notes
+        self._persist_submission(record)
+
+    def _persist_submission(self, record: SubmissionRecord) -> None:
+        store = get_submission_store()
+        if store is not None and self.session_id:
+            store.enqueue(self.session_id, record)
+
     def record_hint(self, level: str, text: str) -> None:
-        self.hints.append(HintRecord(level=level, text=text, created_at=datetime.utcnow()))
+        self.hints.append(HintRecord(level=level, text=text, created_at=time.time()))
+        if level in HINT_LEVELS:
+            self.hint_level_bits |= 1 << HINT_LEVELS.index(level)
 
-    def record_decision(self, agent: str, decision: Dict[str, Any]) -> None:
+    def hint_level_used(self, index: int) -> bool:
+        """Whether a hint at ``HINT_LEVELS[index]`` was given this session."""
+        return bool(self.hint_level_bits >> index & 1)
+
+    def record_decision(self, agent: str, decision: Union[AgentDecision, Dict[str, Any]]) -> None:
         import logging
         logger = logging.getLogger("skillproof.session_state")
-        entry = {
-            "agent": agent,
-            "decision": decision,
-            "timestamp": datetime.utcnow().isoformat(),
-        }
         logger.info("Decision recorded", extra={"session_id": getattr(self, 'session_id', None), "agent": agent, "decision": decision})
-        self.decision_history.append(entry)
+        self.decision_history.append(DecisionRecord(agent=agent, decision=decision, created_at=time.time()))
+
+    def recent_decisions(self, count: int) -> List[Dict[str, Any]]:
+        return [record.as_dict() for record in self.decision_history[-count:]]
 
     def append_feedback(self, agent: str, note: str) -> None:
         import logging
         logger = logging.getLogger("skillproof.session_state")
-        timestamp = datetime.utcnow().isoformat()
+        timestamp = time.time()
         logger.info("Feedback appended", extra={"session_id": getattr(self, 'session_id', None), "agent": agent, "note": note})
-        self.agent_feedback.setdefault(agent, []).append(note)
+        notes = self.agent_feedback.setdefault(agent, [])
+        notes.append(note)
+        # Every note is also queued in feedback_events and persisted, so only the latest are kept here.
+        del notes[:-settings.SESSION_FEEDBACK_WINDOW]
         self.feedback_events.append({"agent": agent, "note": note, "timestamp": timestamp})
 
     def latest_submission(self) -> Optional[SubmissionRecord]:
@@ -287,19 +457,15 @@ class SessionState:
         return self.submissions[-1]
 
     def consecutive_passes(self) -> int:
-        if not self.submissions:
-            return 0
-        current_difficulty = self.difficulty
-        count = 0
-        for record in reversed(self.submissions):
-            if record.difficulty != current_difficulty:
-                if count > 0:
-                    break
-                continue
-            if record.status != "passed":
-                break
-            count += 1
-        return count
+        """Passes in a row at the current difficulty, ending at its latest submission."""
+        return self.pass_streaks.get(self.difficulty, 0)
+
+    def recent_failures(self) -> int:
+        """Failures among the last RECENT_FAILURE_WINDOW submissions at the current difficulty."""
+        return self.failure_bits.get(self.difficulty, 0).bit_count()
+
+    def histories(self) -> Tuple[BoundedHistory, ...]:
+        return (self.submissions, self.hints, self.decision_history)
 
     def as_summary(self) -> Dict[str, Any]:
         return {
@@ -307,8 +473,8 @@ class SessionState:
             "status": self.status,
             "difficulty": self.difficulty,
             "topic": self.topic,
-            "submissions": len(self.submissions),
-            "hints": len(self.hints),
+            "submissions": self.submissions.total,
+            "hints": self.hints.total,
             "integrity": self.integrity.as_dict(),
             "skill_profile": self.skill_profile.as_dict(),
         }
@@ -0,0 +1,130 @@
+# app/services/similarity.py
+
+import logging
+import re
+import zlib
+from abc import ABC, abstractmethod
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Type
+
+from ..config import settings
+
+logger = logging.getLogger("skillproof.similarity")
+
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+# String literals are matched first so a '#' inside one is not taken for a comment.
+_COMMENT = re.compile(r"(\"(?:\\.|[^\"\\\n])*\"|'(?:\\.|[^'\\\n])*')|#[^\n]*")
+_MOD = (1 << 61) - 1
+_BASE = 1_000_003
+
+
+# =========================================================
+# ENGINES
+# =========================================================
+
+class SimilarityEngine(ABC):
+    """Scores how alike two submissions are, from 0.0 (unrelated) to 1.0 (same)."""
+
+    name = "base"
+
+    @abstractmethod
+    def ratio(self, previous: str, current: str) -> float:
+        """Return the similarity of ``current`` to ``previous``."""
+
+
+class SequenceMatcherSimilarity(SimilarityEngine):
+    """Character-level ``difflib`` ratio: the original metric, quadratic in the worst case."""
+
+    name = "sequence"
+
+    def ratio(self, previous: str, current: str) -> float:
+        return SequenceMatcher(None, previous, current).ratio()
+
+
+class ShingleSimilarity(SimilarityEngine):
+    """Dice coefficient over k-token (or k-line) shingles hashed with a rolling hash.
+
+    Linear in the input, and inputs are cut at ``max_units`` tokens/lines, so
+    a pasted wall of code costs a bounded amount of work. Comments never
+    count as edits, and neither do whitespace or layout changes in token mode.
+    """
+
+    name = "shingle"
+
+    def __init__(self, *, shingle_size: int = 3, max_units: int = 20_000, unit: str = "token"):
+        if unit not in ("token", "line"):
+            raise ValueError(f"Unknown shingle unit: {unit}")
+        self.shingle_size = max(1, shingle_size)
+        self.max_units = max(1, max_units)
+        self.unit = unit
+
+    def _units(self, code: str) -> List[int]:
+        code = _COMMENT.sub(lambda match: match.group(1) or "", code)
+        if self.unit == "line":
+            pieces = [line.strip() for line in code.splitlines() if line.strip()]
+        else:
+            pieces = _TOKEN.findall(code)
+        return [zlib.crc32(piece.encode("utf-8")) for piece in pieces[: self.max_units]]
+
+    @staticmethod
+    def _shingles(units: List[int], size: int) -> Counter:
+        shingles: Counter = Counter()
+        if len(units) < size:
+            return shingles
+        top = pow(_BASE, size - 1, _MOD)
+        value = 0
+        for unit in units[:size]:
+            value = (value * _BASE + unit) % _MOD
+        shingles[value] += 1
+        for idx in range(size, len(units)):
+            value = ((value - units[idx - size] * top) * _BASE + units[idx]) % _MOD
+            shingles[value] += 1
+        return shingles
+
+    def ratio(self, previous: str, current: str) -> float:
+        left = self._units(previous)
+        right = self._units(current)
+        if not left and not right:
+            return 1.0
+        if not left or not right:
+            return 0.0
+        # Very short snippets fall back to smaller shingles rather than scoring zero.
+        size = min(self.shingle_size, len(left), len(right))
+        left_shingles = self._shingles(left, size)
+        right_shingles = self._shingles(right, size)
+        common = sum((left_shingles & right_shingles).values())
+        return 2.0 * common / (sum(left_shingles.values()) + sum(right_shingles.values()))
+
+
+ENGINES: Dict[str, Type[SimilarityEngine]] = {
+    SequenceMatcherSimilarity.name: SequenceMatcherSimilarity,
+    ShingleSimilarity.name: ShingleSimilarity,
+}
+
+
+def build_similarity_engine(name: str) -> SimilarityEngine:
+    if name == ShingleSimilarity.name:
+        return ShingleSimilarity(
+            shingle_size=settings.SIMILARITY_SHINGLE_SIZE,
+            max_units=settings.SIMILARITY_MAX_UNITS,
+            unit=settings.SIMILARITY_SHINGLE_UNIT,
+        )
+    if name not in ENGINES:
+        raise ValueError(f"Unknown similarity engine: {name}")
+    return ENGINES[name]()
+
+
+# =========================================================
+# SINGLETON
+# =========================================================
+
+_engine: Optional[SimilarityEngine] = None
+
+
+def get_similarity_engine() -> SimilarityEngine:
+    global _engine
+    if _engine is None:
+        _engine = build_similarity_engine(settings.SIMILARITY_ENGINE)
+        logger.info("Similarity engine selected", extra={"engine": _engine.name})
+    return _engine
@@ -0,0 +1,158 @@
+# app/services/submission_store.py
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config import settings
+from ..core.clock import to_datetime
+from ..crud import crud_submission
+from ..db.session import SessionLocal
+
+logger = logging.getLogger("skillproof.submission_store")
+
+
+class SubmissionStore:
+    """Write-behind persistence of submissions into ``submissions`` / ``code_blobs``.
+
+    ``enqueue`` only records the submission; a background thread writes
+    pending ones in batches every ``flush_seconds`` or as soon as
+    ``batch_size`` are waiting. Records are serialized at write time, and a
+    submission enqueued again after the learning diagnosis annotated it is
+    updated in place, keyed by (session_id, seq).
+    """
+
+    def __init__(self, *, flush_seconds: float, batch_size: int):
+        self.flush_seconds = flush_seconds
+        self.batch_size = max(1, batch_size)
+        self._pending: "OrderedDict[Tuple[int, int], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+        self.enqueued = 0
+        self.written = 0
+        self.batches = 0
+        self.failures = 0
+        self.blobs_written = 0
+        self.blobs_reused = 0
+        self.raw_bytes = 0
+        self.compressed_bytes = 0
+
+    def enqueue(self, session_id: int, record: Any) -> None:
+        with self._lock:
+            self._pending[(session_id, record.seq)] = record
+            waiting = len(self._pending)
+            self.enqueued += 1
+            if self._thread is None and not self._stopped:
+                self._thread = threading.Thread(target=self._run, name="submission-writer", daemon=True)
+                self._thread.start()
+        if waiting >= self.batch_size:
+            self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stopped:
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Submission writer loop error")
+
+    def flush(self) -> int:
+        """Blocking: write everything pending now. Failed batches stay queued for the next flush."""
+        with self._write_lock:
+            with self._lock:
+                batch, self._pending = self._pending, OrderedDict()
+            if not batch:
+                return 0
+            rows = [self._row(session_id, record) for (session_id, _), record in batch.items()]
+            db = SessionLocal()
+            try:
+                stats = crud_submission.save_batch(db, rows)
+            except Exception:  # pylint: disable=broad-except
+                db.rollback()
+                with self._lock:
+                    for key, record in batch.items():
+                        self._pending.setdefault(key, record)
+                self.failures += 1
+                logger.exception("Submission batch write failed", extra={"rows": len(rows)})
+                return 0
+            finally:
+                db.close()
+        self.written += len(rows)
+        self.batches += 1
+        self.blobs_written += stats["blobs_written"]
+        self.blobs_reused += stats["blobs_reused"]
+        self.raw_bytes += stats["raw_bytes"]
+        self.compressed_bytes += stats["compressed_bytes"]
+        return len(rows)
+
+    @staticmethod
+    def _row(session_id: int, record: Any) -> Dict[str, Any]:
+        return {
+            "session_id": session_id,
+            "seq": record.seq,
+            "code": record.code,
+            "problem_id": record.problem_id,
+            "difficulty": record.difficulty,
+            "status": record.status,
+            "tests_passed": record.tests_passed,
+            "tests_failed": record.tests_failed,
+            "total_tests": record.total_tests,
+            "diff_ratio": record.diff_ratio,
+            "time_delta": record.time_delta,
+            "guess_probability": record.guess_probability,
+            "reasoning_label": record.reasoning_label,
+            "notes": record.notes,
+            "created_at": to_datetime(record.created_at),
+        }
+
+    def history(self, session_id: int) -> List[Tuple[int, Dict[str, Any]]]:
+        """Blocking: every stored submission of a session as ``(seq, payload)``, pending ones included."""
+        self.flush()
+        db = SessionLocal()
+        try:
+            return crud_submission.list_for_session(db, session_id)
+        finally:
+            db.close()
+
+    def close(self) -> None:
+        self._stopped = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self.flush()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "pending": len(self._pending),
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "batches": self.batches,
+            "failures": self.failures,
+            "blobs_written": self.blobs_written,
+            "blobs_reused": self.blobs_reused,
+            "compression_ratio": round(self.compressed_bytes / self.raw_bytes, 3) if self.raw_bytes else 0.0,
+        }
+
+
+# =========================================================
+# SINGLETON
+# =========================================================
+
+_submission_store: Optional[SubmissionStore] = None
+
+
+def get_submission_store() -> Optional[SubmissionStore]:
+    global _submission_store
+    if not settings.SUBMISSION_STORE_ENABLED:
+        return None
+    if _submission_store is None:
+        _submission_store = SubmissionStore(
+            flush_seconds=settings.SUBMISSION_FLUSH_SECONDS,
+            batch_size=settings.SUBMISSION_FLUSH_BATCH,
+        )
+    return _submission_store
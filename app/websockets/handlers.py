@@ -5,7 +5,10 @@ from fastapi import WebSocket
 
 from .connection_manager import manager
 from ..services.session_manager import session_manager
-from ..core.errors import SkillProofError, build_error_payload
+from ..config import settings
+from ..core.errors import BackpressureError, SkillProofError, build_error_payload
+from ..core.executor import event_executor
+from ..core.mailbox import MailboxEvent, MailboxRegistry
 
 
 def _resolve_session_bundle(user_id: str, event_type: str, payload: Dict[str, Any]) -> Dict[str, Any]:
@@ -65,13 +68,10 @@ def _build_broadcast_payload(
     return broadcast_payload
 
 
-async def handle_websocket_message(websocket: WebSocket, data: dict) -> None:
-    user_id = data.get("user_id")
-    event_type = data.get("type")
-    payload = data.get("payload", {})
-
-    if not user_id or not event_type:
-        return
+async def _process_event(user_id: str, event: MailboxEvent) -> None:
+    websocket: WebSocket = event.reply_to
+    event_type = event.event_type
+    payload = event.payload
 
     bundle = None
     state = None
@@ -80,14 +80,14 @@ async def handle_websocket_message(websocket: WebSocket, data: dict) -> None:
     error_payload: Dict[str, Any] | None = None
 
     try:
-        bundle = _resolve_session_bundle(user_id, event_type, payload)
+        bundle = await event_executor.run_blocking(_resolve_session_bundle, user_id, event_type, payload)
         state, orchestrator = _extract_session_state(bundle)
 
         if orchestrator is None:
             raise SkillProofError("Orchestrator missing for session", code="orchestrator_missing", context={"user_id": user_id})
-        result = orchestrator.handle_event(event_type, payload)
+        result = await event_executor.submit(user_id, orchestrator.handle_event, event_type, payload, websocket.send_json)
         if state:
-            session_manager.record_feedback(state)
+            await event_executor.run_blocking(session_manager.record_feedback, state)
         await websocket.send_json(result)
     except Exception as exc:  # pylint: disable=broad-except
         err = exc if isinstance(exc, SkillProofError) else SkillProofError(
@@ -102,10 +102,28 @@ async def handle_websocket_message(websocket: WebSocket, data: dict) -> None:
         await websocket.send_json({"type": "error", "message": error_payload["message"], "error": error_payload})
     else:
         if event_type == "session_end" and state:
-            session_manager.close_session(user_id)
+            await event_executor.run_blocking(session_manager.close_session, user_id)
 
     if not state:
         return
 
     broadcast_payload = _build_broadcast_payload(user_id, event_type, state, result, error_payload)
     await manager.broadcast(json.dumps(broadcast_payload))
+
+
+mailboxes = MailboxRegistry(_process_event, max_size=settings.SESSION_MAILBOX_SIZE)
+
+
+async def handle_websocket_message(websocket: WebSocket, data: dict) -> None:
+    user_id = data.get("user_id")
+    event_type = data.get("type")
+    payload = data.get("payload", {})
+
+    if not user_id or not event_type:
+        return
+
+    try:
+        mailboxes.post(user_id, MailboxEvent(event_type=event_type, payload=payload, reply_to=websocket))
+    except BackpressureError as exc:
+        error_payload = build_error_payload(exc, fallback_code="websocket_error").as_dict()
+        await websocket.send_json({"type": "error", "message": error_payload["message"], "error": error_payload})
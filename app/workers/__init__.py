@@ -0,0 +1 @@
+# This file makes the 'workers' directory a Python package.
@@ -0,0 +1,119 @@
+# app/workers/eval_worker.py
+"""Standalone evaluation worker.
+
+    python -m app.workers.eval_worker [--concurrency N] [--worker-id NAME]
+
+Workers only need the shared database (DATABASE_URL) and this code base; run
+as many as grading load requires, on any node.
+"""
+
+import argparse
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+from typing import Optional
+
+from ..config import settings
+from ..db import base as db_base, session as db_session
+from .. import models  # noqa: F401  # Ensure SQLAlchemy models are registered
+from ..services.code_evaluator import run_suite
+from ..services.eval_queue import EvalQueue, get_eval_queue
+from ..services.sandbox import SandboxPool, get_sandbox_pool
+
+logger = logging.getLogger("skillproof.eval_worker")
+
+_PURGE_INTERVAL_SECONDS = 60.0
+
+
+def _process(queue: EvalQueue, pool: Optional[SandboxPool], worker_id: str) -> bool:
+    job = queue.claim(worker_id)
+    if job is None:
+        return False
+    on_test = (lambda detail: queue.report_progress(job, detail)) if job.stream else None
+    try:
+        result = run_suite(pool, job.code, job.entrypoint, job.tests, job.options or {}, on_test)
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.exception("Evaluation job failed", extra={"job_id": job.id})
+        queue.finish(
+            job,
+            {
+                "status": "error",
+                "message": f"Evaluation worker error: {exc}",
+                "stdout": "",
+                "passed": 0,
+                "failed": len(job.tests),
+                "total_tests": len(job.tests),
+                "execution_time": 0.0,
+                "details": [],
+            },
+            failed=True,
+        )
+        return True
+    queue.finish(job, result)
+    return True
+
+
+def _work_loop(queue: EvalQueue, pool: Optional[SandboxPool], worker_id: str, stop: threading.Event) -> None:
+    while not stop.is_set():
+        try:
+            if not _process(queue, pool, worker_id):
+                stop.wait(settings.EVAL_WORKER_IDLE_POLL_SECONDS)
+        except Exception:  # pylint: disable=broad-except
+            # Database hiccups must not kill the worker thread; back off and retry.
+            logger.exception("Evaluation worker loop error", extra={"worker_id": worker_id})
+            stop.wait(1.0)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="SkillProof evaluation worker")
+    parser.add_argument("--concurrency", type=int, default=settings.EVAL_WORKER_CONCURRENCY)
+    parser.add_argument("--worker-id", default=f"{socket.gethostname()}-{os.getpid()}")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+
+    db_base.Base.metadata.create_all(bind=db_session.engine)
+    db_session.add_missing_columns(db_base.Base.metadata)
+    pool = get_sandbox_pool() if settings.SANDBOX_ENABLED else None
+    if pool is not None:
+        pool.start()
+    concurrency = args.concurrency or (pool.size if pool is not None else 1)
+    queue = get_eval_queue()
+
+    stop = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop.set())
+
+    threads = [
+        threading.Thread(
+            target=_work_loop,
+            args=(queue, pool, f"{args.worker_id}/{idx}", stop),
+            name=f"eval-worker-{idx}",
+            daemon=True,
+        )
+        for idx in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    logger.info("Evaluation worker started", extra={"worker_id": args.worker_id, "concurrency": concurrency})
+
+    last_purge = 0.0
+    while not stop.wait(1.0):
+        if time.monotonic() - last_purge >= _PURGE_INTERVAL_SECONDS:
+            last_purge = time.monotonic()
+            try:
+                queue.purge()
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Purging finished evaluation jobs failed")
+
+    for thread in threads:
+        thread.join(timeout=settings.SANDBOX_WALL_SECONDS + 1)
+    if pool is not None:
+        pool.close()
+    logger.info("Evaluation worker stopped", extra={"worker_id": args.worker_id})
+
+
+if __name__ == "__main__":
+    main()
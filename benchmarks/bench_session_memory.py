@@ -0,0 +1,254 @@
+"""Measure resident bytes per active SessionState for the legacy and current layouts.
+
+    python benchmarks/bench_session_memory.py [--sessions 1000] [--submissions 12] [--hints 3] [--integrity-events 6]
+
+Both layouts replay the same synthetic session: a problem assignment, a run
+of submissions (each producing evaluation, diagnosis and adaptation
+decisions plus feedback notes), some hints and integrity events. The legacy
+layout is reproduced here as it was before records were slotted: plain
+dataclasses with ``datetime`` timestamps, unbounded lists and decision log
+entries stored as nested payload dicts with ISO strings. The current layout
+uses the real ``SessionState`` API, with evicted history drained the way the
+session manager spills it after each event.
+"""
+
+import argparse
+import gc
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Set
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app.core.decision import AgentDecision  # noqa: E402
+from app.services.session_state import ProblemSpec, SessionState  # noqa: E402
+
+PROBLEM = ProblemSpec(
+    id="bench-recursion-easy",
+    title="Sum of digits",
+    difficulty="easy",
+    topic="recursion",
+    description="Return the sum of the digits of n.",
+    starter_code="def solve(n):\n    if n < 10:\n        return 0\n    return n % 10 + solve(n // 10)\n",
+    entrypoint="solve",
+    tests=[{"args": [123], "kwargs": {}, "expected": 6}],
+    hints=["Think about the base case.", "What is solve(7)?", "Return n when n < 10."],
+)
+
+
+def submission_code(session: int, attempt: int) -> str:
+    return (
+        "def solve(n):\n"
+        f"    # attempt {attempt} of learner {session}\n"
+        f"    if n < {10 + attempt % 3}:\n"
+        "        return n\n"
+        "    return n % 10 + solve(n // 10)\n"
+    )
+
+
+def decision(agent: str, decision_type: str, **metadata: Any) -> AgentDecision:
+    return AgentDecision(
+        agent=agent,
+        decision_type=decision_type,
+        confidence=0.8,
+        rationale=f"{agent} chose {decision_type}.",
+        policy="bench",
+        metadata=metadata,
+    )
+
+
+# ---- legacy layout ----
+
+@dataclass
+class LegacySubmissionRecord:
+    code: str
+    created_at: datetime
+    diff_ratio: float
+    time_delta: float
+    tests_passed: int
+    tests_failed: int
+    total_tests: int
+    status: str
+    guess_probability: float = 0.0
+    reasoning_label: str = "undetermined"
+    notes: str = ""
+    difficulty: str = ""
+
+
+@dataclass
+class LegacyHintRecord:
+    level: str
+    text: str
+    created_at: datetime
+
+
+@dataclass
+class LegacyIntegrityState:
+    focus_losses: int = 0
+    inactivity_flags: int = 0
+    webcam_flags: int = 0
+    tab_switches: int = 0
+    webcam_risk: float = 0.0
+    severity: str = "normal"
+    paused: bool = False
+    terminated: bool = False
+    last_event_at: datetime = field(default_factory=datetime.utcnow)
+
+
+@dataclass
+class LegacySkillProfile:
+    debugging: float = 0.5
+    logic: float = 0.5
+    syntax: float = 0.5
+    problem_decomposition: float = 0.5
+    integrity_confidence: float = 0.5
+    attempts: int = 0
+    dirty: bool = False
+
+
+@dataclass
+class LegacySessionState:
+    user_id: str
+    mode: str = "learning"
+    session_id: Optional[int] = None
+    started_at: datetime = field(default_factory=datetime.utcnow)
+    current_problem: Optional[ProblemSpec] = None
+    difficulty: str = "easy"
+    topic: str = "recursion"
+    status: str = "active"
+    submissions: List[LegacySubmissionRecord] = field(default_factory=list)
+    hints: List[LegacyHintRecord] = field(default_factory=list)
+    integrity: LegacyIntegrityState = field(default_factory=LegacyIntegrityState)
+    skill_profile: LegacySkillProfile = field(default_factory=LegacySkillProfile)
+    difficulty_history: List[str] = field(default_factory=list)
+    decision_history: List[Dict[str, Any]] = field(default_factory=list)
+    agent_feedback: Dict[str, List[str]] = field(default_factory=dict)
+    feedback_events: List[Dict[str, Any]] = field(default_factory=list)
+    assigned_problem_ids: Set[str] = field(default_factory=set)
+
+
+def _legacy_payload(agent_decision: AgentDecision) -> Dict[str, Any]:
+    payload = agent_decision.as_payload()
+    payload["timestamp"] = datetime.utcnow().isoformat()
+    return payload
+
+
+def build_legacy(idx: int, args: argparse.Namespace) -> LegacySessionState:
+    state = LegacySessionState(user_id=f"learner-{idx}")
+
+    def record(agent: str, decision_type: str, **metadata: Any) -> None:
+        entry = {"agent": agent, "decision": _legacy_payload(decision(agent, decision_type, **metadata)), "timestamp": datetime.utcnow().isoformat()}
+        state.decision_history.append(entry)
+        note = f"{agent}: {decision_type}"
+        state.agent_feedback.setdefault(agent, []).append(note)
+        state.feedback_events.append({"agent": agent, "note": note, "timestamp": datetime.utcnow().isoformat()})
+
+    state.current_problem = PROBLEM
+    state.difficulty_history.append(PROBLEM.difficulty)
+    state.assigned_problem_ids.add(PROBLEM.id)
+    record("adaptation", "assign_problem", problem_id=PROBLEM.id)
+    for attempt in range(args.submissions):
+        state.submissions.append(
+            LegacySubmissionRecord(
+                code=submission_code(idx, attempt),
+                created_at=datetime.utcnow(),
+                diff_ratio=0.9,
+                time_delta=30.0,
+                tests_passed=attempt % 2,
+                tests_failed=1 - attempt % 2,
+                total_tests=1,
+                status="passed" if attempt % 2 else "failed",
+                difficulty="easy",
+            )
+        )
+        record("evaluation", "evaluate_submission", problem_id=PROBLEM.id)
+        record("learning", "diagnose", label="working_through")
+        record("adaptation", "hold", difficulty="easy")
+    for level in range(args.hints):
+        state.hints.append(LegacyHintRecord(level="conceptual", text=PROBLEM.hints[level % 3], created_at=datetime.utcnow()))
+        record("hint", "provide_hint", level=level)
+    for _ in range(args.integrity_events):
+        state.integrity.focus_losses += 1
+        state.integrity.last_event_at = datetime.utcnow()
+        record("integrity", "register_focus_loss", event="focus_lost")
+    return state
+
+
+# ---- current layout ----
+
+def build_current(idx: int, args: argparse.Namespace) -> SessionState:
+    state = SessionState(user_id=f"learner-{idx}")
+
+    def record(agent: str, decision_type: str, **metadata: Any) -> None:
+        state.record_decision(agent, decision(agent, decision_type, **metadata))
+        state.append_feedback(agent, f"{agent}: {decision_type}")
+
+    def spill() -> None:
+        # SessionManager.record_feedback persists these after every event.
+        for history in state.histories():
+            history.drain()
+        state.feedback_events = []
+
+    state.mark_problem(PROBLEM)
+    record("adaptation", "assign_problem", problem_id=PROBLEM.id)
+    spill()
+    for attempt in range(args.submissions):
+        evaluation = {"passed": attempt % 2, "failed": 1 - attempt % 2, "total_tests": 1, "status": "passed" if attempt % 2 else "failed"}
+        state.add_submission(submission_code(idx, attempt), evaluation)
+        record("evaluation", "evaluate_submission", problem_id=PROBLEM.id)
+        record("learning", "diagnose", label="working_through")
+        record("adaptation", "hold", difficulty="easy")
+        spill()
+    for level in range(args.hints):
+        state.record_hint("conceptual", PROBLEM.hints[level % 3])
+        record("hint", "provide_hint", level=level)
+        spill()
+    for _ in range(args.integrity_events):
+        state.integrity.focus_losses += 1
+        state.integrity.advance(time.time())
+        record("integrity", "register_focus_loss", event="focus_lost")
+        spill()
+    return state
+
+
+def measure(build: Callable[[int, argparse.Namespace], Any], args: argparse.Namespace) -> float:
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    states = [build(idx, args) for idx in range(args.sessions)]
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del states
+    return used / args.sessions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--submissions", type=int, default=12)
+    parser.add_argument("--hints", type=int, default=3)
+    parser.add_argument("--integrity-events", type=int, default=6)
+    args = parser.parse_args()
+    # Per-decision INFO logging would dominate the run time and is not part of what is measured.
+    logging.disable(logging.INFO)
+
+    legacy = measure(build_legacy, args)
+    current = measure(build_current, args)
+    print(
+        f"{args.sessions} sessions, {args.submissions} submissions, {args.hints} hints, "
+        f"{args.integrity_events} integrity events each"
+    )
+    print(f"{'layout':<10} {'bytes/session':>14}")
+    print(f"{'legacy':<10} {legacy:>14,.0f}")
+    print(f"{'current':<10} {current:>14,.0f}")
+    print(f"reduction  {1 - current / legacy:>14.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""Compare submission similarity engines on realistic edits and on large inputs.
+
+    python benchmarks/bench_similarity.py [--sizes 50,200,1000,2000,5000] [--repeat 3]
+
+Part 1 scores edit scenarios built from the curated corpus with both engines
+and, for every ``diff_ratio`` threshold used by LearningDiagnosisAgent, finds
+the shingle threshold that makes the same calls as the character-level
+original. Part 2 times both engines as the inputs grow.
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app.services.similarity import SequenceMatcherSimilarity, ShingleSimilarity  # noqa: E402
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "problems.jsonl")
+
+# (name, legacy threshold, direction) as used in LearningDiagnosisAgent._estimate_guessing.
+THRESHOLDS = [
+    ("similar_resubmit", 0.85, ">"),
+    ("stalled_rewrite", 0.3, "<"),
+    ("rapid_rewrite", 0.2, "<"),
+]
+
+
+def load_programs() -> List[str]:
+    with open(CORPUS, encoding="utf-8") as handle:
+        return [json.loads(line)["starter_code"] for line in handle if line.strip()]
+
+
+# ---- edit scenarios ----
+
+def reformat(code: str, rng: random.Random) -> str:
+    lines = []
+    for line in code.splitlines():
+        lines.append(line.rstrip() + ("  # check" if rng.random() < 0.3 and line.strip() else ""))
+        if rng.random() < 0.2:
+            lines.append("")
+    return "\n".join(lines) + "\n"
+
+
+def one_line_fix(code: str, rng: random.Random) -> str:
+    lines = code.splitlines()
+    candidates = [idx for idx, line in enumerate(lines) if re.search(r"\d", line)]
+    idx = rng.choice(candidates) if candidates else len(lines) - 1
+    lines[idx] = re.sub(r"\d+", lambda match: str(int(match.group()) + 1), lines[idx], count=1) or lines[idx] + " + 1"
+    return "\n".join(lines) + "\n"
+
+
+def rename(code: str, rng: random.Random) -> str:
+    names = sorted(set(re.findall(r"\b(?!def\b|return\b|if\b|else\b|for\b|in\b|not\b|and\b|or\b)[a-z_]{1,3}\b", code)))
+    if not names:
+        return code
+    target = rng.choice(names)
+    return re.sub(rf"\b{target}\b", f"{target}_value", code)
+
+
+def extend(code: str, rng: random.Random) -> str:
+    helper = "\n\ndef _check(value):\n    if value is None:\n        raise ValueError('missing')\n    return value\n"
+    return code + helper
+
+
+def rewrite(code: str, rng: random.Random, programs: List[str]) -> str:
+    return rng.choice([program for program in programs if program != code] or programs)
+
+
+def junk(code: str, rng: random.Random) -> str:
+    return "\n".join("x = " + " + ".join(str(rng.randint(0, 99)) for _ in range(6)) for _ in range(len(code.splitlines())))
+
+
+def scenarios(programs: List[str], seed: int) -> List[Tuple[str, str, str]]:
+    rng = random.Random(seed)
+    edits: Dict[str, Callable[[str], str]] = {
+        "identical": lambda code: code,
+        "reformat": lambda code: reformat(code, rng),
+        "one_line_fix": lambda code: one_line_fix(code, rng),
+        "rename": lambda code: rename(code, rng),
+        "extend": lambda code: extend(code, rng),
+        "rewrite": lambda code: rewrite(code, rng, programs),
+        "junk": lambda code: junk(code, rng),
+    }
+    pairs = []
+    for program in programs:
+        for name, edit in edits.items():
+            pairs.append((name, program, edit(program)))
+        # Chained edits, the common "tweak and resubmit" loop.
+        pairs.append(("fix_and_reformat", program, reformat(one_line_fix(program, rng), rng)))
+        pairs.append(("rename_and_extend", program, extend(rename(program, rng), rng)))
+    return pairs
+
+
+def calibrate(legacy: List[float], shingle: List[float], threshold: float, direction: str) -> Tuple[float, float]:
+    """Shingle threshold that agrees most often with the legacy decision, and that agreement rate."""
+    decide = (lambda value, cut: value > cut) if direction == ">" else (lambda value, cut: value < cut)
+    expected = [decide(value, threshold) for value in legacy]
+    best = (threshold, -1.0)
+    for step in range(0, 101):
+        cut = step / 100
+        agreement = sum(decide(value, cut) == want for value, want in zip(shingle, expected)) / len(expected)
+        # Prefer the cut closest to the original on ties so recalibration stays conservative.
+        if agreement > best[1] or (agreement == best[1] and abs(cut - threshold) < abs(best[0] - threshold)):
+            best = (cut, agreement)
+    return best
+
+
+def scenario_report(seed: int) -> None:
+    programs = load_programs()
+    legacy_engine = SequenceMatcherSimilarity()
+    shingle_engine = ShingleSimilarity()
+    pairs = scenarios(programs, seed)
+
+    by_name: Dict[str, List[Tuple[float, float]]] = {}
+    legacy: List[float] = []
+    shingle: List[float] = []
+    for name, before, after in pairs:
+        old, new = legacy_engine.ratio(before, after), shingle_engine.ratio(before, after)
+        by_name.setdefault(name, []).append((old, new))
+        legacy.append(old)
+        shingle.append(new)
+
+    print(f"Scenario ratios over {len(programs)} corpus programs (mean legacy / mean shingle)")
+    print(f"{'scenario':<20} {'legacy':>8} {'shingle':>8}")
+    for name, values in by_name.items():
+        print(f"{name:<20} {sum(v[0] for v in values) / len(values):>8.3f} {sum(v[1] for v in values) / len(values):>8.3f}")
+
+    print("\nThreshold calibration (shingle cut that best reproduces the legacy decision)")
+    print(f"{'rule':<18} {'legacy':>8} {'shingle':>8} {'agreement':>10}")
+    for name, threshold, direction in THRESHOLDS:
+        cut, agreement = calibrate(legacy, shingle, threshold, direction)
+        print(f"{name:<18} {direction}{threshold:>7.2f} {direction}{cut:>7.2f} {agreement:>9.1%}")
+
+
+# ---- scaling ----
+
+def synthetic_program(lines: int, programs: List[str], rng: random.Random) -> str:
+    chunks: List[str] = []
+    count = 0
+    idx = 0
+    while count < lines:
+        program = programs[rng.randrange(len(programs))].replace("def ", f"def v{idx}_")
+        chunks.append(program)
+        count += len(program.splitlines())
+        idx += 1
+    return "\n".join("\n".join(chunks).splitlines()[:lines]) + "\n"
+
+
+def scattered_edits(code: str, rng: random.Random) -> str:
+    lines = code.splitlines()
+    for idx in rng.sample(range(len(lines)), max(1, len(lines) // 20)):
+        lines[idx] = lines[idx] + "  # edited"
+    return "\n".join(lines) + "\n"
+
+
+def timed(engine, before: str, after: str, repeat: int, budget: float) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        engine.ratio(before, after)
+        elapsed = time.perf_counter() - started
+        best = min(best, elapsed)
+        if elapsed > budget:
+            break
+    return best
+
+
+def scaling_report(sizes: List[int], repeat: int, seed: int, budget: float) -> None:
+    programs = load_programs()
+    rng = random.Random(seed)
+    engines = [SequenceMatcherSimilarity(), ShingleSimilarity()]
+    print("\nLatency per comparison in ms (best of repeats)")
+    print(f"{'lines':>6} {'case':<12} " + " ".join(f"{engine.name:>10}" for engine in engines))
+    skipped = set()
+    small = programs[0]
+    for size in sizes:
+        code = synthetic_program(size, programs, rng)
+        cases = [("edited", code, scattered_edits(code, rng)), ("paste", small, code)]
+        for case, before, after in cases:
+            cells = []
+            for engine in engines:
+                if engine.name in skipped:
+                    cells.append(f"{'skipped':>10}")
+                    continue
+                elapsed = timed(engine, before, after, repeat, budget)
+                if elapsed > budget:
+                    skipped.add(engine.name)
+                cells.append(f"{elapsed * 1000:>10.2f}")
+            print(f"{size:>6} {case:<12} " + " ".join(cells))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="50,200,1000,2000,5000")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--budget", type=float, default=10.0, help="stop timing an engine once one run exceeds this many seconds")
+    args = parser.parse_args()
+    scenario_report(args.seed)
+    scaling_report([int(size) for size in args.sizes.split(",")], args.repeat, args.seed, args.budget)
+
+
+if __name__ == "__main__":
+    main()
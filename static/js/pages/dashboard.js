@@ -6,6 +6,9 @@ const integrityFlagsCard = document.getElementById('integrity-flags-card');
 const solvedCountCard = document.getElementById('solved-count-card');
 const activityFeed = document.getElementById('activity-feed');
 const logoutButton = document.getElementById('admin-logout');
+const aiProviderCard = document.getElementById('ai-provider-card');
+const breakerStateCard = document.getElementById('breaker-state-card');
+const breakerDetailCard = document.getElementById('breaker-detail-card');
 
 const clientId = typeof crypto !== 'undefined' && crypto.randomUUID
     ? `admin_${crypto.randomUUID()}`
@@ -16,6 +19,7 @@ const socket = new WebSocket(`${wsScheme}://${window.location.host}/ws/${clientI
 const userSessions = {};
 const activityLog = [];
 const MAX_ACTIVITY = 30;
+const METRICS_POLL_MS = 5000;
 
 if (logoutButton) {
     logoutButton.addEventListener('click', async () => {
@@ -127,6 +131,38 @@ const renderDashboard = () => {
     solvedCountCard.textContent = totalSolved;
 };
 
+const renderBreaker = (breaker) => {
+    if (!breaker || !breakerStateCard) {
+        return;
+    }
+    const label = {
+        closed: 'Healthy',
+        half_open: 'Probing',
+        open: 'Unavailable',
+    }[breaker.state] || breaker.state;
+    breakerStateCard.textContent = label;
+    if (aiProviderCard) {
+        aiProviderCard.dataset.state = breaker.state;
+    }
+    if (breakerDetailCard) {
+        breakerDetailCard.textContent = breaker.state === 'open'
+            ? `Fallback problems for ${breaker.retry_in_s}s · ${breaker.rejected} calls short-circuited`
+            : `${breaker.consecutive_failures}/${breaker.failure_threshold} recent failures · opened ${breaker.opened}×`;
+    }
+};
+
+const pollMetrics = async () => {
+    try {
+        const response = await fetch('/api/metrics', { credentials: 'include' });
+        if (response.ok) {
+            const metrics = await response.json();
+            renderBreaker(metrics.llm_breaker);
+        }
+    } catch (error) {
+        console.warn('Failed to load runtime metrics', error);
+    }
+};
+
 socket.addEventListener('open', () => {
     setConnectionState('connected');
 });
@@ -206,3 +242,5 @@ socket.addEventListener('message', (event) => {
 });
 
 renderActivityFeed();
+pollMetrics();
+setInterval(pollMetrics, METRICS_POLL_MS);
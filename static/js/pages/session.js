@@ -32,6 +32,8 @@ let timerHandle = null;
 let timerStart = null;
 let totalHints = 0;
 let socketReady = false;
+let streamingHint = null;
+let streamedEvaluation = false;
 const pendingMessages = [];
 
 const getProfile = () => {
@@ -211,6 +213,46 @@ const appendOutputMessage = (text, type) => {
     messageElement.className = `output-line ${type}`;
     output.appendChild(messageElement);
     output.scrollTop = output.scrollHeight;
+    return messageElement;
+};
+
+const appendHintChunk = (payload) => {
+    if (!streamingHint) {
+        streamingHint = appendOutputMessage(`Hint (${payload.level || 'hint'}): `, 'hint');
+    }
+    if (!streamingHint) {
+        return;
+    }
+    streamingHint.textContent += payload.delta || '';
+    output.scrollTop = output.scrollHeight;
+};
+
+const formatValue = (value) => {
+    try {
+        return JSON.stringify(value);
+    } catch (error) {
+        return String(value);
+    }
+};
+
+const appendTestResult = (payload) => {
+    const position = `Test ${(payload.index ?? 0) + 1}`;
+    const progress = payload.total ? ` (${payload.completed}/${payload.total})` : '';
+    if (payload.passed) {
+        appendOutputMessage(`  ✓ ${position} passed${progress}`, 'info');
+        return;
+    }
+    const reason = payload.error
+        ? payload.error
+        : `expected ${formatValue(payload.expected)}, got ${formatValue(payload.output)}`;
+    appendOutputMessage(`  ✗ ${position} failed${progress}: ${reason}`, 'warning');
+};
+
+const renderDiagnosis = (diagnosis) => {
+    if (diagnosis && diagnosis.reasoning) {
+        const guess = typeof diagnosis.guess_probability === 'number' ? diagnosis.guess_probability.toFixed(2) : 'n/a';
+        appendOutputMessage(`> Reasoning: ${diagnosis.reasoning} (guess probability ${guess})`, 'info');
+    }
 };
 
 const renderEvaluationFeedback = (data) => {
@@ -228,10 +270,7 @@ const renderEvaluationFeedback = (data) => {
         appendOutputMessage(`> ${evaluation.message}`, 'info');
     }
 
-    if (diagnosis.reasoning) {
-        const guess = typeof diagnosis.guess_probability === 'number' ? diagnosis.guess_probability.toFixed(2) : 'n/a';
-        appendOutputMessage(`> Reasoning: ${diagnosis.reasoning} (guess probability ${guess})`, 'info');
-    }
+    renderDiagnosis(diagnosis);
 
     if (submission.diff_ratio !== undefined) {
         appendOutputMessage(`> Submission metrics: diff=${submission.diff_ratio}, delta=${submission.time_delta}s`, 'info');
@@ -398,6 +437,29 @@ socket.addEventListener('message', (event) => {
         return;
     }
 
+    if (data.type === 'hint_chunk') {
+        appendHintChunk(data.payload || {});
+        return;
+    }
+
+    if (data.type === 'test_result') {
+        appendTestResult(data.payload || {});
+        return;
+    }
+
+    if (data.type === 'evaluation_summary') {
+        // Diagnosis and the next problem arrive later; the final code_feedback frame then skips what was shown.
+        streamedEvaluation = true;
+        renderEvaluationFeedback({ evaluation: data.evaluation, submission: data.submission });
+        updateSessionStatus('Active');
+        return;
+    }
+
+    if (data.type === 'diagnosis') {
+        renderDiagnosis(data.diagnosis);
+        return;
+    }
+
     if (data.type === 'problem_assigned') {
         initializeEditor(data.payload.code || '');
         problemTitle.textContent = `Problem: ${data.payload.title}`;
@@ -410,7 +472,10 @@ socket.addEventListener('message', (event) => {
     }
 
     if (data.type === 'code_feedback') {
-        renderEvaluationFeedback(data);
+        if (!streamedEvaluation) {
+            renderEvaluationFeedback(data);
+        }
+        streamedEvaluation = false;
         updateSessionStatus('Active');
         if (data.next_problem) {
             initializeEditor(data.next_problem.payload.code || '');
@@ -421,10 +486,21 @@ socket.addEventListener('message', (event) => {
             appendOutputMessage(`> Difficulty ${data.next_problem.decision === 'advance' ? 'increased' : 'recalibrated'}. New problem assigned: ${data.next_problem.payload.title}`, 'system');
         }
     } else if (data.type === 'hint') {
+        // The final hint replaces any streamed preview so the log shows the recorded text.
+        const streamed = streamingHint;
+        streamingHint = null;
         if (data.allowed && data.payload) {
             incrementHintCount();
-            appendOutputMessage(`Hint (${data.payload.level}): ${data.payload.text}`, 'hint');
+            const hintText = `Hint (${data.payload.level}): ${data.payload.text}`;
+            if (streamed) {
+                streamed.textContent = hintText;
+            } else {
+                appendOutputMessage(hintText, 'hint');
+            }
         } else {
+            if (streamed) {
+                streamed.remove();
+            }
             appendOutputMessage(`> Hint unavailable: ${data.message}`, 'warning');
         }
     } else if (data.type === 'integrity') {